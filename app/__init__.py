@@ -1,21 +1,23 @@
+import logging
 import re
 
-from flask import Flask, request, redirect, session, abort
+from flask import Flask, request, redirect, abort
 from flask_login import LoginManager
 from flask_wtf.csrf import CSRFProtect, CSRFError
 
 
-import dmapiclient
 import dmcontent.govuk_frontend
 from dmutils import init_app
-from dmutils.user import User
 from dmutils.external import external as external_blueprint
 from govuk_frontend_jinja.flask_ext import init_govuk_frontend
 
 from config import configs
 
+from . import caching, commands, profiling, sampling, sessions, templating, users
+from .api_client import MemoizingDataAPIClient
 
-data_api_client = dmapiclient.DataAPIClient()
+
+data_api_client = MemoizingDataAPIClient()
 login_manager = LoginManager()
 csrf = CSRFProtect()
 
@@ -35,6 +37,12 @@ def create_app(config_name):
         login_manager=login_manager,
     )
 
+    # log from our own modules (which may run outside of a request, eg in background threads) the same way as
+    # the app logger
+    app_logger = logging.getLogger(__name__)
+    app_logger.handlers[:] = application.logger.handlers
+    app_logger.setLevel(application.logger.level)
+
     from .main import main as main_blueprint
     from .main import public as public_blueprint
     from .status import status as status_blueprint
@@ -63,22 +71,24 @@ def create_app(config_name):
         dmcontent.govuk_frontend.render_question
     )
 
+    caching.init_app(application)
+    commands.init_app(application)
+    sessions.init_app(application)
+    profiling.init_app(application)
+    sampling.init_app(application)
+    templating.init_app(application)
+
     @application.before_request
     def remove_trailing_slash():
         if request.path.endswith('/'):
             return redirect(request.path[:-1], code=301)
 
-    @application.before_request
-    def refresh_session():
-        session.permanent = True
-        session.modified = True
-
     return application
 
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.load_user(data_api_client, user_id)
+    return users.load_user(data_api_client, user_id)
 
 
 def config_attrs(config):
@@ -0,0 +1,180 @@
+import threading
+from copy import deepcopy
+
+import requests
+from dmapiclient import DataAPIClient
+from flask import current_app, has_request_context, request
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .metrics import (
+    DATA_API_CALLS_TOTAL,
+    DATA_API_CONNECTIONS_IN_USE,
+    DATA_API_NEW_CONNECTIONS_TOTAL,
+    DATA_API_POOL_EXHAUSTED_TOTAL,
+)
+
+
+class _InstrumentedPoolMixin(object):
+    def _new_conn(self):
+        DATA_API_NEW_CONNECTIONS_TOTAL.inc()
+        return super()._new_conn()
+
+    def _get_conn(self, timeout=None):
+        # the pool starts out full of empty slots, so it's only empty when every connection it allows is in use
+        if self.pool is not None and self.pool.empty():
+            DATA_API_POOL_EXHAUSTED_TOTAL.inc()
+        conn = super()._get_conn(timeout)
+        DATA_API_CONNECTIONS_IN_USE.inc()
+        return conn
+
+    def _put_conn(self, conn):
+        DATA_API_CONNECTIONS_IN_USE.dec()
+        super()._put_conn(conn)
+
+
+class _InstrumentedHTTPConnectionPool(_InstrumentedPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _InstrumentedHTTPSConnectionPool(_InstrumentedPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class _InstrumentedHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _InstrumentedHTTPConnectionPool,
+            "https": _InstrumentedHTTPSConnectionPool,
+        }
+
+
+# threads working on behalf of a request can ask for its memo at the same time, before it's been made
+_request_memo_lock = threading.Lock()
+
+
+class _RequestMemo(object):
+    def __init__(self):
+        self.responses = {}
+        self.real_calls = 0
+        self.deduplicated_calls = 0
+        self.lock = threading.Lock()
+
+
+class MemoizingDataAPIClient(DataAPIClient):
+    """A DataAPIClient that only makes each distinct GET once per request.
+
+    Within a request, repeating a read (with the same url and params) returns a copy of the first response rather than
+    calling the API again, so views and helpers don't need to go out of their way to pass responses around. Any write
+    forgets everything read so far in that request, so a read after a write always sees the write. Outside of a request
+    every call goes to the API.
+
+    The memo is kept on the request object, so threads working on behalf of a request (see
+    ``app.main.helpers.concurrency``) share it. Responses are copied as they're stored, as well as when they're
+    returned again: the first caller gets the response itself, and is free to change it.
+
+    Connections to the API are kept open and reused by every thread, up to ``DM_DATA_API_POOL_SIZE`` of them at a
+    time (past that, calls open a connection that's closed afterwards rather than waiting for one). Each thread has
+    its own ``requests.Session``, as sessions aren't safe to share between threads.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pool_size = DEFAULT_POOLSIZE
+        self._reset_connection_pools()
+
+    def init_app(self, app):
+        super().init_app(app)
+        self._pool_size = app.config["DM_DATA_API_POOL_SIZE"]
+        self._reset_connection_pools()
+        app.teardown_request(self._log_call_counts)
+
+    def _reset_connection_pools(self):
+        # one adapter (and so one pool of connections) for each of dmapiclient's retry policies
+        self._adapters = {}
+        self._adapters_lock = threading.Lock()
+        self._sessions = threading.local()
+
+    def _get_adapter(self, retry_read_timeouts):
+        adapter = self._adapters.get(retry_read_timeouts)
+        if adapter is None:
+            with self._adapters_lock:
+                adapter = self._adapters.get(retry_read_timeouts)
+                if adapter is None:
+                    # dmapiclient makes a new session with the retry policy for every call, so borrow it from one
+                    retry = super()._requests_retry_session(
+                        retry_read_timeouts=retry_read_timeouts
+                    ).get_adapter("https://").max_retries
+                    adapter = self._adapters[retry_read_timeouts] = _InstrumentedHTTPAdapter(
+                        pool_connections=1, pool_maxsize=self._pool_size, max_retries=retry
+                    )
+        return adapter
+
+    def _requests_retry_session(self, *, retry_read_timeouts=True):
+        adapter = self._get_adapter(retry_read_timeouts)
+        sessions = getattr(self._sessions, "sessions", None)
+        if sessions is None:
+            sessions = self._sessions.sessions = {}
+
+        session = sessions.get(retry_read_timeouts)
+        if session is None:
+            session = sessions[retry_read_timeouts] = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        return session
+
+    @staticmethod
+    def _get_memo():
+        if not has_request_context():
+            return None
+        memo = getattr(request, "_data_api_memo", None)
+        if memo is None:
+            with _request_memo_lock:
+                memo = getattr(request, "_data_api_memo", None)
+                if memo is None:
+                    memo = request._data_api_memo = _RequestMemo()
+        return memo
+
+    def _get(self, url, params=None, *, client_wait_for_response=True):
+        memo = self._get_memo()
+        if memo is None:
+            return super()._get(url, params, client_wait_for_response=client_wait_for_response)
+
+        key = self._build_url(url, params)
+        with memo.lock:
+            if key in memo.responses:
+                memo.deduplicated_calls += 1
+                return deepcopy(memo.responses[key])
+            memo.real_calls += 1
+
+        response = super()._get(url, params, client_wait_for_response=client_wait_for_response)
+
+        with memo.lock:
+            memo.responses[key] = deepcopy(response)
+        return response
+
+    def _request(self, method, url, data=None, params=None, *, client_wait_for_response=True):
+        if method != "GET":
+            memo = self._get_memo()
+            if memo is not None:
+                with memo.lock:
+                    memo.responses.clear()
+
+        return super()._request(method, url, data, params, client_wait_for_response=client_wait_for_response)
+
+    @staticmethod
+    def _log_call_counts(exc):
+        memo = getattr(request, "_data_api_memo", None)
+        if memo is None:
+            return
+
+        DATA_API_CALLS_TOTAL.labels("real").inc(memo.real_calls)
+        DATA_API_CALLS_TOTAL.labels("deduplicated").inc(memo.deduplicated_calls)
+        current_app.logger.info(
+            "Made {data_api_real_calls} data API reads ({data_api_deduplicated_calls} more deduplicated)",
+            extra={
+                "data_api_real_calls": memo.real_calls,
+                "data_api_deduplicated_calls": memo.deduplicated_calls,
+            },
+        )
@@ -0,0 +1,259 @@
+import logging
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict
+
+import jinja2
+
+from .metrics import CACHE_EVICTIONS_TOTAL, CACHE_LOOKUPS_TOTAL, CACHE_SIZE_BYTES
+
+
+logger = logging.getLogger(__name__)
+
+# every cache, so that init_app can configure them
+caches = []
+
+# instances of these are either shared between everything that refers to them or aren't data, so we don't count them
+# towards the size of an object that holds a reference to them
+_SHARED_TYPES = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    jinja2.Environment,
+)
+
+# instances of these are counted, but we don't look inside them - a compiled template is mostly references to things
+# shared with its environment
+_OPAQUE_TYPES = (
+    str,
+    bytes,
+    int,
+    float,
+    bool,
+    type(None),
+    jinja2.Template,
+)
+
+
+def _referents(obj):
+    if isinstance(obj, dict):
+        yield from obj.keys()
+        yield from obj.values()
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        yield from obj
+
+    if hasattr(obj, "__dict__"):
+        yield vars(obj)
+    for slot in getattr(type(obj), "__slots__", ()):
+        if hasattr(obj, slot):
+            yield getattr(obj, slot)
+
+
+def approximate_size(obj, _seen=None):
+    """A rough number of bytes used by ``obj`` and everything it refers to.
+
+    Each object is only counted once, however many times it's referred to. This is a lot more expensive than
+    ``sys.getsizeof`` so shouldn't be used on anything large on a hot path.
+    """
+    if _seen is None:
+        _seen = set()
+
+    if id(obj) in _seen or isinstance(obj, _SHARED_TYPES):
+        return 0
+    _seen.add(id(obj))
+
+    if isinstance(obj, _OPAQUE_TYPES):
+        return sys.getsizeof(obj)
+
+    return sys.getsizeof(obj) + sum(approximate_size(referent, _seen) for referent in _referents(obj))
+
+
+class LRUCache(object):
+    """A thread-safe least-recently-used cache with a limit on the (approximate) memory its values use.
+
+    The limit is read from ``max_bytes_config_key`` in the app config by ``init_app``, and a limit of 0 disables the
+    cache altogether - ``get`` always misses and ``set`` does nothing. Until ``init_app`` has been called the cache is
+    disabled.
+
+    Values are sized once, when they're stored, by calling ``sizeof`` on them. Values can also be given a ``ttl`` in
+    seconds when they're stored, after which they're treated as missing, and values stored without one get the ttl
+    read from ``ttl_config_key`` if that's given. Values are returned as they were stored, so anything mutable needs to
+    be copied by the caller before it's changed.
+    """
+
+    def __init__(self, name, max_bytes_config_key, sizeof=approximate_size, ttl_config_key=None):
+        self.name = name
+        self.max_bytes_config_key = max_bytes_config_key
+        self.ttl_config_key = ttl_config_key
+        self.max_bytes = 0
+        self.ttl = None
+        self._sizeof = sizeof
+        self._entries = OrderedDict()
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+        caches.append(self)
+
+    def get(self, key, default=None):
+        if not self.max_bytes:
+            return default
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] is not None and time.monotonic() >= entry[2]:
+                self._current_bytes -= self._entries.pop(key)[1]
+                entry = None
+            elif entry is not None:
+                self._entries.move_to_end(key)
+
+        CACHE_LOOKUPS_TOTAL.labels(self.name, "miss" if entry is None else "hit").inc()
+
+        return default if entry is None else entry[0]
+
+    def set(self, key, value, ttl=None):
+        if ttl is None:
+            ttl = self.ttl
+        if not self.max_bytes or (ttl is not None and ttl <= 0):
+            return
+
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            # it would evict everything else and still not fit
+            return
+
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            if key in self._entries:
+                self._current_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size, expires_at)
+            self._current_bytes += size
+
+            evicted = 0
+            while self._current_bytes > self.max_bytes:
+                self._current_bytes -= self._entries.popitem(last=False)[1][1]
+                evicted += 1
+
+            current_bytes = self._current_bytes
+
+        if evicted:
+            CACHE_EVICTIONS_TOTAL.labels(self.name).inc(evicted)
+        CACHE_SIZE_BYTES.labels(self.name).set(current_bytes)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+
+        CACHE_SIZE_BYTES.labels(self.name).set(0)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def configure(self, config):
+        self.max_bytes = config.get(self.max_bytes_config_key) or 0
+        self.ttl = config.get(self.ttl_config_key) if self.ttl_config_key else None
+        self.clear()
+
+
+class TTLCache(object):
+    """A thread-safe cache of values that are fetched again once they're more than ``ttl`` seconds old.
+
+    Values older than ``refresh_after`` seconds that haven't expired yet are still returned, but are fetched again in
+    a background thread, so that values that are used often are kept fresh without a request having to wait for them.
+    If a background refresh fails the old value is kept until it expires.
+
+    ``ttl`` and ``refresh_after`` are read from the app config by ``init_app``. A ``ttl`` of 0 disables the cache, and
+    until ``init_app`` has been called the cache is disabled. As with ``LRUCache``, values are shared so mustn't be
+    changed.
+    """
+
+    def __init__(self, name, ttl_config_key, refresh_after_config_key):
+        self.name = name
+        self.ttl_config_key = ttl_config_key
+        self.refresh_after_config_key = refresh_after_config_key
+        self.ttl = 0
+        self.refresh_after = 0
+        self._entries = {}
+        self._refreshing = set()
+        # bumped on invalidation, so refreshes started before then don't put back what was invalidated
+        self._generation = 0
+        self._lock = threading.Lock()
+        caches.append(self)
+
+    def get(self, key, fetch):
+        """Return the value for ``key``, calling ``fetch()`` to get it if it isn't cached or has expired"""
+        if not self.ttl:
+            return fetch()
+
+        entry = self._entries.get(key)
+        age = time.monotonic() - entry[1] if entry else None
+        if entry is None or age >= self.ttl:
+            CACHE_LOOKUPS_TOTAL.labels(self.name, "miss").inc()
+            value = fetch()
+            self._entries[key] = (value, time.monotonic())
+            return value
+
+        CACHE_LOOKUPS_TOTAL.labels(self.name, "hit").inc()
+        if self.refresh_after and age >= self.refresh_after:
+            self._refresh_in_background(key, fetch)
+
+        return entry[0]
+
+    def _refresh_in_background(self, key, fetch):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        threading.Thread(target=self._refresh, args=(key, fetch, self._generation), daemon=True).start()
+
+    def _refresh(self, key, fetch, generation):
+        try:
+            value = fetch()
+            if generation == self._generation:
+                self._entries[key] = (value, time.monotonic())
+        except Exception:
+            logger.warning(
+                "Failed to refresh {cache_key} in {cache_name} cache",
+                extra={"cache_key": key, "cache_name": self.name},
+                exc_info=True,
+            )
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def invalidate(self, key=None):
+        """Forget ``key``, or everything if no key is given, so the next ``get`` fetches it again"""
+        self._generation += 1
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def status(self):
+        now = time.monotonic()
+        ages = [now - fetched_at for value, fetched_at in list(self._entries.values())]
+        return {"entries": len(ages), "oldestEntryAge": max(ages) if ages else None}
+
+    def configure(self, config):
+        self.ttl = config.get(self.ttl_config_key) or 0
+        self.refresh_after = config.get(self.refresh_after_config_key) or 0
+        self.invalidate()
+
+
+def caches_status():
+    """A ``_status`` check reporting how full and how old the TTL caches are"""
+    return {
+        "caches": {cache.name: cache.status() for cache in caches if isinstance(cache, TTLCache) and cache.ttl},
+    }
+
+
+def init_app(application):
+    for cache in caches:
+        cache.configure(application.config)
@@ -0,0 +1,33 @@
+import click
+
+
+def init_app(application):
+    @application.cli.command("build-content-bundle")
+    def build_content_bundle_command():
+        """Pre-build the content manifests into a bundle that's quicker to load than the yaml"""
+        from .main import CONTENT_BUNDLE_PATH, CONTENT_MANIFESTS, CONTENT_PATH
+        from .main.content import build_content_bundle
+
+        bundle_manifests = build_content_bundle(CONTENT_PATH, CONTENT_MANIFESTS, CONTENT_BUNDLE_PATH)
+        click.echo("Wrote {} manifests to {}".format(len(bundle_manifests), CONTENT_BUNDLE_PATH), err=True)
+
+    @application.cli.command("warmup")
+    def warm_up_command():
+        """Load the content manifests and compile the templates, as a worker does before serving"""
+        from .warmup import warm_up
+
+        warm_up(application)
+        click.echo("Warmed up in {duration:.2f}s".format(**application.extensions["dm_warm_up"]), err=True)
+
+    @application.cli.command("compile-templates")
+    def compile_templates_command():
+        """Compile the templates into the bytecode cache in DM_TEMPLATE_BYTECODE_CACHE_DIR"""
+        from .templating import compile_templates
+
+        if not application.config["DM_TEMPLATE_BYTECODE_CACHE_DIR"]:
+            raise click.ClickException("DM_TEMPLATE_BYTECODE_CACHE_DIR isn't set")
+
+        compiled, failed = compile_templates(application)
+        click.echo("Compiled {} templates into {}, {} failed".format(
+            len(compiled), application.config["DM_TEMPLATE_BYTECODE_CACHE_DIR"], len(failed)
+        ), err=True)
@@ -1,60 +1,55 @@
-from copy import deepcopy
 from functools import partial
 
 from flask import Blueprint
-from dmcontent.content_loader import ContentLoader
 from dmutils.access_control import require_login
-from dmutils.timing import logged_duration
-from werkzeug.local import Local, LocalProxy
+
+from .content import LazyContentLoader
 
 main = Blueprint('main', __name__)
 public = Blueprint('public', __name__)  # Supplier login not required
 
-# we use our own Local for objects we explicitly want to be able to retain between requests but shouldn't
-# share a common object between concurrent threads/contexts
-_local = Local()
-
-
-def _make_content_loader_factory():
-    master_cl = ContentLoader('app/content')
-
-    master_cl.load_manifest('digital-outcomes-and-specialists', 'briefs', 'edit_brief')
-    master_cl.load_manifest('digital-outcomes-and-specialists', 'brief-responses', 'legacy_edit_brief_response')
-    master_cl.load_manifest('digital-outcomes-and-specialists', 'brief-responses', 'edit_brief_response')
-    master_cl.load_manifest('digital-outcomes-and-specialists', 'brief-responses', 'legacy_display_brief_response')
-    master_cl.load_manifest('digital-outcomes-and-specialists', 'brief-responses', 'display_brief_response')
 
-    master_cl.load_manifest('digital-outcomes-and-specialists-2', 'briefs', 'edit_brief')
-    master_cl.load_manifest('digital-outcomes-and-specialists-2', 'brief-responses', 'edit_brief_response')
-    master_cl.load_manifest('digital-outcomes-and-specialists-2', 'brief-responses', 'display_brief_response')
+# (framework_slug, question_set, manifest) for every manifest the app may need. these are loaded on demand, the first
+# time something asks for them.
+CONTENT_MANIFESTS = (
+    ('digital-outcomes-and-specialists', 'briefs', 'edit_brief'),
+    ('digital-outcomes-and-specialists', 'brief-responses', 'legacy_edit_brief_response'),
+    ('digital-outcomes-and-specialists', 'brief-responses', 'edit_brief_response'),
+    ('digital-outcomes-and-specialists', 'brief-responses', 'legacy_display_brief_response'),
+    ('digital-outcomes-and-specialists', 'brief-responses', 'display_brief_response'),
 
-    master_cl.load_manifest('digital-outcomes-and-specialists-3', 'briefs', 'edit_brief')
-    master_cl.load_manifest('digital-outcomes-and-specialists-3', 'brief-responses', 'edit_brief_response')
-    master_cl.load_manifest('digital-outcomes-and-specialists-3', 'brief-responses', 'display_brief_response')
+    ('digital-outcomes-and-specialists-2', 'briefs', 'edit_brief'),
+    ('digital-outcomes-and-specialists-2', 'brief-responses', 'edit_brief_response'),
+    ('digital-outcomes-and-specialists-2', 'brief-responses', 'display_brief_response'),
 
-    master_cl.load_manifest('digital-outcomes-and-specialists-4', 'briefs', 'edit_brief')
-    master_cl.load_manifest('digital-outcomes-and-specialists-4', 'brief-responses', 'edit_brief_response')
-    master_cl.load_manifest('digital-outcomes-and-specialists-4', 'brief-responses', 'display_brief_response')
+    ('digital-outcomes-and-specialists-3', 'briefs', 'edit_brief'),
+    ('digital-outcomes-and-specialists-3', 'brief-responses', 'edit_brief_response'),
+    ('digital-outcomes-and-specialists-3', 'brief-responses', 'display_brief_response'),
 
-    master_cl.load_manifest('digital-outcomes-and-specialists-5', 'briefs', 'edit_brief')
-    master_cl.load_manifest('digital-outcomes-and-specialists-5', 'brief-responses', 'edit_brief_response')
-    master_cl.load_manifest('digital-outcomes-and-specialists-5', 'brief-responses', 'display_brief_response')
+    ('digital-outcomes-and-specialists-4', 'briefs', 'edit_brief'),
+    ('digital-outcomes-and-specialists-4', 'brief-responses', 'edit_brief_response'),
+    ('digital-outcomes-and-specialists-4', 'brief-responses', 'display_brief_response'),
 
-    # seal master_cl in a closure by returning a function which will only ever return an independent copy of it
-    return lambda: deepcopy(master_cl)
+    ('digital-outcomes-and-specialists-5', 'briefs', 'edit_brief'),
+    ('digital-outcomes-and-specialists-5', 'brief-responses', 'edit_brief_response'),
+    ('digital-outcomes-and-specialists-5', 'brief-responses', 'display_brief_response'),
+)
 
 
-_content_loader_factory = _make_content_loader_factory()
+CONTENT_PATH = 'app/content'
+# written at build time by `flask build-content-bundle`
+CONTENT_BUNDLE_PATH = 'app/content-bundle.pickle'
 
 
-@logged_duration(message="Spent {duration_real}s in get_content_loader")
-def get_content_loader():
-    if not hasattr(_local, "content_loader"):
-        _local.content_loader = _content_loader_factory()
-    return _local.content_loader
+def _make_content_loader():
+    return LazyContentLoader(CONTENT_PATH, CONTENT_MANIFESTS, bundle_path=CONTENT_BUNDLE_PATH)
 
 
-content_loader = LocalProxy(get_content_loader)
+# a single ContentLoader is shared between all threads in the process. nothing writes to a manifest once it's loaded:
+# get_manifest() builds a fresh ContentManifest on every call and filter()/summary() return copies, so per-request
+# mutation (e.g. inject_brief_questions_into_boolean_list_question) only ever touches those copies. it's a plain
+# module-level object rather than a proxy, so using it costs no more than any other global.
+content_loader = _make_content_loader()
 
 
 main.before_request(partial(require_login, role='supplier'))
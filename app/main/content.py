@@ -0,0 +1,217 @@
+import copyreg
+import hashlib
+import io
+import logging
+import os
+import pickle
+import threading
+
+from dmcontent.content_loader import ContentLoader
+from dmcontent.questions import DynamicList, Multiquestion
+from dmcontent.utils import TemplateField
+from dmutils.timing import logged_duration, request_is_sampled
+
+from ..metrics import CACHE_LOOKUPS_TOTAL
+
+
+logger = logging.getLogger(__name__)
+
+# bump this if the structure of the bundle changes so that old bundles are ignored rather than misread
+CONTENT_BUNDLE_VERSION = 1
+
+
+class _ContentBundlePickler(pickle.Pickler):
+    # TemplateFields hold a compiled jinja template which can't be pickled, so we store the field's source and let it
+    # be recompiled when the bundle is loaded. that still saves us reading and parsing all of the yaml.
+    dispatch_table = copyreg.dispatch_table.copy()
+    dispatch_table[TemplateField] = lambda field: (TemplateField, (field.source, field.markdown))
+
+
+def _dumps(obj):
+    buffer = io.BytesIO()
+    _ContentBundlePickler(buffer, pickle.HIGHEST_PROTOCOL).dump(obj)
+    return buffer.getvalue()
+
+
+def _only_depends_on_lot(manifest):
+    """Whether filtering ``manifest`` by lot and then again with the full context gives what filtering it once with the
+    full context does.
+
+    That's the case as long as every question (and question within a multiquestion) is shown depending only on the
+    lot. The questions in a dynamic list aren't filtered at all when it's expanded, so they mustn't depend on anything.
+    """
+    def depends_only_on_lot(question, allowed=("lot",)):
+        if any(depends["on"] not in allowed for depends in question.get("depends", [])):
+            return False
+        if isinstance(question, Multiquestion):
+            nested_allowed = () if isinstance(question, DynamicList) else allowed
+            return all(depends_only_on_lot(nested, nested_allowed) for nested in question.questions)
+        return True
+
+    return all(depends_only_on_lot(question) for section in manifest for question in section.questions)
+
+
+class LazyContentLoader(ContentLoader):
+    """A ContentLoader that loads each of its manifests the first time it's asked for.
+
+    Manifests are registered up front as ``(framework_slug, question_set, manifest)`` tuples but nothing is read from
+    disk until ``get_manifest`` is called for one, so start-up cost scales with the frameworks that are actually being
+    used rather than every framework we've ever had. Loading happens under a lock so concurrent first requests for
+    the same manifest only load it once; once loaded the manifest is read without taking the lock.
+
+    If ``bundle_path`` points at a bundle written by ``build_content_bundle``, manifests are loaded from that in
+    preference to the yaml, as long as the bundle was built from the same content that's on disk now. Otherwise we
+    fall back to the yaml.
+    """
+
+    def __init__(self, content_path, manifests, bundle_path=None):
+        super().__init__(content_path)
+        self._question_sets = {
+            (framework_slug, manifest): question_set for framework_slug, question_set, manifest in manifests
+        }
+        self._load_lock = threading.Lock()
+        self._bundle = self._read_bundle(bundle_path) if bundle_path else {}
+        self._lot_manifests = {}
+
+    def get_manifest(self, framework_slug, manifest):
+        if manifest not in self._content.get(framework_slug, ()):
+            self._load_registered_manifest(framework_slug, manifest)
+
+        # this is called on most requests, so only pay for timing it when the request is being traced
+        if not request_is_sampled(None):
+            return super().get_manifest(framework_slug, manifest)
+
+        with logged_duration(
+            logger=logger,
+            message="Spent {duration_real}s getting manifest {framework_slug}/{manifest}",
+            condition=True,
+        ) as log_context:
+            log_context.update(framework_slug=framework_slug, manifest=manifest)
+            return super().get_manifest(framework_slug, manifest)
+
+    def get_lot_manifest(self, framework_slug, manifest, lot_slug):
+        """Return ``manifest`` filtered down to the sections and questions shown for ``lot_slug``.
+
+        There are only a handful of lots, so these are built once and kept. The returned manifest is shared so must not
+        be changed - call ``filter`` on it with the full (brief-dependent) context to get a copy that's safe to use in a
+        request. That second ``filter`` gives the same result as filtering the unfiltered manifest with the full
+        context as long as nothing but the lot decides which questions are shown, so that's checked when the manifest
+        is loaded, and a manifest where it isn't true is kept unfiltered instead.
+        """
+        key = (framework_slug, manifest, lot_slug)
+        lot_manifest = self._lot_manifests.get(key)
+
+        if lot_manifest is None:
+            CACHE_LOOKUPS_TOTAL.labels("lot_manifests", "miss").inc()
+            lot_manifest = self.get_manifest(framework_slug, manifest)
+            if _only_depends_on_lot(lot_manifest):
+                # not dynamic, as dynamic questions are expanded from the brief, which we don't have yet
+                lot_manifest = lot_manifest.filter({'lot': lot_slug}, dynamic=False)
+            else:
+                logger.warning(
+                    "Not filtering {framework_slug}/{manifest} by lot up front, it has questions that depend on more",
+                    extra={"framework_slug": framework_slug, "manifest": manifest},
+                )
+            # if two threads get here at once we build it twice, which is harmless
+            self._lot_manifests[key] = lot_manifest
+        else:
+            CACHE_LOOKUPS_TOTAL.labels("lot_manifests", "hit").inc()
+
+        return lot_manifest
+
+    def _load_registered_manifest(self, framework_slug, manifest):
+        question_set = self._question_sets.get((framework_slug, manifest))
+        if question_set is None:
+            # leave it to get_manifest to raise ContentNotFoundError
+            return
+
+        with self._load_lock:
+            if manifest in self._content[framework_slug]:
+                # another thread loaded it while we were waiting for the lock
+                return
+
+            with logged_duration(
+                message="Spent {duration_real}s loading manifest {framework_slug}/{manifest} from {source}",
+                condition=True,
+            ) as log_context:
+                log_context.update(framework_slug=framework_slug, manifest=manifest, source="bundle")
+                if not self._load_manifest_from_bundle(framework_slug, question_set, manifest):
+                    log_context["source"] = "yaml"
+                    self.load_manifest(framework_slug, question_set, manifest)
+
+    def _read_bundle(self, bundle_path):
+        try:
+            with open(bundle_path, "rb") as f:
+                bundle = pickle.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            logger.warning("Ignoring unreadable content bundle {bundle_path}", extra={"bundle_path": bundle_path})
+            return {}
+
+        if not isinstance(bundle, dict) or bundle.get("version") != CONTENT_BUNDLE_VERSION:
+            logger.warning("Ignoring out of date content bundle {bundle_path}", extra={"bundle_path": bundle_path})
+            return {}
+
+        return bundle["manifests"]
+
+    def _load_manifest_from_bundle(self, framework_slug, question_set, manifest):
+        entry = self._bundle.get((framework_slug, manifest))
+        if entry is None or entry["question_set"] != question_set:
+            return False
+
+        if entry["fingerprint"] != self.content_fingerprint(framework_slug, question_set):
+            logger.info(
+                "Content bundle is stale for {framework_slug}/{manifest}",
+                extra={"framework_slug": framework_slug, "manifest": manifest},
+            )
+            return False
+
+        try:
+            self._content[framework_slug][manifest] = pickle.loads(entry["sections"])
+        except Exception:
+            logger.warning(
+                "Failed to load {framework_slug}/{manifest} from content bundle",
+                extra={"framework_slug": framework_slug, "manifest": manifest},
+                exc_info=True,
+            )
+            return False
+
+        return True
+
+    def content_fingerprint(self, framework_slug, question_set):
+        """A digest of every file a manifest from ``question_set`` could have been built from"""
+        root_path = self._root_path(framework_slug)
+        digest = hashlib.sha1()
+
+        for directory in (os.path.join(root_path, "manifests"), self._questions_path(framework_slug, question_set)):
+            for dirpath, dirnames, filenames in os.walk(directory):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    path = os.path.join(dirpath, filename)
+                    digest.update(os.path.relpath(path, root_path).encode("utf-8"))
+                    with open(path, "rb") as f:
+                        digest.update(f.read())
+
+        return digest.hexdigest()
+
+
+def build_content_bundle(content_path, manifests, bundle_path):
+    """Load every one of ``manifests`` from yaml and write them out as a bundle a LazyContentLoader can read"""
+    loader = LazyContentLoader(content_path, manifests)
+    bundle_manifests = {}
+
+    for framework_slug, question_set, manifest in manifests:
+        loader.get_manifest(framework_slug, manifest)
+        bundle_manifests[(framework_slug, manifest)] = {
+            "question_set": question_set,
+            "fingerprint": loader.content_fingerprint(framework_slug, question_set),
+            # each manifest is pickled separately so that loading the bundle doesn't mean unpickling (and recompiling
+            # the templates of) every manifest up front
+            "sections": _dumps(loader._content[framework_slug][manifest]),
+        }
+
+    with open(bundle_path, "wb") as f:
+        pickle.dump({"version": CONTENT_BUNDLE_VERSION, "manifests": bundle_manifests}, f, pickle.HIGHEST_PROTOCOL)
+
+    return bundle_manifests
@@ -2,6 +2,7 @@
 
 import six
 
+from datetime import datetime
 from flask import abort, current_app, escape, url_for
 from flask_login import current_user
 
@@ -10,14 +11,73 @@ from dmutils.email.dm_notify import DMNotifyClient
 from dmutils.email.exceptions import EmailError
 from dmutils.email.helpers import hash_string
 from dmutils.env_helpers import get_web_url_from_stage
-from dmutils.formats import dateformat
+from dmutils.formats import DATETIME_FORMAT, dateformat
+from dmcontent.content_loader import ContentManifest
+from dmcontent.questions import Multiquestion
+
+from ...caching import LRUCache
+from .concurrency import fetch_concurrently
+from .frameworks import get_framework_and_lot
+
+
+brief_response_content_cache = LRUCache(
+    "brief_response_content", max_bytes_config_key="DM_BRIEF_RESPONSE_CONTENT_CACHE_MAX_BYTES"
+)
+question_navigation_cache = LRUCache(
+    "question_navigation", max_bytes_config_key="DM_QUESTION_NAVIGATION_CACHE_MAX_BYTES"
+)
+brief_cache = LRUCache("briefs", max_bytes_config_key="DM_BRIEF_CACHE_MAX_BYTES")
+eligibility_cache = LRUCache(
+    "eligibility", max_bytes_config_key="DM_ELIGIBILITY_CACHE_MAX_BYTES", ttl_config_key="DM_ELIGIBILITY_CACHE_TTL"
+)
+
+# briefs in these statuses have finished their time on the marketplace, so will change rarely if ever
+FINISHED_BRIEF_STATUSES = ('closed', 'awarded', 'cancelled', 'unsuccessful', 'withdrawn')
+
+
+def _brief_version_cache_key(brief, *args):
+    # briefs without an updatedAt (ie not from the API) can't be told apart from a later version of themselves
+    if 'updatedAt' not in brief:
+        return None
+    return args + (brief['id'], brief['updatedAt'])
+
+
+def _seconds_until(timestamp):
+    try:
+        return (datetime.strptime(timestamp, DATETIME_FORMAT) - datetime.utcnow()).total_seconds()
+    except (TypeError, ValueError):
+        return None
+
+
+def _brief_cache_ttl(brief):
+    if brief.get('status') in FINISHED_BRIEF_STATUSES:
+        return current_app.config['DM_FINISHED_BRIEF_CACHE_TTL']
+
+    ttl = current_app.config['DM_BRIEF_CACHE_TTL']
+    if brief.get('status') == 'live':
+        # some of a live brief (its status, whether clarification questions are closed) changes at a known time, so
+        # don't keep it past the next of those still to come
+        for change_at in (brief.get('clarificationQuestionsClosedAt'), brief.get('applicationsClosedAt')):
+            seconds_until_change = _seconds_until(change_at)
+            if seconds_until_change is not None and seconds_until_change > 0:
+                ttl = min(ttl, seconds_until_change)
+
+    return ttl
 
 
 def get_brief(data_api_client, brief_id, allowed_statuses=None):
+    """Return the brief with ``brief_id``, or 404 if it isn't in one of ``allowed_statuses``.
+
+    Briefs are cached for a short time while they're open to suppliers, and for much longer once they've finished.
+    The brief returned may be shared with other requests so mustn't be changed.
+    """
     if allowed_statuses is None:
         allowed_statuses = []
 
-    brief = data_api_client.get_brief(brief_id)['briefs']
+    brief = brief_cache.get(brief_id)
+    if brief is None:
+        brief = data_api_client.get_brief(brief_id)['briefs']
+        brief_cache.set(brief_id, brief, ttl=_brief_cache_ttl(brief))
 
     if allowed_statuses and brief['status'] not in allowed_statuses:
         abort(404)
@@ -25,8 +85,174 @@ def get_brief(data_api_client, brief_id, allowed_statuses=None):
     return brief
 
 
-def is_supplier_eligible_for_brief(data_api_client, supplier_id, brief):
-    return data_api_client.is_supplier_eligible_for_brief(supplier_id, brief['id'])
+def is_supplier_eligible_for_brief(data_api_client, supplier_id, brief_id):
+    """Whether the supplier can respond to the brief, which depends on the supplier's services and on the brief.
+
+    Both answers are cached for ``DM_ELIGIBILITY_CACHE_TTL`` seconds, so a supplier who isn't eligible doesn't cost an
+    API call every time they reload the page telling them so. Nothing in this app changes a supplier's services or a
+    brief, so the cache is never invalidated: a supplier whose eligibility changes elsewhere sees the old answer until
+    it expires.
+    """
+    is_eligible = eligibility_cache.get((supplier_id, brief_id))
+    if is_eligible is None:
+        is_eligible = data_api_client.is_supplier_eligible_for_brief(supplier_id, brief_id)
+        eligibility_cache.set((supplier_id, brief_id), is_eligible)
+
+    return is_eligible
+
+
+class BriefResponsePageContext(object):
+    """What the pages about a supplier's response to a brief are built from, see ``load_brief_response_page_context``.
+
+    ``brief`` is there straight away. The rest were fetched at the same time as each other, and each waits for its
+    fetch when it's first used (raising anything the fetch raised, including an ``abort``), so views can check them
+    in whatever order they need to:
+
+    - ``brief_responses`` - the supplier's responses to the brief
+    - ``is_eligible`` - whether the supplier is eligible to respond to the brief
+    - ``framework`` and ``lot`` - the brief's framework (404ing unless it's live or expired) and lot, if they were
+      asked for
+    """
+
+    def __init__(self, brief, brief_responses_future, is_eligible_future, framework_and_lot_future):
+        self.brief = brief
+        self._brief_responses_future = brief_responses_future
+        self._is_eligible_future = is_eligible_future
+        self._framework_and_lot_future = framework_and_lot_future
+
+    @property
+    def brief_responses(self):
+        return self._brief_responses_future.result()
+
+    @property
+    def is_eligible(self):
+        return self._is_eligible_future.result()
+
+    @property
+    def framework(self):
+        return self._framework_and_lot_future.result()[0]
+
+    @property
+    def lot(self):
+        return self._framework_and_lot_future.result()[1]
+
+
+def load_brief_response_page_context(
+    data_api_client, brief_id, allowed_statuses, brief_response_id=None, brief_response_status=None,
+    with_framework=False,
+):
+    """Fetch everything the brief response pages need about ``brief_id`` and the current user's responses to it,
+    404ing if the brief isn't in one of ``allowed_statuses``.
+
+    If ``brief_response_id`` is given that's the only response fetched, 404ing if it isn't the current user's
+    supplier's response to this brief. Otherwise all of the supplier's responses to the brief are fetched, in
+    ``brief_response_status`` if given. The brief's framework and lot are only fetched if ``with_framework`` is set.
+
+    The brief and responses are fetched together, then the supplier's eligibility and the framework are fetched
+    together once we know the brief is one we'll show (and the response, if we were given one, is the supplier's), so
+    a request for a brief or response that isn't doesn't go any further.
+    """
+    supplier_id = current_user.supplier_id
+
+    def get_brief_responses():
+        if brief_response_id is None:
+            return data_api_client.find_brief_responses(
+                brief_id=brief_id, supplier_id=supplier_id, status=brief_response_status
+            )['briefResponses']
+
+        brief_response = data_api_client.get_brief_response(brief_response_id)['briefResponses']
+        if brief_response['briefId'] != brief_id or brief_response['supplierId'] != supplier_id:
+            return []
+        return [brief_response]
+
+    brief_future, brief_responses_future = fetch_concurrently(
+        lambda: get_brief(data_api_client, brief_id, allowed_statuses=allowed_statuses),
+        get_brief_responses,
+    )
+    brief = brief_future.result()
+    if brief_response_id is not None and not brief_responses_future.result():
+        abort(404)
+
+    def get_is_eligible():
+        return is_supplier_eligible_for_brief(data_api_client, supplier_id, brief_id)
+
+    if with_framework:
+        is_eligible_future, framework_and_lot_future = fetch_concurrently(
+            get_is_eligible,
+            lambda: get_framework_and_lot(
+                data_api_client, brief['frameworkSlug'], brief['lotSlug'], allowed_statuses=['live', 'expired']
+            ),
+        )
+    else:
+        (is_eligible_future,), framework_and_lot_future = fetch_concurrently(get_is_eligible), None
+
+    return BriefResponsePageContext(brief, brief_responses_future, is_eligible_future, framework_and_lot_future)
+
+
+def get_brief_response_content(content_loader, framework_slug, manifest, lot_slug, brief):
+    """Return ``manifest`` filtered for ``brief`` and with its questions injected into the boolean list question.
+
+    This only depends on the brief, so is cached for each version of a brief. Each call gets its own copy of the
+    sections so callers can rearrange them, but the questions are shared and mustn't be changed.
+    """
+    cache_key = _brief_version_cache_key(brief, framework_slug, manifest, lot_slug)
+
+    response_content = brief_response_content_cache.get(cache_key) if cache_key else None
+    if response_content is None:
+        response_content = content_loader.get_lot_manifest(
+            framework_slug, manifest, lot_slug
+        ).filter({'lot': lot_slug, 'brief': brief})
+        for section in response_content:
+            section.inject_brief_questions_into_boolean_list_question(brief)
+
+        if cache_key:
+            brief_response_content_cache.set(cache_key, response_content)
+
+    return ContentManifest(response_content.sections)
+
+
+def build_question_navigation(section, brief):
+    """Map the id of each question in ``section`` that's shown for ``brief`` to the ids of the questions before and
+    after it, with ``None`` mapping to the first question.
+
+    If a question in a brief is optional and is unanswered by the buyer, the brief will have the key but will have no
+    data. Those questions are skipped in the brief response flow, so aren't in the navigation at all. This was created
+    specifically for nice to have requirements, and works because briefs and responses share the same key for this
+    question/response.
+
+    The questions inside multiquestions can be edited on their own too, as their own last page, so they're in the
+    navigation with no question before or after them.
+    """
+    def is_shown(question_id):
+        return not (question_id in brief and not brief[question_id])
+
+    question_ids = [question.id for question in section.questions if is_shown(question.id)]
+
+    navigation = {None: (None, question_ids[0] if question_ids else None)}
+    for question in section.questions:
+        if isinstance(question, Multiquestion):
+            navigation.update(
+                (sub_question.id, (None, None)) for sub_question in question.questions if is_shown(sub_question.id)
+            )
+    for previous_question_id, question_id, next_question_id in zip(
+        [None] + question_ids, question_ids, question_ids[1:] + [None]
+    ):
+        navigation[question_id] = (previous_question_id, next_question_id)
+
+    return navigation
+
+
+def get_question_navigation(framework_slug, lot_slug, section, brief):
+    """Return ``build_question_navigation(section, brief)``, cached for each version of a brief"""
+    cache_key = _brief_version_cache_key(brief, framework_slug, lot_slug, section.id)
+
+    navigation = question_navigation_cache.get(cache_key) if cache_key else None
+    if navigation is None:
+        navigation = build_question_navigation(section, brief)
+        if cache_key:
+            question_navigation_cache.set(cache_key, navigation)
+
+    return navigation
 
 
 def send_brief_clarification_question(data_api_client, brief, clarification_question):
@@ -0,0 +1,71 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+import threading
+
+from flask import current_app, has_request_context
+from flask.globals import _request_ctx_stack
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=current_app.config["DM_CONCURRENT_FETCH_THREADS"],
+                    thread_name_prefix="concurrent-fetch",
+                )
+    return _executor
+
+
+def _in_copy_of_request_context(f):
+    # flask.copy_current_request_context would do, except that the copy opens its own session and, when it's
+    # finished with, runs the app's teardown_request functions and closes the request out from under the view. we
+    # only need the request (for the data API client's onward headers and per-request memo) and the logged in user,
+    # so push a copy that shares those without any of the rest. each thread gets its own app context (and so its own
+    # `g`), as nothing on `g` expects to be used from more than one thread at once.
+    app = current_app._get_current_object()
+    request_context = _request_ctx_stack.top
+    request_context_copy = request_context.copy()
+    request_context_copy.session = request_context.session
+    if hasattr(request_context, "user"):
+        request_context_copy.user = request_context.user
+
+    def wrapper():
+        with app.app_context():
+            _request_ctx_stack.push(request_context_copy)
+            try:
+                return f()
+            finally:
+                _request_ctx_stack.pop()
+
+    return wrapper
+
+
+def fetch_concurrently(*fetches):
+    """Call each of ``fetches`` (functions taking no arguments) at the same time, in a pool of threads, returning a
+    ``Future`` for each.
+
+    The functions run in a copy of the current request context, so can use the data API client, ``request`` and
+    ``current_user`` as usual, but each has its own ``g``. Any exception a function raises (including ``abort``) is
+    raised when its future's ``result()`` is called, so callers can keep their checks in the order they've always been
+    in by resolving the futures in that order. Outside of a request the functions are called one after another,
+    before returning.
+    """
+    if not has_request_context():
+        return [_call_now(fetch) for fetch in fetches]
+
+    executor = _get_executor()
+    return [executor.submit(_in_copy_of_request_context(fetch)) for fetch in fetches]
+
+
+def _call_now(fetch):
+    future = Future()
+    try:
+        future.set_result(fetch())
+    except Exception as e:
+        future.set_exception(e)
+    return future
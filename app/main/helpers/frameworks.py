@@ -1,12 +1,24 @@
 # -*- coding: utf-8 -*-
 from flask import abort
 
+from ...caching import TTLCache
+
+
+# a framework's status and lots only change a few times a year, so there's no need to ask the API on every request.
+# they're never changed through this app, so nothing invalidates the cache: a change shows once the framework's been
+# refreshed, within DM_FRAMEWORK_CACHE_TTL seconds
+framework_cache = TTLCache(
+    "frameworks",
+    ttl_config_key="DM_FRAMEWORK_CACHE_TTL",
+    refresh_after_config_key="DM_FRAMEWORK_CACHE_REFRESH_AFTER",
+)
+
 
 def get_framework(client, framework_slug, allowed_statuses=None):
     if allowed_statuses is None:
         allowed_statuses = ['open', 'pending', 'standstill', 'live']
 
-    framework = client.get_framework(framework_slug)['frameworks']
+    framework = framework_cache.get(framework_slug, lambda: client.get_framework(framework_slug)['frameworks'])
 
     if allowed_statuses and framework['status'] not in allowed_statuses:
         abort(404)
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+from ...caching import LRUCache
+
+
+supplier_services_cache = LRUCache(
+    "supplier_services",
+    max_bytes_config_key="DM_SUPPLIER_SERVICES_CACHE_MAX_BYTES",
+    ttl_config_key="DM_SUPPLIER_SERVICES_CACHE_TTL",
+)
+
+
+class SupplierServiceIndex(object):
+    """A supplier's published services on a framework, indexed by lot"""
+
+    def __init__(self, services):
+        self._services_by_lot = {}
+        for service in services:
+            self._services_by_lot.setdefault(service.get('lotSlug'), []).append(service)
+
+    @property
+    def on_framework(self):
+        return bool(self._services_by_lot)
+
+    def on_lot(self, lot_slug):
+        return lot_slug in self._services_by_lot
+
+    def max_day_rate(self, lot_slug, role):
+        """The most the supplier charges per day for ``role`` on ``lot_slug``, if they've said"""
+        services = self._services_by_lot.get(lot_slug)
+        return services[0].get(role + "PriceMax") if services else None
+
+
+def get_supplier_service_index(data_api_client, supplier_id, framework_slug):
+    """Return a ``SupplierServiceIndex`` of the supplier's published services on the framework.
+
+    This takes one API call, and is cached for ``DM_SUPPLIER_SERVICES_CACHE_TTL`` seconds. Suppliers' services aren't
+    changed through this app, so the cache is never invalidated: changes made elsewhere show once it expires.
+    """
+    index = supplier_services_cache.get((supplier_id, framework_slug))
+    if index is None:
+        # find_services isn't paginated when it's given a supplier
+        index = SupplierServiceIndex(data_api_client.find_services(
+            supplier_id=supplier_id,
+            framework=framework_slug,
+            status="published",
+        )["services"])
+        supplier_services_cache.set((supplier_id, framework_slug), index)
+
+    return index
@@ -11,10 +11,15 @@ from dmutils.forms.errors import govuk_errors
 
 from ..helpers.briefs import (
     get_brief,
+    get_brief_response_content,
+    get_question_navigation,
     is_supplier_eligible_for_brief,
+    load_brief_response_page_context,
     send_brief_clarification_question
 )
+from ..helpers.concurrency import fetch_concurrently
 from ..helpers.frameworks import get_framework_and_lot
+from ..helpers.suppliers import get_supplier_service_index
 from ..helpers.briefs import is_legacy_brief_response
 from ...main import main, public, content_loader
 from ... import data_api_client
@@ -35,7 +40,7 @@ def question_and_answer_session(brief_id):
     if brief['clarificationQuestionsAreClosed']:
         abort(404)
 
-    if not is_supplier_eligible_for_brief(data_api_client, current_user.supplier_id, brief):
+    if not is_supplier_eligible_for_brief(data_api_client, current_user.supplier_id, brief['id']):
         return _render_not_eligible_for_brief_error_page(brief, clarification_question=True)
 
     return render_template(
@@ -51,7 +56,7 @@ def ask_brief_clarification_question(brief_id):
     if brief['clarificationQuestionsAreClosed']:
         abort(404)
 
-    if not is_supplier_eligible_for_brief(data_api_client, current_user.supplier_id, brief):
+    if not is_supplier_eligible_for_brief(data_api_client, current_user.supplier_id, brief['id']):
         return _render_not_eligible_for_brief_error_page(brief, clarification_question=True)
 
     form = AskClarificationQuestionForm(brief)
@@ -71,16 +76,15 @@ def ask_brief_clarification_question(brief_id):
 
 @main.route('/<int:brief_id>/responses/start', methods=['GET', 'POST'])
 def start_brief_response(brief_id):
-    brief = get_brief(data_api_client, brief_id, allowed_statuses=['live'])
+    page = load_brief_response_page_context(
+        data_api_client, brief_id, allowed_statuses=['live'], brief_response_status='draft,submitted'
+    )
+    brief = page.brief
 
-    if not is_supplier_eligible_for_brief(data_api_client, current_user.supplier_id, brief):
+    if not page.is_eligible:
         return _render_not_eligible_for_brief_error_page(brief)
 
-    brief_response = data_api_client.find_brief_responses(
-        brief_id=brief_id,
-        supplier_id=current_user.supplier_id,
-        status='draft,submitted'
-    )['briefResponses']
+    brief_response = page.brief_responses
 
     if brief_response and brief_response[0]['status'] == 'submitted':
         return redirect(
@@ -125,49 +129,53 @@ def start_brief_response(brief_id):
 )
 def edit_brief_response(brief_id, brief_response_id, question_id=None):
     edit_single_question_flow = request.endpoint.endswith('.edit_single_question')
+    supplier_id = current_user.supplier_id
+
+    # These only need the ids we already have, so fetch them all at once. The results are checked in the same order
+    # as if we'd fetched them one by one.
+    brief_future, brief_response_future, is_eligible_future = fetch_concurrently(
+        lambda: get_brief(data_api_client, brief_id, allowed_statuses=['live']),
+        lambda: data_api_client.get_brief_response(brief_response_id)['briefResponses'],
+        lambda: is_supplier_eligible_for_brief(data_api_client, supplier_id, brief_id),
+    )
+    brief = brief_future.result()
 
-    brief = get_brief(data_api_client, brief_id, allowed_statuses=['live'])
-    brief_response = data_api_client.get_brief_response(brief_response_id)['briefResponses']
-
-    if brief_response['briefId'] != brief['id'] or brief_response['supplierId'] != current_user.supplier_id:
+    brief_response = brief_response_future.result()
+    if brief_response['briefId'] != brief['id'] or brief_response['supplierId'] != supplier_id:
         abort(404)
 
-    if not is_supplier_eligible_for_brief(data_api_client, current_user.supplier_id, brief):
+    if not is_eligible_future.result():
         return _render_not_eligible_for_brief_error_page(brief)
 
-    framework, lot = get_framework_and_lot(
-        data_api_client, brief['frameworkSlug'], brief['lotSlug'], allowed_statuses=['live', 'expired'])
-
-    max_day_rate = None
+    # ...whereas these need the brief, and are only worth fetching once we know we're showing the response
     role = brief.get('specialistRole')
-    if role:
-        brief_service = data_api_client.find_services(
-            supplier_id=current_user.supplier_id,
-            framework=brief['frameworkSlug'],
-            status="published",
-            lot=brief["lotSlug"],
-        )["services"][0]
-        max_day_rate = brief_service.get(role + "PriceMax")
-
-    content = content_loader.get_manifest(
-        brief['frameworkSlug'], 'edit_brief_response'
+    framework_and_lot_future, service_index_future = fetch_concurrently(
+        lambda: get_framework_and_lot(
+            data_api_client, brief['frameworkSlug'], brief['lotSlug'], allowed_statuses=['live', 'expired']
+        ),
+        lambda: get_supplier_service_index(data_api_client, supplier_id, brief['frameworkSlug']) if role else None,
+    )
+
+    framework, lot = framework_and_lot_future.result()
+
+    max_day_rate = service_index_future.result().max_day_rate(brief['lotSlug'], role) if role else None
+
+    content = content_loader.get_lot_manifest(
+        brief['frameworkSlug'], 'edit_brief_response', lot['slug']
     ).filter({'lot': lot['slug'], 'brief': brief, 'max_day_rate': max_day_rate})
 
     section = content.get_section(content.get_next_editable_section_id())
     if section is None or not section.editable:
         abort(404)
 
-    # If a question in a brief is optional and is unanswered by the buyer, the brief will have the key but will have no
-    # data. The question will be skipped in the brief response flow (see below). If a user attempts to access the
-    # question by directly visiting the url, this check will return a 404. It has been created specifically for nice to
-    # have requirements, and works because briefs and responses share the same key for this question/response.
-    if question_id in brief.keys() and not brief[question_id]:
+    # Questions the buyer didn't give us anything to respond to (ie empty nice to have requirements) are skipped in the
+    # brief response flow, so aren't in the navigation. If a user attempts to access one of those (or a question that
+    # doesn't exist) by directly visiting the url we return a 404.
+    navigation = get_question_navigation(brief['frameworkSlug'], lot['slug'], section, brief)
+    if question_id not in navigation:
         abort(404)
 
-    # If a question is to be skipped in the normal flow (due to the reason above), we update the next_question_id.
-    next_question_id = section.get_next_question_id(question_id)
-    if next_question_id in brief.keys() and not brief[next_question_id]:
-        next_question_id = section.get_next_question_id(next_question_id)
+    previous_question_id, next_question_id = navigation[question_id]
 
     def redirect_to_next_page():
         return redirect(url_for(
@@ -220,11 +228,6 @@ def edit_brief_response(brief_id, brief_response_id, question_id=None):
                     url_for('.check_brief_response_answers', brief_id=brief_id, brief_response_id=brief_response_id)
                 )
 
-    previous_question_id = section.get_previous_question_id(question_id)
-    # Skip previous question if the brief has no nice to have requirements
-    if previous_question_id in brief.keys() and not brief[previous_question_id]:
-        previous_question_id = section.get_previous_question_id(previous_question_id)
-
     previous_question_url = None
     if previous_question_id:
         previous_question_url = url_for(
@@ -247,28 +250,29 @@ def edit_brief_response(brief_id, brief_response_id, question_id=None):
 
 @main.route('/<int:brief_id>/responses/<int:brief_response_id>/application', methods=['GET', 'POST'])
 def check_brief_response_answers(brief_id, brief_response_id):
-    brief = get_brief(
-        data_api_client, brief_id, allowed_statuses=['live', 'closed', 'awarded', 'cancelled', 'unsuccessful']
+    page = load_brief_response_page_context(
+        data_api_client,
+        brief_id,
+        allowed_statuses=['live', 'closed', 'awarded', 'cancelled', 'unsuccessful'],
+        brief_response_id=brief_response_id,
+        with_framework=True,
     )
-    brief_response = data_api_client.get_brief_response(brief_response_id)['briefResponses']
-    if brief_response['briefId'] != brief['id'] or brief_response['supplierId'] != current_user.supplier_id:
-        abort(404)
+    brief = page.brief
+    brief_response = page.brief_responses[0]
 
-    if not is_supplier_eligible_for_brief(data_api_client, current_user.supplier_id, brief):
+    if not page.is_eligible:
         return _render_not_eligible_for_brief_error_page(brief)
 
-    framework, lot = get_framework_and_lot(
-        data_api_client, brief['frameworkSlug'], brief['lotSlug'], allowed_statuses=['live', 'expired'])
+    framework, lot = page.framework, page.lot
 
     if is_legacy_brief_response(brief_response):
         display_brief_response_manifest = 'legacy_display_brief_response'
     else:
         display_brief_response_manifest = 'display_brief_response'
 
-    response_content = content_loader.get_manifest(
-        framework['slug'], display_brief_response_manifest).filter({'lot': lot['slug'], 'brief': brief})
-    for section in response_content:
-        section.inject_brief_questions_into_boolean_list_question(brief)
+    response_content = get_brief_response_content(
+        content_loader, framework['slug'], display_brief_response_manifest, lot['slug'], brief
+    )
 
     error_message = None
     if request.method == 'POST':
@@ -317,14 +321,15 @@ def check_brief_response_answers(brief_id, brief_response_id):
 
 @main.route('/<int:brief_id>/responses/result')
 def application_submitted(brief_id):
-    brief = get_brief(data_api_client, brief_id, allowed_statuses=PUBLISHED_BRIEF_STATUSES)
-    if not is_supplier_eligible_for_brief(data_api_client, current_user.supplier_id, brief):
+    page = load_brief_response_page_context(
+        data_api_client, brief_id, allowed_statuses=PUBLISHED_BRIEF_STATUSES, with_framework=True
+    )
+    brief = page.brief
+
+    if not page.is_eligible:
         return _render_not_eligible_for_brief_error_page(brief)
 
-    brief_response = data_api_client.find_brief_responses(
-        brief_id=brief_id,
-        supplier_id=current_user.supplier_id
-    )['briefResponses']
+    brief_response = page.brief_responses
 
     if len(brief_response) == 0:
         # No application
@@ -337,16 +342,15 @@ def application_submitted(brief_id):
 
     # Otherwise the application is valid
     brief_response = brief_response[0]
-    framework, lot = get_framework_and_lot(
-        data_api_client, brief['frameworkSlug'], brief['lotSlug'], allowed_statuses=['live', 'expired'])
+    framework, lot = page.framework, page.lot
 
-    response_content = content_loader.get_manifest(
-        framework['slug'], 'display_brief_response').filter({'lot': lot['slug'], 'brief': brief})
-    for section in response_content:
-        section.inject_brief_questions_into_boolean_list_question(brief)
+    response_content = get_brief_response_content(
+        content_loader, framework['slug'], 'display_brief_response', lot['slug'], brief
+    )
 
-    brief_content = content_loader.get_manifest(
-        framework['slug'], 'edit_brief').filter({'lot': lot['slug']})
+    brief_content = content_loader.get_lot_manifest(framework['slug'], 'edit_brief', lot['slug']).filter(
+        {'lot': lot['slug']}
+    )
     brief_summary = brief_content.summary(brief)
 
     return render_template(
@@ -376,14 +380,10 @@ def redirect_to_public_opportunity_page(brief_id):
 
 
 def _render_not_eligible_for_brief_error_page(brief, clarification_question=False):
-    common_kwargs = {
-        "supplier_id": current_user.supplier_id,
-        "framework": brief['frameworkSlug'],
-        "status": "published",
-    }
-
-    if data_api_client.find_services(**common_kwargs)["services"]:
-        if data_api_client.find_services(**dict(common_kwargs, lot=brief["lotSlug"]))["services"]:
+    service_index = get_supplier_service_index(data_api_client, current_user.supplier_id, brief['frameworkSlug'])
+
+    if service_index.on_framework:
+        if service_index.on_lot(brief["lotSlug"]):
             # deduce that the problem is that the roles don't match.
             reason = data_reason_slug = "supplier-not-on-role"
         else:
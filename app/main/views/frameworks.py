@@ -8,6 +8,7 @@ from dmutils.flask import timed_render_template as render_template
 from dmutils.formats import DATETIME_FORMAT, dateformat
 from ... import data_api_client
 from ...main import main
+from ..helpers.frameworks import get_framework
 
 BRIEF_RESPONSE_STATUSES = ['draft', 'submitted', 'pending-awarded', 'awarded']
 
@@ -15,7 +16,7 @@ BRIEF_RESPONSE_STATUSES = ['draft', 'submitted', 'pending-awarded', 'awarded']
 @main.route('/frameworks/<framework_slug>', methods=['GET'])
 def opportunities_dashboard(framework_slug):
     try:
-        framework = data_api_client.get_framework(slug=framework_slug)['frameworks']
+        framework = get_framework(data_api_client, framework_slug, allowed_statuses=[])
         supplier_framework = data_api_client.get_supplier_framework_info(
             supplier_id=current_user.supplier_id,
             framework_slug=framework['slug']
@@ -2,11 +2,61 @@ from flask import Blueprint
 from flask.signals import got_request_exception, request_finished
 
 from gds_metrics import GDSMetrics
+from gds_metrics.metrics import Counter, Gauge
 
 
 metrics = Blueprint('metrics', __name__)
 
 
+CACHE_LOOKUPS_TOTAL = Counter(
+    'dm_cache_lookups_total',
+    'Lookups in in-process caches, by cache and whether they were a hit or a miss',
+    ['cache', 'result'],
+)
+
+CACHE_EVICTIONS_TOTAL = Counter(
+    'dm_cache_evictions_total',
+    'Entries evicted from in-process caches to make room for new ones',
+    ['cache'],
+)
+
+CACHE_SIZE_BYTES = Gauge(
+    'dm_cache_size_bytes',
+    'Approximate memory used by the values in in-process caches',
+    ['cache'],
+    multiprocess_mode='livesum',
+)
+
+
+DATA_API_CALLS_TOTAL = Counter(
+    'dm_data_api_calls_total',
+    'Reads from the data API, by whether they were made or answered from earlier in the same request',
+    ['result'],
+)
+
+DATA_API_CONNECTIONS_IN_USE = Gauge(
+    'dm_data_api_connections_in_use',
+    'Connections to the data API currently being used by a call',
+    multiprocess_mode='livesum',
+)
+
+DATA_API_NEW_CONNECTIONS_TOTAL = Counter(
+    'dm_data_api_new_connections_total',
+    'Connections opened to the data API, rather than reused from the connection pool',
+)
+
+DATA_API_POOL_EXHAUSTED_TOTAL = Counter(
+    'dm_data_api_connection_pool_exhausted_total',
+    'Data API calls that found every pooled connection in use, so opened one that is closed afterwards',
+)
+
+SESSION_WRITES_TOTAL = Counter(
+    'dm_session_writes_total',
+    'Sessions written to the session store, by whether they had changed or were refreshed to keep them alive',
+    ['reason'],
+)
+
+
 class DMGDSMetrics(GDSMetrics):
     """Custom metrics class to prevent metrics endpoint being bound to base application object.
 
@@ -0,0 +1,87 @@
+"""Profiling single requests on demand, outside production.
+
+With ``DM_PROFILING_ENABLED`` on, a request with an ``X-DM-Profile`` header or a ``_profile`` query parameter is run
+under cProfile, from the app's before_request hooks to the end of the view - including rendering its template with
+``timed_render_template`` - and the stats are written to ``DM_PROFILING_OUTPUT_DIR/<profile id>.prof``. The
+profile id is the request id, if that's a plain name (letters, digits, ``-`` and ``_``), or a random one if not -
+request ids come from the client, so can't be trusted to stay inside the output directory. The file's path is logged.
+Look at the stats with ``python -m pstats`` or snakeviz::
+
+    curl -H "X-DM-Profile: 1" -H "DM-Request-ID: slow-question" http://localhost:5003/suppliers/opportunities/...
+    python -m pstats /tmp/dm-profiles/slow-question.prof
+
+Only the request's own thread is profiled, so time spent in API calls made with ``fetch_concurrently`` shows up as
+waiting for their results. Profiling is never turned on in production, whatever the config says.
+"""
+import cProfile
+import logging
+import os
+import re
+from uuid import uuid4
+
+from flask import current_app, g, request
+
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-DM-Profile"
+PROFILE_QUERY_PARAMETER = "_profile"
+
+_SAFE_PROFILE_ID = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+def _wants_profile():
+    return PROFILE_HEADER in request.headers or PROFILE_QUERY_PARAMETER in request.args
+
+
+def _profile_id(request_id):
+    """``request_id`` if it's safe to use as a file name, otherwise a random id"""
+    if request_id and _SAFE_PROFILE_ID.fullmatch(request_id):
+        return request_id
+    return uuid4().hex
+
+
+def stats_path(app, profile_id):
+    return os.path.join(app.config["DM_PROFILING_OUTPUT_DIR"], "{}.prof".format(profile_id))
+
+
+def _start_profiling():
+    if not _wants_profile():
+        return
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # from Python 3.12 only one profiler can run at a time, so concurrent profiled requests can't all be
+        logger.warning("Not profiling request, another profiled request is running")
+        return
+    g.profiler = profiler
+
+
+def _stop_profiling(exception=None):
+    profiler = g.pop("profiler", None)
+    if profiler is None:
+        return
+    profiler.disable()
+
+    profile_id = _profile_id(request.trace_id)
+    path = stats_path(current_app, profile_id)
+    os.makedirs(current_app.config["DM_PROFILING_OUTPUT_DIR"], exist_ok=True)
+    profiler.dump_stats(path)
+    logger.info(
+        "Profiled {method} {url} as {profile_id}, stats written to {stats_path}",
+        extra={"method": request.method, "url": request.url, "profile_id": profile_id, "stats_path": path},
+    )
+
+
+def init_app(application):
+    if not application.config["DM_PROFILING_ENABLED"]:
+        return
+    if application.config.get("DM_ENVIRONMENT") == "production":
+        logger.warning("Not turning on request profiling in production")
+        return
+
+    application.before_request(_start_profiling)
+    # a teardown rather than after_request, so a view that raises doesn't leave the profiler running
+    application.teardown_request(_stop_profiling)
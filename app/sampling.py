@@ -0,0 +1,154 @@
+"""A low overhead sampling profiler for deployed workers.
+
+With ``DM_SAMPLING_PROFILER_INTERVAL_MS`` set, each worker process runs a background thread that, every that many
+milliseconds, looks at what each thread handling a request is doing and counts its stack against the request's
+endpoint. Nothing is added to the requests themselves beyond noting which thread is handling which endpoint.
+
+The counts are served as collapsed stacks - one ``endpoint;frame;frame... count`` line per stack, as read by
+flamegraph.pl and speedscope - from ``_stacks`` next to the metrics endpoint, to requests with an
+``Authorization: Bearer <DM_SAMPLING_PROFILER_AUTH_TOKEN>`` header. ``?endpoint=main.edit_brief_response`` only gives
+the stacks for one endpoint. Each worker keeps its own counts, so each request to ``_stacks`` sees whichever worker
+answers it.
+
+Only request threads are sampled, so time in API calls made with ``fetch_concurrently`` shows up as the view waiting
+for their results.
+"""
+import hmac
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from flask import abort, current_app, request, Response
+
+from .metrics import metrics
+
+
+# frames deeper than this are left off the bottom (the root end) of a stack
+MAX_STACK_DEPTH = 100
+
+# once this many different stacks have been seen, any others are counted together as this
+OTHER_STACKS = "[other stacks]"
+
+
+class StackSampler(object):
+    def __init__(self, interval, max_stacks):
+        self.interval = interval
+        self.max_stacks = max_stacks
+        self.stacks = Counter()
+        # endpoint of the request each thread is handling, by thread ident
+        self._requests = {}
+        # "module:function" for each code object seen, so they're only formatted once
+        self._labels = {}
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def ensure_started(self):
+        """Start sampling in this process, if it hasn't been already.
+
+        Threads don't survive a fork, so this is called from each request rather than when the app's created, in case
+        that happens before the web server forks its workers.
+        """
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self.stacks.clear()
+                self._requests.clear()
+                threading.Thread(target=self._run, name="stack-sampler", daemon=True).start()
+
+    def request_started(self, endpoint):
+        self._requests[threading.get_ident()] = endpoint
+
+    def request_finished(self):
+        self._requests.pop(threading.get_ident(), None)
+
+    def _run(self):
+        pid = os.getpid()
+        while self._pid == pid:
+            time.sleep(self.interval)
+            self.sample()
+
+    def sample(self):
+        requests = dict(self._requests)
+        frames = sys._current_frames()
+        for thread_ident, endpoint in requests.items():
+            frame = frames.get(thread_ident)
+            if frame is not None:
+                self._count(endpoint, self._stack(frame))
+
+    def _stack(self, frame):
+        labels = []
+        while frame is not None and len(labels) < MAX_STACK_DEPTH:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = "{}:{}".format(frame.f_globals.get("__name__", "?"), code.co_name)
+            labels.append(label)
+            frame = frame.f_back
+        return ";".join(reversed(labels))
+
+    def _count(self, endpoint, stack):
+        key = (endpoint, stack)
+        with self._lock:
+            if key not in self.stacks and len(self.stacks) >= self.max_stacks:
+                key = (endpoint, OTHER_STACKS)
+            self.stacks[key] += 1
+
+    def collapsed(self, endpoint=None):
+        with self._lock:
+            stacks = sorted(self.stacks.items())
+        return "".join(
+            "{};{} {}\n".format(stack_endpoint, stack, count)
+            for (stack_endpoint, stack), count in stacks
+            if endpoint is None or stack_endpoint == endpoint
+        )
+
+
+def _sampler():
+    return current_app.extensions.get("stack_sampler")
+
+
+def _request_started():
+    sampler = _sampler()
+    sampler.ensure_started()
+    sampler.request_started(request.endpoint)
+
+
+def _request_finished(exception=None):
+    _sampler().request_finished()
+
+
+def _is_authorised():
+    token = current_app.config["DM_SAMPLING_PROFILER_AUTH_TOKEN"]
+    return bool(token) and hmac.compare_digest(
+        request.headers.get("Authorization", "").encode(), "Bearer {}".format(token).encode()
+    )
+
+
+def stacks():
+    sampler = _sampler()
+    if sampler is None:
+        abort(404)
+    if not _is_authorised():
+        # not abort(401), which would redirect to the login page
+        return Response("", status=401, headers={"WWW-Authenticate": "Bearer"})
+
+    return Response(sampler.collapsed(request.args.get("endpoint")), mimetype="text/plain")
+
+
+metrics.add_url_rule("/_stacks", "stacks", stacks)
+
+
+def init_app(application):
+    interval_ms = application.config["DM_SAMPLING_PROFILER_INTERVAL_MS"]
+    if not interval_ms:
+        return
+
+    application.extensions["stack_sampler"] = StackSampler(
+        interval_ms / 1000, application.config["DM_SAMPLING_PROFILER_MAX_STACKS"]
+    )
+    application.before_request(_request_started)
+    application.teardown_request(_request_finished)
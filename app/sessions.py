@@ -0,0 +1,89 @@
+"""Only writing sessions to the session store when something needs saving.
+
+Sessions slide: each write pushes back when the session expires by ``PERMANENT_SESSION_LIFETIME``. Rather than
+writing every session on every request to get that, a session that hasn't changed is only written again once
+``DM_SESSION_REFRESH_FRACTION`` of its lifetime has passed since it was last written. Someone who stops using the app
+is logged out somewhere between ``(1 - DM_SESSION_REFRESH_FRACTION) * PERMANENT_SESSION_LIFETIME`` and
+``PERMANENT_SESSION_LIFETIME`` after their last request.
+
+Routes that don't need to know who's using them - health checks, metrics scrapes and the public brief redirect - don't
+get a session or a user at all, so they never touch the session store or the data API's users endpoint.
+"""
+import time
+
+from flask import current_app, request
+from flask.sessions import SessionInterface
+
+from .metrics import SESSION_WRITES_TOTAL
+
+
+# when the session was last written, in seconds since the epoch
+REFRESHED_AT_KEY = "_refreshed_at"
+
+# keys we keep for ourselves, which don't make a session worth saving on their own
+_BOOKKEEPING_KEYS = frozenset(("_permanent", REFRESHED_AT_KEY))
+
+# routes that don't need a session, so get a null one without going to the session store
+SESSIONLESS_BLUEPRINTS = frozenset(("status", "metrics"))
+SESSIONLESS_ENDPOINTS = frozenset(("public.redirect_to_public_opportunity_page",))
+
+
+def _is_sessionless(request):
+    return request.blueprint in SESSIONLESS_BLUEPRINTS or request.endpoint in SESSIONLESS_ENDPOINTS
+
+
+def _has_data(session):
+    return any(key not in _BOOKKEEPING_KEYS for key in session)
+
+
+class ThrottledSessionInterface(SessionInterface):
+    """Wraps another session interface, only saving sessions that have changed or are due a refresh"""
+
+    def __init__(self, session_interface):
+        self.session_interface = session_interface
+
+    def open_session(self, app, request):
+        if _is_sessionless(request):
+            return self.make_null_session(app)
+        return self.session_interface.open_session(app, request)
+
+    def make_null_session(self, app):
+        return self.session_interface.make_null_session(app)
+
+    def is_null_session(self, obj):
+        return self.session_interface.is_null_session(obj)
+
+    def save_session(self, app, session, response):
+        reason = self.save_reason(app, session)
+        if reason is None:
+            return
+
+        SESSION_WRITES_TOTAL.labels(reason).inc()
+        if _has_data(session):
+            session.permanent = True
+            session[REFRESHED_AT_KEY] = int(time.time())
+        self.session_interface.save_session(app, session, response)
+
+    def save_reason(self, app, session):
+        """Why ``session`` needs saving ("modified" or "refresh"), or ``None`` if it doesn't"""
+        if session.modified:
+            return "modified"
+        if not _has_data(session):
+            return None
+
+        refresh_after = app.permanent_session_lifetime.total_seconds() * app.config["DM_SESSION_REFRESH_FRACTION"]
+        if time.time() - session.get(REFRESHED_AT_KEY, 0) >= refresh_after:
+            return "refresh"
+
+
+def _skip_loading_user():
+    # otherwise flask-login loads the user the first time anything (eg an error page) uses current_user, and loading
+    # them from a remember me cookie writes to the session
+    if _is_sessionless(request):
+        current_app.login_manager._update_request_context_with_user()
+
+
+def init_app(application):
+    if not isinstance(application.session_interface, ThrottledSessionInterface):
+        application.session_interface = ThrottledSessionInterface(application.session_interface)
+    application.before_request(_skip_loading_user)
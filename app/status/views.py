@@ -2,6 +2,8 @@ from flask import request
 
 from . import status
 from .. import data_api_client
+from ..caching import caches_status
+from ..warmup import warm_up_status
 from dmutils.status import get_app_status
 
 
@@ -9,4 +11,5 @@ from dmutils.status import get_app_status
 def status():
     return get_app_status(data_api_client=data_api_client,
                           search_api_client=None,
-                          ignore_dependencies='ignore-dependencies' in request.args)
+                          ignore_dependencies='ignore-dependencies' in request.args,
+                          additional_checks=[warm_up_status, caches_status])
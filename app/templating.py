@@ -0,0 +1,86 @@
+"""Keeping compiled templates between processes.
+
+Jinja compiles each template to Python bytecode the first time it's used in a process, which for a page and all of
+the govuk-frontend macros it imports takes far longer than rendering it. With ``DM_TEMPLATE_BYTECODE_CACHE_DIR`` set,
+compiled templates are kept in that directory and loaded from there by every worker. ``flask compile-templates``
+fills it at build time. Cached templates are keyed by their name, rather than their path as Jinja's are, so a cache
+built in one place still works once it's been deployed somewhere else, and one is only used if its source hasn't
+changed since it was compiled.
+
+Templates are only checked for changes on disk where ``TEMPLATES_AUTO_RELOAD`` is on (in development). Elsewhere they
+don't change once deployed, so checking every time one's rendered is wasted work.
+"""
+import logging
+import os
+import tempfile
+from contextlib import suppress
+
+from jinja2 import FileSystemBytecodeCache, TemplateError
+
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_EXTENSIONS = ("html", "njk")
+
+
+class BytecodeCache(FileSystemBytecodeCache):
+    """A ``FileSystemBytecodeCache`` that can be read only.
+
+    Templates that can't be written to the cache (eg because the app's deployed on a read-only filesystem) are still
+    compiled and used, they just aren't cached. Writes go to a temporary file that's moved into place, so a worker
+    never reads another's half written template.
+    """
+
+    def get_cache_key(self, name, filename=None):
+        # the bucket's checked against the source's checksum when it's loaded, so the name's enough to tell templates
+        # apart without tying the cache to where the app is
+        return super().get_cache_key(name)
+
+    def dump_bytecode(self, bucket):
+        temporary_path = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=self.directory, prefix=".", delete=False) as f:
+                temporary_path = f.name
+                bucket.write_bytecode(f)
+            # the cache may be built by a different user to the one the app runs as
+            os.chmod(temporary_path, 0o644)
+            os.replace(temporary_path, self._get_cache_filename(bucket))
+        except OSError:
+            logger.warning(
+                "Failed to write {cache_key} to the template bytecode cache",
+                extra={"cache_key": bucket.key},
+                exc_info=True,
+            )
+            if temporary_path is not None:
+                with suppress(OSError):
+                    os.remove(temporary_path)
+
+
+def compile_templates(app):
+    """Compile every template the app can load, so they're in the bytecode cache.
+
+    Returns the names of the templates that compiled and of those that didn't. Not every template that can be loaded
+    is one the app uses, so failures are only logged.
+    """
+    compiled, failed = [], []
+    for template_name in app.jinja_env.list_templates(extensions=TEMPLATE_EXTENSIONS):
+        try:
+            app.jinja_env.get_template(template_name)
+            compiled.append(template_name)
+        except TemplateError:
+            logger.warning(
+                "Failed to compile template {template_name}",
+                extra={"template_name": template_name},
+                exc_info=True,
+            )
+            failed.append(template_name)
+    return compiled, failed
+
+
+def init_app(application):
+    application.jinja_env.auto_reload = application.templates_auto_reload
+
+    cache_dir = application.config["DM_TEMPLATE_BYTECODE_CACHE_DIR"]
+    if cache_dir:
+        application.jinja_env.bytecode_cache = BytecodeCache(cache_dir)
@@ -0,0 +1,86 @@
+import json
+import logging
+
+from flask import current_app
+from dmutils.user import User
+
+from .caching import LRUCache
+from .metrics import CACHE_LOOKUPS_TOTAL
+
+
+logger = logging.getLogger(__name__)
+
+# the user loader runs on every authenticated request, before the view, so avoid going to the API for it every time
+user_cache = LRUCache("users", max_bytes_config_key="DM_USER_CACHE_MAX_BYTES", ttl_config_key="DM_USER_CACHE_TTL")
+
+
+def _redis():
+    if not current_app.config["DM_USER_CACHE_USE_REDIS"]:
+        return None
+    return current_app.config.get("SESSION_REDIS")
+
+
+def _redis_key(user_id):
+    return "{}:user:{}".format(current_app.config["DM_APP_NAME"], user_id)
+
+
+def _get_from_redis(user_id):
+    """The user's json and the number of seconds until it expires from redis, or ``(None, None)``"""
+    redis = _redis()
+    if redis is None:
+        return None, None
+
+    try:
+        user_json = redis.get(_redis_key(user_id))
+        ttl = None if user_json is None else redis.ttl(_redis_key(user_id))
+    except Exception:
+        logger.warning("Failed to read user {user_id} from redis", extra={"user_id": user_id}, exc_info=True)
+        return None, None
+
+    CACHE_LOOKUPS_TOTAL.labels("users_redis", "miss" if user_json is None else "hit").inc()
+    return (None, None) if user_json is None else (json.loads(user_json), ttl)
+
+
+def _set_in_redis(user_id, user_json):
+    redis = _redis()
+    if redis is None or not user_cache.ttl:
+        return
+
+    try:
+        redis.setex(_redis_key(user_id), user_cache.ttl, json.dumps(user_json))
+    except Exception:
+        logger.warning("Failed to write user {user_id} to redis", extra={"user_id": user_id}, exc_info=True)
+
+
+def _active_user(user_json):
+    if user_json:
+        user = User.from_json(user_json)
+        if user.is_active():
+            return user
+
+
+def load_user(data_api_client, user_id):
+    """Load a user, as ``User.load_user`` does, but from a cache of recently loaded users if we can.
+
+    Users are kept for ``DM_USER_CACHE_TTL`` seconds in this process and, if ``DM_USER_CACHE_USE_REDIS`` is set, in
+    the session redis so other processes can use them too (a user found in redis is only kept in this process for as
+    long as they have left there). Only active users are cached, so a user who's found to be locked or deactivated is
+    checked with the API every time. Users aren't locked or deactivated through this app, so the cache is never
+    invalidated: a user locked or deactivated elsewhere can keep using the app for up to ``DM_USER_CACHE_TTL`` seconds.
+    """
+    user_id = int(user_id)
+
+    user_json = user_cache.get(user_id)
+    if user_json is not None:
+        return User.from_json(user_json)
+
+    user_json, ttl = _get_from_redis(user_id)
+    if user_json is None:
+        user_json = data_api_client.get_user(user_id=user_id)
+        if _active_user(user_json):
+            _set_in_redis(user_id, user_json)
+
+    user = _active_user(user_json)
+    if user:
+        user_cache.set(user_id, user_json, ttl=ttl)
+    return user
@@ -0,0 +1,74 @@
+"""Doing the slow, one-off work of a worker's first requests before it starts serving.
+
+Content manifests are loaded the first time something asks for them and Jinja compiles templates the first time they're
+rendered, so without this the first few requests each worker handles are noticeably slower than the rest.
+
+``application.py`` calls ``warm_up`` when it creates the app if ``DM_WARM_UP_ON_START`` is set, as it is in deployed
+environments, so the app is warm before the server that imported it starts handling requests. Run ``flask warmup`` to
+check that everything warms up cleanly.
+"""
+import os
+import time
+
+from dmcontent.content_loader import ContentNotFoundError
+from dmutils.status import StatusError
+from flask import current_app
+from jinja2 import TemplateError
+
+
+def _load_content(app):
+    from .main import CONTENT_MANIFESTS, content_loader
+
+    for framework_slug, question_set, manifest in CONTENT_MANIFESTS:
+        try:
+            content_loader.get_manifest(framework_slug, manifest)
+        except ContentNotFoundError:
+            app.logger.warning(
+                "Manifest {framework_slug}/{manifest} not found during warm-up",
+                extra={"framework_slug": framework_slug, "manifest": manifest},
+            )
+
+
+def _compile_templates(app):
+    templates_path = os.path.join(app.root_path, app.template_folder or "templates")
+
+    for dirpath, dirnames, filenames in os.walk(templates_path):
+        for filename in filenames:
+            if not filename.endswith(".html"):
+                continue
+
+            template_name = os.path.relpath(os.path.join(dirpath, filename), templates_path).replace(os.sep, "/")
+            try:
+                app.jinja_env.get_template(template_name)
+            except TemplateError:
+                app.logger.warning(
+                    "Failed to compile template {template_name} during warm-up",
+                    extra={"template_name": template_name},
+                    exc_info=True,
+                )
+
+
+def warm_up(app):
+    """Load all of the content manifests and compile all of the templates in ``app/templates``.
+
+    Problems along the way are logged rather than raised, so that a worker that can't warm up fully can still serve
+    requests. Safe to call more than once.
+    """
+    start = time.perf_counter()
+
+    _load_content(app)
+    _compile_templates(app)
+
+    app.extensions["dm_warm_up"] = {"duration": time.perf_counter() - start}
+    app.logger.info("Warm-up took {duration}s", extra=app.extensions["dm_warm_up"])
+
+
+def warm_up_status():
+    """A ``_status`` check that fails until the app has been warmed up, if ``DM_REQUIRE_WARM_UP`` is set"""
+    if "dm_warm_up" in current_app.extensions:
+        return {"warm_up": current_app.extensions["dm_warm_up"]}
+
+    if current_app.config.get("DM_REQUIRE_WARM_UP"):
+        raise StatusError("Warm-up has not finished")
+
+    return {}
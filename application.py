@@ -1,6 +1,10 @@
 import os
 
 from app import create_app
+from app.warmup import warm_up
 
 
 application = create_app(os.getenv("DM_ENVIRONMENT") or "development")
+
+if application.config["DM_WARM_UP_ON_START"]:
+    warm_up(application)
@@ -0,0 +1,136 @@
+"""
+Compare loading what the brief response pages (start, check your answers and the result page) need one API call at a
+time, as the views used to, against ``load_brief_response_page_context``, which makes independent calls at the same
+time.
+
+Run from the root of the repo::
+
+    python benchmarks/brief_response_pages.py --delay-ms 50 --requests 200
+
+The data API is a stub served from this process that waits ``--delay-ms`` before answering each call. The app's
+caches are off (it uses the test config), so every request makes all of its calls.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from types import SimpleNamespace
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+BRIEF_ID = 1234
+BRIEF_RESPONSE_ID = 5
+SUPPLIER_ID = 7
+
+RESPONSES = {
+    "/briefs/{}".format(BRIEF_ID): {"briefs": {
+        "id": BRIEF_ID,
+        "status": "live",
+        "frameworkSlug": "digital-outcomes-and-specialists-4",
+        "lotSlug": "digital-specialists",
+    }},
+    "/brief-responses/{}".format(BRIEF_RESPONSE_ID): {"briefResponses": {
+        "id": BRIEF_RESPONSE_ID, "briefId": BRIEF_ID, "supplierId": SUPPLIER_ID, "status": "draft",
+    }},
+    "/brief-responses": {"briefResponses": [{
+        "id": BRIEF_RESPONSE_ID, "briefId": BRIEF_ID, "supplierId": SUPPLIER_ID, "status": "draft",
+    }]},
+    "/briefs/{}/services".format(BRIEF_ID): {"services": [{"id": 1}]},
+    "/frameworks/digital-outcomes-and-specialists-4": {"frameworks": {
+        "slug": "digital-outcomes-and-specialists-4",
+        "status": "live",
+        "lots": [{"slug": "digital-specialists"}],
+    }},
+}
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def _start_stub_api(delay):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            body = json.dumps(RESPONSES[urlparse(self.path).path]).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = _ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return "http://127.0.0.1:{}".format(server.server_address[1])
+
+
+def _one_at_a_time(data_api_client, brief_response_id):
+    # what the views did before load_brief_response_page_context
+    from app.main.helpers.briefs import get_brief, is_supplier_eligible_for_brief
+    from app.main.helpers.frameworks import get_framework_and_lot
+
+    brief = get_brief(data_api_client, BRIEF_ID, allowed_statuses=["live"])
+    if brief_response_id is None:
+        data_api_client.find_brief_responses(brief_id=BRIEF_ID, supplier_id=SUPPLIER_ID)
+    else:
+        data_api_client.get_brief_response(brief_response_id)
+    is_supplier_eligible_for_brief(data_api_client, SUPPLIER_ID, BRIEF_ID)
+    get_framework_and_lot(
+        data_api_client, brief["frameworkSlug"], brief["lotSlug"], allowed_statuses=["live", "expired"]
+    )
+
+
+def _concurrently(data_api_client, brief_response_id):
+    from app.main.helpers.briefs import load_brief_response_page_context
+
+    page = load_brief_response_page_context(
+        data_api_client, BRIEF_ID, ["live"], brief_response_id=brief_response_id
+    )
+    page.brief_responses, page.is_eligible, page.framework
+
+
+def _percentiles(durations):
+    durations = sorted(durations)
+    return (
+        statistics.median(durations) * 1000,
+        durations[min(len(durations) - 1, int(len(durations) * 0.95))] * 1000,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--delay-ms", type=float, default=50)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    from app import create_app
+    from app.api_client import MemoizingDataAPIClient
+
+    app = create_app("test")
+    data_api_client = MemoizingDataAPIClient(_start_stub_api(args.delay_ms / 1000), "auth-token")
+
+    print("{:<24}{:<16}{:>10}{:>10}".format("page", "fetching", "p50 ms", "p95 ms"))
+    for page_name, brief_response_id in (("check your answers", BRIEF_RESPONSE_ID), ("start/result", None)):
+        for mode, load in (("one at a time", _one_at_a_time), ("concurrently", _concurrently)):
+            durations = []
+            for _ in range(args.requests):
+                with app.test_request_context("/") as request_context:
+                    request_context.user = SimpleNamespace(supplier_id=SUPPLIER_ID)
+                    start = time.perf_counter()
+                    load(data_api_client, brief_response_id)
+                    durations.append(time.perf_counter() - start)
+
+            print("{:<24}{:<16}{:>10.1f}{:>10.1f}".format(page_name, mode, *_percentiles(durations)))
+
+
+if __name__ == "__main__":
+    main()
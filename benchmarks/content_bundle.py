@@ -0,0 +1,70 @@
+"""
+Compare the cold-start cost of loading every content manifest from yaml against loading them from a prebuilt content
+bundle.
+
+Run from the root of the repo (the content loader reads from ``app/content``)::
+
+    python benchmarks/content_bundle.py --runs 5
+
+A bundle is built into a temporary file first. Each run happens in a fresh subprocess so nothing is shared between
+them.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def run(bundle_path):
+    start = time.perf_counter()
+
+    from app.main import CONTENT_MANIFESTS, CONTENT_PATH
+    from app.main.content import LazyContentLoader
+    imported = time.perf_counter()
+
+    loader = LazyContentLoader(CONTENT_PATH, CONTENT_MANIFESTS, bundle_path=bundle_path)
+    for framework_slug, question_set, manifest in CONTENT_MANIFESTS:
+        loader.get_manifest(framework_slug, manifest)
+    loaded = time.perf_counter()
+
+    return {"import_s": imported - start, "load_s": loaded - imported}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--bundle-path", help=argparse.SUPPRESS)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run(args.bundle_path)))
+        return
+
+    from app.main import CONTENT_MANIFESTS, CONTENT_PATH
+    from app.main.content import build_content_bundle
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        bundle_path = os.path.join(tmpdir, "content-bundle.pickle")
+        build_content_bundle(CONTENT_PATH, CONTENT_MANIFESTS, bundle_path)
+        print("bundle size: {:.1f} kB".format(os.path.getsize(bundle_path) / 1024))
+
+        print("{:<8}{:>16}{:>16}".format("source", "median load s", "min load s"))
+        for source, path in (("yaml", os.path.join(tmpdir, "missing.pickle")), ("bundle", bundle_path)):
+            load_times = []
+            for _ in range(args.runs):
+                output = subprocess.check_output(
+                    [sys.executable, __file__, "--child", "--bundle-path", path],
+                )
+                load_times.append(json.loads(output.decode("utf-8").strip().splitlines()[-1])["load_s"])
+            print("{:<8}{:>16.3f}{:>16.3f}".format(source, statistics.median(load_times), min(load_times)))
+
+
+if __name__ == "__main__":
+    main()
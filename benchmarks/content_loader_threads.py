@@ -0,0 +1,103 @@
+"""
+Compare the memory and first-request cost of sharing one ContentLoader between threads against the previous approach
+of giving every thread its own deep copy.
+
+Run from the root of the repo (the content loader reads from ``app/content``)::
+
+    python benchmarks/content_loader_threads.py --threads 8 16 32
+
+Each mode/thread-count combination is run in a fresh subprocess so that peak RSS figures are independent.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+from copy import deepcopy
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+FRAMEWORK_SLUG = "digital-outcomes-and-specialists-5"
+LOT_SLUG = "digital-specialists"
+
+
+def _first_request(loader):
+    # roughly what edit_brief_response does with the loader on a thread's first request
+    loader.get_manifest(FRAMEWORK_SLUG, "edit_brief_response").filter(
+        {"lot": LOT_SLUG, "brief": {}, "max_day_rate": None},
+        dynamic=False,
+    )
+
+
+def _make_fully_loaded_content_loader():
+    from dmcontent.content_loader import ContentLoader
+    from app.main import CONTENT_MANIFESTS
+
+    loader = ContentLoader("app/content")
+    for framework_slug, question_set, manifest in CONTENT_MANIFESTS:
+        loader.load_manifest(framework_slug, question_set, manifest)
+    return loader
+
+
+def run(mode, thread_count):
+    shared_loader = _make_fully_loaded_content_loader()
+    rss_before_threads = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    durations = [None] * thread_count
+    loaders = [None] * thread_count  # keep every thread's loader alive, as the old thread-locals did
+    barrier = threading.Barrier(thread_count)
+
+    def worker(i):
+        barrier.wait()
+        start = time.perf_counter()
+        loaders[i] = deepcopy(shared_loader) if mode == "per-thread" else shared_loader
+        _first_request(loaders[i])
+        durations[i] = time.perf_counter() - start
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    durations.sort()
+    return {
+        "mode": mode,
+        "threads": thread_count,
+        # ru_maxrss is in kilobytes on linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "rss_growth_mb": (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before_threads) / 1024,
+        "first_request_p50_ms": durations[len(durations) // 2] * 1000,
+        "first_request_max_ms": durations[-1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, nargs="+", default=[8, 16, 32])
+    parser.add_argument("--mode", choices=("shared", "per-thread"))
+    args = parser.parse_args()
+
+    if args.mode:
+        # we're the child process
+        print(json.dumps(run(args.mode, args.threads[0])))
+        return
+
+    print("{:<12}{:>8}{:>14}{:>16}{:>16}{:>16}".format(
+        "mode", "threads", "peak RSS MB", "RSS growth MB", "first p50 ms", "first max ms",
+    ))
+    for thread_count in args.threads:
+        for mode in ("per-thread", "shared"):
+            output = subprocess.check_output(
+                [sys.executable, __file__, "--mode", mode, "--threads", str(thread_count)],
+            )
+            result = json.loads(output.decode("utf-8").strip().splitlines()[-1])
+            print("{mode:<12}{threads:>8}{peak_rss_mb:>14.1f}{rss_growth_mb:>16.1f}"
+                  "{first_request_p50_ms:>16.2f}{first_request_max_ms:>16.2f}".format(**result))
+
+
+if __name__ == "__main__":
+    main()
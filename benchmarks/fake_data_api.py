@@ -0,0 +1,350 @@
+"""
+A stand-in for the data API, with enough of it for the app to run against so the whole of ``create_app`` can be load
+tested on one machine.
+
+Run from the root of the repo::
+
+    python benchmarks/fake_data_api.py --port 5000 --latency lognormal:20,0.5 --error-rate 0.01
+
+then point the app at it with ``DM_DATA_API_URL=http://localhost:5000``. Any auth token is accepted.
+
+Everything is made up from ids, so any id in range exists without anything being set up first:
+
+- briefs ``1`` to ``--briefs`` are live DOS 4 and DOS 5 briefs, on the digital specialists and digital outcomes lots
+- users ``1`` to ``--suppliers`` are supplier users, each for the supplier with the same id
+- every supplier is on both frameworks, with a service on every lot, and is eligible for every brief except those
+  where ``brief_id % 10 == supplier_id % 10``
+- brief responses ``1`` to ``--suppliers`` are submitted, one by each supplier, with the same id as the supplier, to
+  brief ``(id - 1) % --briefs + 1``. Brief responses the app creates are kept in memory, with ids after these.
+
+``--requirements`` and ``--text-length`` set how many requirements briefs (and so brief responses) have and how long
+their text fields are, which is most of the size of a brief or brief response.
+
+Other benchmarks can run one in a thread with ``serve(FakeDataAPI(...))``. Calls are counted by the app request that
+made them, going by the ``DM-Request-ID`` header the app passes on, for ``pop_calls``.
+"""
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+from dmtestutils.api_model_stubs import BriefStub, FrameworkStub, ServiceStub, SupplierFrameworkStub
+from dmtestutils.api_model_stubs.lot import dos_lots
+from werkzeug.exceptions import HTTPException, NotFound
+from werkzeug.routing import Map, Rule
+from werkzeug.serving import make_server
+from werkzeug.wrappers import Request, Response
+
+DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+FRAMEWORK_SLUGS = ("digital-outcomes-and-specialists-4", "digital-outcomes-and-specialists-5")
+BRIEF_LOTS = (("digital-specialists", "Digital specialists"), ("digital-outcomes", "Digital outcomes"))
+SPECIALIST_ROLE = "developer"
+
+# the app passes its request's id on to the API in this header
+REQUEST_ID_HEADER = "DM-Request-ID"
+
+
+def parse_latency(spec):
+    """A function returning a delay in seconds, from a spec in milliseconds.
+
+    ``fixed:MS``, ``uniform:LOW_MS,HIGH_MS`` or ``lognormal:MEDIAN_MS,SIGMA`` (where ``SIGMA`` is the standard
+    deviation of the delay's natural log, so 0.5 gives a p95 of about 2.3 times the median).
+    """
+    kind, _, args = spec.partition(":")
+    args = [float(arg) for arg in args.split(",")] if args else []
+
+    if kind == "fixed" and len(args) == 1:
+        return lambda: args[0] / 1000
+    if kind == "uniform" and len(args) == 2:
+        return lambda: random.uniform(*args) / 1000
+    if kind == "lognormal" and len(args) == 2:
+        median, sigma = args
+        return lambda: random.lognormvariate(0, sigma) * median / 1000
+
+    raise ValueError("Latency should be fixed:MS, uniform:LOW_MS,HIGH_MS or lognormal:MEDIAN_MS,SIGMA, not {!r}"
+                     .format(spec))
+
+
+class FakeDataAPI(object):
+    """A WSGI app answering the data API calls this app makes"""
+
+    url_map = Map([
+        Rule("/_status", endpoint="status"),
+        Rule("/users/<int:user_id>", endpoint="user"),
+        Rule("/frameworks/<framework_slug>", endpoint="framework"),
+        Rule("/suppliers/<int:supplier_id>/frameworks/<framework_slug>", endpoint="supplier_framework"),
+        Rule("/services", endpoint="services"),
+        Rule("/briefs/<int:brief_id>", endpoint="brief"),
+        Rule("/briefs/<int:brief_id>/services", endpoint="brief_services"),
+        Rule("/briefs/<int:brief_id>/clarification-questions", endpoint="ok", methods=["POST"]),
+        Rule("/brief-responses", endpoint="brief_responses", methods=["GET"]),
+        Rule("/brief-responses", endpoint="create_brief_response", methods=["POST"]),
+        Rule("/brief-responses/<int:brief_response_id>", endpoint="brief_response", methods=["GET"]),
+        Rule("/brief-responses/<int:brief_response_id>", endpoint="update_brief_response", methods=["POST"]),
+        Rule("/brief-responses/<int:brief_response_id>/submit", endpoint="submit_brief_response", methods=["POST"]),
+        Rule("/audit-events", endpoint="ok", methods=["POST"]),
+    ])
+
+    def __init__(self, briefs=100, suppliers=1000, latency="fixed:0", error_rate=0, requirements=5, text_length=500):
+        self.briefs = briefs
+        self.suppliers = suppliers
+        self.latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.requirements = requirements
+        self.text_length = text_length
+
+        self._created_brief_responses = {}
+        self._brief_response_ids = itertools.count(suppliers + 1)
+        self._calls = Counter()
+        self._lock = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        request = Request(environ)
+        if REQUEST_ID_HEADER in request.headers:
+            with self._lock:
+                self._calls[request.headers[REQUEST_ID_HEADER]] += 1
+        time.sleep(self.latency())
+
+        if random.random() < self.error_rate:
+            response = self._json({"error": "Fake data API error"}, status=503)
+        else:
+            try:
+                endpoint, kwargs = self.url_map.bind_to_environ(environ).match()
+                response = self._json(getattr(self, "on_" + endpoint)(request, **kwargs))
+            except HTTPException as e:
+                response = self._json({"error": e.description}, status=e.code)
+
+        return response(environ, start_response)
+
+    def pop_calls(self, request_id):
+        """How many calls the app request ``request_id`` made"""
+        with self._lock:
+            return self._calls.pop(request_id, 0)
+
+    @staticmethod
+    def _json(data, status=200):
+        return Response(json.dumps(data), status=status, mimetype="application/json")
+
+    def _text(self, seed):
+        return ("{} ".format(seed) * self.text_length)[:self.text_length]
+
+    # fixtures
+
+    def _brief(self, brief_id):
+        if not 1 <= brief_id <= self.briefs:
+            raise NotFound("Brief {} not found".format(brief_id))
+
+        now = datetime.utcnow()
+        lot_slug, lot_name = BRIEF_LOTS[brief_id % len(BRIEF_LOTS)]
+        brief = BriefStub(
+            id=brief_id,
+            status="live",
+            framework_slug=FRAMEWORK_SLUGS[brief_id % len(FRAMEWORK_SLUGS)],
+            lot_slug=lot_slug,
+            lot_name=lot_name,
+            title="Brief {}".format(brief_id),
+        ).single_result_response()["briefs"]
+        brief.update({
+            "summary": self._text("summary"),
+            "location": "London",
+            "essentialRequirements": [self._text("essential") for _ in range(self.requirements)],
+            "niceToHaveRequirements": [self._text("nice") for _ in range(self.requirements)],
+            "requirementsLength": "2 weeks",
+            "publishedAt": (now - timedelta(days=7)).strftime(DATETIME_FORMAT),
+            "clarificationQuestionsClosedAt": (now + timedelta(days=7)).strftime(DATETIME_FORMAT),
+            "applicationsClosedAt": (now + timedelta(days=14)).strftime(DATETIME_FORMAT),
+        })
+        if lot_slug == "digital-specialists":
+            brief["specialistRole"] = SPECIALIST_ROLE
+        return brief
+
+    def is_eligible(self, supplier_id, brief_id):
+        return brief_id % 10 != supplier_id % 10
+
+    def responded_to_brief_id(self, supplier_id):
+        """The brief the supplier's made-up submitted brief response is for"""
+        return (supplier_id - 1) % self.briefs + 1
+
+    def _supplier_brief_response(self, brief_response_id):
+        brief_id = self.responded_to_brief_id(brief_response_id)
+        brief = self._brief(brief_id)
+        return {
+            "id": brief_response_id,
+            "briefId": brief_id,
+            "brief": {key: brief[key] for key in ("id", "title", "status", "applicationsClosedAt", "framework")},
+            "supplierId": brief_response_id,
+            "supplierName": "Supplier {}".format(brief_response_id),
+            "status": "submitted",
+            "createdAt": brief["publishedAt"],
+            "submittedAt": brief["publishedAt"],
+            "essentialRequirementsMet": True,
+            "essentialRequirements": [{"evidence": self._text("evidence")} for _ in range(self.requirements)],
+            "niceToHaveRequirements": [
+                {"yesNo": True, "evidence": self._text("evidence")} for _ in range(self.requirements)
+            ],
+            "availability": "Next week",
+            "dayRate": "500",
+            "respondToEmailAddress": "supplier-{}@example.com".format(brief_response_id),
+        }
+
+    def _get_brief_response(self, brief_response_id):
+        with self._lock:
+            if brief_response_id in self._created_brief_responses:
+                return dict(self._created_brief_responses[brief_response_id])
+        if 1 <= brief_response_id <= self.suppliers:
+            return self._supplier_brief_response(brief_response_id)
+        raise NotFound("Brief response {} not found".format(brief_response_id))
+
+    # endpoints
+
+    def on_status(self, request):
+        return {"status": "ok"}
+
+    def on_ok(self, request, **kwargs):
+        return {}
+
+    def on_user(self, request, user_id):
+        if not 1 <= user_id <= self.suppliers:
+            raise NotFound("User {} not found".format(user_id))
+        return {"users": {
+            "id": user_id,
+            "name": "User {}".format(user_id),
+            "emailAddress": "supplier-{}@example.com".format(user_id),
+            "role": "supplier",
+            "active": True,
+            "locked": False,
+            "passwordChangedAt": "2020-01-01T00:00:00.000000Z",
+            "userResearchOptedIn": False,
+            "supplier": {"supplierId": user_id, "name": "Supplier {}".format(user_id), "organisationSize": "small"},
+        }}
+
+    def on_framework(self, request, framework_slug):
+        if framework_slug not in FRAMEWORK_SLUGS:
+            raise NotFound("Framework {} not found".format(framework_slug))
+        return FrameworkStub(slug=framework_slug, status="live", lots=dos_lots()).single_result_response()
+
+    def on_supplier_framework(self, request, supplier_id, framework_slug):
+        return SupplierFrameworkStub(
+            supplier_id=supplier_id, framework_slug=framework_slug, on_framework=framework_slug in FRAMEWORK_SLUGS,
+        ).single_result_response()
+
+    def on_services(self, request):
+        supplier_id = request.args.get("supplier_id", type=int)
+        framework_slug = request.args.get("framework")
+        if framework_slug not in FRAMEWORK_SLUGS:
+            return {"services": [], "links": {}, "meta": {"total": 0}}
+
+        services = [
+            dict(
+                ServiceStub(
+                    service_id=str(supplier_id * 10 + i),
+                    supplier_id=supplier_id,
+                    framework_slug=framework_slug,
+                    lot_slug=lot["slug"],
+                    lot_name=lot["name"],
+                    status="published",
+                ).response(),
+                **{SPECIALIST_ROLE + "PriceMin": "300", SPECIALIST_ROLE + "PriceMax": "900"}
+            )
+            for i, lot in enumerate(dos_lots())
+        ]
+        return {"services": services, "links": {}, "meta": {"total": len(services)}}
+
+    def on_brief(self, request, brief_id):
+        return {"briefs": self._brief(brief_id)}
+
+    def on_brief_services(self, request, brief_id):
+        supplier_id = request.args.get("supplier_id", type=int)
+        self._brief(brief_id)
+        return {"services": [{"id": supplier_id}] if self.is_eligible(supplier_id, brief_id) else []}
+
+    def on_brief_responses(self, request):
+        brief_id = request.args.get("brief_id", type=int)
+        supplier_id = request.args.get("supplier_id", type=int)
+        statuses = request.args.get("status", "").split(",") if request.args.get("status") else None
+
+        brief_responses = []
+        if supplier_id is not None and 1 <= supplier_id <= self.suppliers:
+            brief_responses.append(self._supplier_brief_response(supplier_id))
+        with self._lock:
+            brief_responses.extend(dict(brief_response) for brief_response in self._created_brief_responses.values())
+
+        return {"briefResponses": [
+            brief_response for brief_response in brief_responses
+            if brief_id in (None, brief_response["briefId"])
+            and supplier_id in (None, brief_response["supplierId"])
+            and (statuses is None or brief_response["status"] in statuses)
+        ], "links": {}, "meta": {}}
+
+    def on_create_brief_response(self, request):
+        data = json.loads(request.get_data(as_text=True))["briefResponses"]
+        brief = self._brief(int(data["briefId"]))
+        brief_response = dict(
+            data,
+            id=next(self._brief_response_ids),
+            briefId=brief["id"],
+            brief={key: brief[key] for key in ("id", "title", "status", "applicationsClosedAt", "framework")},
+            supplierId=int(data["supplierId"]),
+            status="draft",
+        )
+        with self._lock:
+            self._created_brief_responses[brief_response["id"]] = brief_response
+        return {"briefResponses": brief_response}
+
+    def on_brief_response(self, request, brief_response_id):
+        return {"briefResponses": self._get_brief_response(brief_response_id)}
+
+    def on_update_brief_response(self, request, brief_response_id):
+        brief_response = self._get_brief_response(brief_response_id)
+        brief_response.update(json.loads(request.get_data(as_text=True)).get("briefResponses", {}))
+        with self._lock:
+            self._created_brief_responses[brief_response_id] = brief_response
+        return {"briefResponses": brief_response}
+
+    def on_submit_brief_response(self, request, brief_response_id):
+        brief_response = dict(self._get_brief_response(brief_response_id), status="submitted")
+        with self._lock:
+            self._created_brief_responses[brief_response_id] = brief_response
+        return {"briefResponses": brief_response}
+
+
+def serve(api, host="127.0.0.1", port=0):
+    """Serve ``api`` from a background thread, returning the server and its URL"""
+    server = make_server(host, port, api, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, "http://{}:{}".format(host, server.server_port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--briefs", type=int, default=100)
+    parser.add_argument("--suppliers", type=int, default=1000)
+    parser.add_argument("--latency", default="fixed:0",
+                        help="fixed:MS, uniform:LOW_MS,HIGH_MS or lognormal:MEDIAN_MS,SIGMA")
+    parser.add_argument("--error-rate", type=float, default=0, help="fraction of calls answered with a 503")
+    parser.add_argument("--requirements", type=int, default=5, help="essential and nice-to-have requirements per brief")
+    parser.add_argument("--text-length", type=int, default=500, help="characters in each long text field")
+    args = parser.parse_args()
+
+    api = FakeDataAPI(
+        briefs=args.briefs,
+        suppliers=args.suppliers,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        requirements=args.requirements,
+        text_length=args.text_length,
+    )
+    server = make_server(args.host, args.port, api, threaded=True)
+    print("Fake data API on http://{}:{}".format(args.host, server.server_port))
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Compare the cold first-render time of each page with and without a template bytecode cache filled at build time by
+``flask compile-templates``.
+
+Run from the root of the repo, with the frameworks content and frontend built (``make requirements-dev
+frontend-build``)::
+
+    python benchmarks/first_render.py --runs 5
+
+The cache is filled in a temporary directory first. Each run of each page happens in a fresh subprocess, against
+``fake_data_api.FakeDataAPI``. The page is loaded once beforehand in another app instance, which loads the content
+manifests, so what's timed is the first request to a new app - mostly finding and compiling (or loading from the
+cache) the page's templates. The second request is timed too, for what the page costs once everything's warm.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from unittest import mock
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_data_api import FakeDataAPI, serve  # noqa: E402
+
+SUPPLIER_ID = 1
+
+PAGES = (
+    "opportunities dashboard",
+    "question and answer session",
+    "ask a question",
+    "start application",
+    "question",
+    "check your answers",
+    "application result",
+)
+
+
+def _page_path(api, page):
+    """The path of ``page`` for the supplier, or of a page that redirects to it"""
+    prefix = "/suppliers/opportunities"
+    # a brief the supplier has a submitted response to, and one they're eligible for but haven't responded to
+    responded_to = api.responded_to_brief_id(SUPPLIER_ID)
+    not_responded_to = next(
+        brief_id for brief_id in range(1, api.briefs + 1)
+        if api.is_eligible(SUPPLIER_ID, brief_id) and brief_id != responded_to
+    )
+
+    framework_slug = api.on_brief(None, responded_to)["briefs"]["frameworkSlug"]
+
+    return {
+        "opportunities dashboard": "{}/frameworks/{}".format(prefix, framework_slug),
+        "question and answer session": "{}/{}/question-and-answer-session".format(prefix, not_responded_to),
+        "ask a question": "{}/{}/ask-a-question".format(prefix, not_responded_to),
+        "start application": "{}/{}/responses/start".format(prefix, not_responded_to),
+        # redirects to the first question
+        "question": "{}/{}/responses/{}".format(prefix, responded_to, SUPPLIER_ID),
+        "check your answers": "{}/{}/responses/{}/application".format(prefix, responded_to, SUPPLIER_ID),
+        "application result": "{}/{}/responses/result".format(prefix, responded_to),
+    }[page]
+
+
+def _create_app(api_url, api, cache_dir):
+    from load_test import _create_app as create_load_test_app
+
+    environ = {"DM_TEMPLATE_BYTECODE_CACHE_DIR": cache_dir} if cache_dir else {}
+    with mock.patch.dict(os.environ, environ):
+        return create_load_test_app(api_url, api)
+
+
+def fill_cache(cache_dir):
+    from app.templating import compile_templates
+
+    api = FakeDataAPI(suppliers=SUPPLIER_ID)
+    return compile_templates(_create_app("http://localhost", api, cache_dir))
+
+
+def run(page, cache_dir):
+    api = FakeDataAPI(suppliers=SUPPLIER_ID)
+    server, api_url = serve(api)
+
+    # load the page once in another app, to load the content manifests and find where any redirects go (the page's
+    # templates are compiled again in the app that's timed, as each app has its own Jinja environment)
+    client = _create_app(api_url, api, cache_dir).test_client()
+    client.get("/load-test/login/{}".format(SUPPLIER_ID))
+    path = _page_path(api, page)
+    response = client.get(path)
+    while response.status_code in (301, 302):
+        path = urlparse(response.location).path
+        response = client.get(path)
+    if response.status_code != 200:
+        raise RuntimeError("{} gave a {}".format(path, response.status_code))
+
+    timings = {}
+    client = _create_app(api_url, api, cache_dir).test_client()
+    client.get("/load-test/login/{}".format(SUPPLIER_ID))
+    for request in ("first_s", "second_s"):
+        start = time.perf_counter()
+        client.get(path)
+        timings[request] = time.perf_counter() - start
+
+    server.shutdown()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--page", help=argparse.SUPPRESS)
+    parser.add_argument("--cache-dir", help=argparse.SUPPRESS)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run(args.page, args.cache_dir)))
+        return
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        compiled, failed = fill_cache(cache_dir)
+        print("{} templates compiled into the cache, {} failed\n".format(len(compiled), len(failed)))
+
+        print("{:<32}{:>20}{:>20}{:>16}".format("page", "no cache first ms", "cache first ms", "warm ms"))
+        for page in PAGES:
+            medians = {}
+            for source, page_cache_dir in (("no cache", None), ("cache", cache_dir)):
+                timings = []
+                for _ in range(args.runs):
+                    command = [sys.executable, __file__, "--child", "--page", page]
+                    if page_cache_dir:
+                        command += ["--cache-dir", page_cache_dir]
+                    output = subprocess.check_output(command)
+                    timings.append(json.loads(output.decode("utf-8").strip().splitlines()[-1]))
+                medians[source] = {key: statistics.median(t[key] for t in timings) for key in timings[0]}
+
+            print("{:<32}{:>20.1f}{:>20.1f}{:>16.1f}".format(
+                page,
+                medians["no cache"]["first_s"] * 1000,
+                medians["cache"]["first_s"] * 1000,
+                medians["cache"]["second_s"] * 1000,
+            ))
+
+
+if __name__ == "__main__":
+    main()
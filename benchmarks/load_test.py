@@ -0,0 +1,286 @@
+"""
+Load test the supplier journeys through the app, end to end, against ``fake_data_api.FakeDataAPI``.
+
+Each virtual user is a supplier who, in every journey, applies for a brief they haven't applied for before:
+
+- looks at their opportunities dashboard
+- asks a clarification question about the brief
+- starts a response, answers every question, checks their answers, submits and sees the result page
+
+Run from the root of the repo, with the frameworks content and frontend built (``make requirements-dev
+frontend-build``)::
+
+    python benchmarks/load_test.py --users 16 --journeys 10 --latency lognormal:20,0.5 --output load-test.json
+
+Throughput, p50/p95/p99 time and data API calls per request are reported for each endpoint, and written as JSON to
+``--output`` so runs can be compared across commits. Every request is timed, from the first, so run a few journeys
+if you want to see a warmed up app.
+
+Nothing leaves the machine: the data API is faked, Notify is stubbed out and sessions are kept in cookies rather
+than redis. The app runs in this process with the test config, but not in debug mode and with its caches on.
+Requests are made through Flask's test client, so this measures the app rather than a web server.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from unittest import mock
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_data_api import REQUEST_ID_HEADER, FakeDataAPI, serve  # noqa: E402
+
+# posted to every question in the brief response flow. each question only takes the fields it asks for, and the fake
+# API saves whatever it's given.
+ANSWERS = {
+    "respondToEmailAddress": "supplier@example.com",
+    "availability": "Next week",
+    "dayRate": "500",
+    "essentialRequirementsMet": "true",
+    "evidence-0": "Some evidence",
+    "yesNo-0": "true",
+}
+
+# a journey that goes round in circles rather than reaching the check your answers page is given up on after this
+MAX_QUESTIONS = 50
+
+
+class JourneyError(Exception):
+    pass
+
+
+class Results(object):
+    def __init__(self):
+        self.durations = defaultdict(list)
+        self.api_calls = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.journeys_completed = 0
+        self.journeys_failed = 0
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, duration, api_calls, failed):
+        with self._lock:
+            self.durations[endpoint].append(duration)
+            self.api_calls[endpoint].append(api_calls)
+            if failed:
+                self.errors[endpoint] += 1
+
+    def journey_finished(self, completed):
+        with self._lock:
+            if completed:
+                self.journeys_completed += 1
+            else:
+                self.journeys_failed += 1
+
+
+def _percentile(sorted_values, percentile):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * percentile / 100))]
+
+
+def _summary(results, elapsed):
+    endpoints = {}
+    for endpoint, durations in sorted(results.durations.items()):
+        durations = sorted(durations)
+        endpoints[endpoint] = {
+            "requests": len(durations),
+            "errors": results.errors[endpoint],
+            "throughput_per_second": len(durations) / elapsed,
+            "p50_ms": _percentile(durations, 50) * 1000,
+            "p95_ms": _percentile(durations, 95) * 1000,
+            "p99_ms": _percentile(durations, 99) * 1000,
+            "api_calls_per_request": sum(results.api_calls[endpoint]) / len(durations),
+        }
+
+    requests = sum(endpoint["requests"] for endpoint in endpoints.values())
+    return {
+        "elapsed_seconds": elapsed,
+        "requests": requests,
+        "throughput_per_second": requests / elapsed,
+        "journeys_completed": results.journeys_completed,
+        "journeys_failed": results.journeys_failed,
+        "endpoints": endpoints,
+    }
+
+
+class VirtualUser(object):
+    def __init__(self, app, api, results, supplier_id):
+        self.app = app
+        self.api = api
+        self.results = results
+        self.supplier_id = supplier_id
+        self.client = app.test_client()
+        self._url_adapter = app.url_map.bind(app.config["SERVER_NAME"])
+
+    def request(self, method, path, data=None, expect_redirect=False):
+        request_id = uuid.uuid4().hex
+        start = time.perf_counter()
+        response = self.client.open(path, method=method, data=data, headers={REQUEST_ID_HEADER: request_id})
+        duration = time.perf_counter() - start
+
+        endpoint, _ = self._url_adapter.match(path, method=method)
+        failed = response.status_code != (302 if expect_redirect else 200)
+        self.results.record("{} {}".format(method, endpoint), duration, self.api.pop_calls(request_id), failed)
+
+        if failed:
+            raise JourneyError("{} {} gave a {}".format(method, path, response.status_code))
+        return urlparse(response.location).path if expect_redirect else response
+
+    def log_in(self):
+        self.client.get("/load-test/login/{}".format(self.supplier_id))
+
+    def apply_for(self, brief_id):
+        brief = self.api.on_brief(None, brief_id)["briefs"]
+        prefix = "/suppliers/opportunities"
+
+        self.request("GET", "{}/frameworks/{}".format(prefix, brief["frameworkSlug"]))
+
+        self.request("GET", "{}/{}/ask-a-question".format(prefix, brief_id))
+        self.request("POST", "{}/{}/ask-a-question".format(prefix, brief_id), {"clarification_question": "Why?"})
+
+        self.request("GET", "{}/{}/responses/start".format(prefix, brief_id))
+        path = self.request("POST", "{}/{}/responses/start".format(prefix, brief_id), expect_redirect=True)
+        path = self.request("GET", path, expect_redirect=True)
+
+        for _ in range(MAX_QUESTIONS):
+            if path.endswith("/application"):
+                break
+            self.request("GET", path)
+            path = self.request("POST", path, ANSWERS, expect_redirect=True)
+        else:
+            raise JourneyError("Didn't reach check your answers after {} questions".format(MAX_QUESTIONS))
+
+        self.request("GET", path)
+        path = self.request("POST", path, expect_redirect=True)
+        self.request("GET", path)
+
+    def run(self, brief_ids):
+        self.log_in()
+        for brief_id in brief_ids:
+            try:
+                self.apply_for(brief_id)
+            except JourneyError:
+                self.results.journey_finished(completed=False)
+            else:
+                self.results.journey_finished(completed=True)
+
+
+def _briefs_to_apply_for(api, supplier_id, journeys):
+    """Briefs the supplier is eligible for and hasn't already responded to"""
+    brief_ids = [
+        brief_id for brief_id in range(1, api.briefs + 1)
+        if api.is_eligible(supplier_id, brief_id) and brief_id != api.responded_to_brief_id(supplier_id)
+    ]
+    if len(brief_ids) < journeys:
+        raise ValueError("Not enough briefs for {} journeys, use more --briefs".format(journeys))
+    return brief_ids[:journeys]
+
+
+def _create_app(api_url, api):
+    from config import Config
+    from dmutils.user import User
+    from flask_login import login_user
+
+    os.environ["DM_DATA_API_URL"] = api_url
+    with mock.patch("dmutils.session.init_app"):
+        from app import caching, create_app
+        app = create_app("test")
+
+    # the test config is in debug mode, so errors would be raised rather than returned as a 500, and turns the caches
+    # off, but we want to see the app as it runs for real
+    app.debug = False
+    for key in dir(Config):
+        if "_CACHE_" in key:
+            app.config[key] = getattr(Config, key)
+    caching.init_app(app)
+
+    def log_in(user_id):
+        login_user(User.from_json(api.on_user(None, user_id)))
+        return "OK"
+
+    app.add_url_rule("/load-test/login/<int:user_id>", "load_test_login", log_in)
+    return app
+
+
+def _commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_summary(summary):
+    print("{:<50}{:>10}{:>8}{:>10}{:>10}{:>10}{:>12}".format(
+        "endpoint", "requests", "errors", "p50 ms", "p95 ms", "p99 ms", "API calls"
+    ))
+    for name, endpoint in summary["endpoints"].items():
+        print("{:<50}{:>10}{:>8}{:>10.1f}{:>10.1f}{:>10.1f}{:>12.1f}".format(
+            name, endpoint["requests"], endpoint["errors"], endpoint["p50_ms"], endpoint["p95_ms"],
+            endpoint["p99_ms"], endpoint["api_calls_per_request"],
+        ))
+    print("\n{requests} requests in {elapsed_seconds:.1f}s, {throughput_per_second:.1f} per second. "
+          "{journeys_completed} journeys completed, {journeys_failed} failed.".format(**summary))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=8, help="virtual users, each making requests one at a time")
+    parser.add_argument("--journeys", type=int, default=5, help="applications each virtual user makes")
+    parser.add_argument("--briefs", type=int, default=100)
+    parser.add_argument("--latency", default="fixed:0", help="the fake data API's latency, see fake_data_api.py")
+    parser.add_argument("--error-rate", type=float, default=0, help="fraction of data API calls that fail")
+    parser.add_argument("--requirements", type=int, default=5)
+    parser.add_argument("--text-length", type=int, default=500)
+    parser.add_argument("--output", help="file to write the results to as JSON")
+    args = parser.parse_args()
+
+    api = FakeDataAPI(
+        briefs=args.briefs,
+        suppliers=args.users,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        requirements=args.requirements,
+        text_length=args.text_length,
+    )
+    server, api_url = serve(api)
+    app = _create_app(api_url, api)
+
+    results = Results()
+    users = [VirtualUser(app, api, results, supplier_id) for supplier_id in range(1, args.users + 1)]
+    threads = [
+        threading.Thread(target=user.run, args=(_briefs_to_apply_for(api, user.supplier_id, args.journeys),))
+        for user in users
+    ]
+
+    with mock.patch("app.main.helpers.briefs.DMNotifyClient"):
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+    server.shutdown()
+
+    summary = _summary(results, elapsed)
+    _print_summary(summary)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(dict(
+                summary,
+                commit=_commit(),
+                ran_at=datetime.utcnow().isoformat(),
+                options=vars(args),
+            ), f, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
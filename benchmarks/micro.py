@@ -0,0 +1,312 @@
+"""
+Micro-benchmarks of the app's hot paths, compared against baselines saved earlier on the same machine.
+
+Run from the root of the repo, with the frameworks content and frontend built (``make requirements-dev
+frontend-build``)::
+
+    python benchmarks/micro.py                  # compare against benchmarks/baselines.json
+    python benchmarks/micro.py -k dashboard     # only benchmarks with "dashboard" in their name
+    python benchmarks/micro.py --save           # store the results as the new baselines
+    python benchmarks/micro.py --save --app-root ../old --baselines /tmp/old.json   # baselines from another checkout
+
+``make benchmark`` (which CI runs for every pull request) saves baselines from the commit the branch is based on and
+then compares the branch against them, on the same machine, with ``scripts/benchmark.sh``.
+
+The benchmarks are:
+
+- ``filter/<framework>/<lot>`` - filtering the ``edit_brief_response`` manifest for a brief, for every DOS framework
+  and lot that takes briefs
+- ``summary/<framework>/<lot>`` - ``summary()`` of the ``edit_brief`` manifest for a brief, as the application
+  submitted page does
+- ``dashboard/<n>`` - building the opportunities dashboard's tables from ``n`` brief responses
+- ``render/<template>`` - rendering ``check_your_answers.html`` and ``edit_brief_response_question.html``, with what
+  their views pass them
+
+Each is timed as the best of ``--repeat`` runs, so noise only ever makes things look faster, and anything that looks
+slower than its baseline is timed again up to ``--retries`` times before it's reported. The exit status is 1 if
+anything is more than ``--threshold`` slower than its baseline, or fails. Baselines depend on the machine, so none
+are kept in the repo. If none of the benchmarks run has a baseline there's nothing to compare against, so the exit
+status is 2 rather than letting that pass as no regressions. Benchmarks that have no baseline when others do (eg
+because they fail on the older code the baselines were saved from) are listed as unchecked.
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+import traceback
+from contextlib import ExitStack
+from functools import partial
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_data_api import FRAMEWORK_SLUGS, FakeDataAPI, serve  # noqa: E402
+
+APP_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BASELINES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+DOS_FRAMEWORK_SLUGS = (
+    "digital-outcomes-and-specialists",
+    "digital-outcomes-and-specialists-2",
+    "digital-outcomes-and-specialists-3",
+) + FRAMEWORK_SLUGS
+BRIEF_LOT_SLUGS = ("digital-outcomes", "digital-specialists", "user-research-participants")
+DASHBOARD_SIZES = (10, 1000, 10000)
+
+SUPPLIER_ID = 1
+
+
+def _brief(framework_slug, lot_slug):
+    brief = FakeDataAPI().on_brief(None, 1)["briefs"]
+    brief.update(frameworkSlug=framework_slug, lotSlug=lot_slug)
+    return brief
+
+
+def _content_benchmarks(content_loader):
+    def filter_setup(framework_slug, lot_slug, stack):
+        manifest = content_loader.get_lot_manifest(framework_slug, "edit_brief_response", lot_slug)
+        brief = _brief(framework_slug, lot_slug)
+        return lambda: manifest.filter({"lot": lot_slug, "brief": brief, "max_day_rate": "900"})
+
+    def summary_setup(framework_slug, lot_slug, stack):
+        manifest = content_loader.get_lot_manifest(framework_slug, "edit_brief", lot_slug)
+        brief = _brief(framework_slug, lot_slug)
+        return lambda: manifest.filter({"lot": lot_slug}).summary(brief)
+
+    for framework_slug in DOS_FRAMEWORK_SLUGS:
+        for lot_slug in BRIEF_LOT_SLUGS:
+            for kind, setup in (("filter", filter_setup), ("summary", summary_setup)):
+                yield "{}/{}/{}".format(kind, framework_slug, lot_slug), partial(setup, framework_slug, lot_slug)
+
+
+def _opportunities(n):
+    """``n`` brief responses, in every state the dashboard shows differently"""
+    brief_statuses = ("live", "closed", "awarded", "cancelled", "unsuccessful", "withdrawn")
+    opportunities = []
+    for i in range(n):
+        brief_status = brief_statuses[i % len(brief_statuses)]
+        opportunities.append({
+            "id": i,
+            "briefId": i,
+            "status": "draft" if i % 2 else ("awarded" if i % 7 == 0 else "submitted"),
+            "essentialRequirementsMet": bool(i % 3),
+            "brief": {
+                "id": i,
+                "title": "Brief {}".format(i),
+                "status": brief_status,
+                "applicationsClosedAt": "2020-01-{:02d}T23:59:59.000000Z".format(i % 28 + 1),
+                "framework": {"family": "digital-outcomes-and-specialists"},
+            },
+        })
+    return opportunities
+
+
+def _dashboard_benchmarks(app, user):
+    from app.main.views.frameworks import opportunities_dashboard
+
+    framework = {"slug": FRAMEWORK_SLUGS[-1], "framework": "digital-outcomes-and-specialists"}
+    path = "/suppliers/opportunities/frameworks/{}".format(framework["slug"])
+
+    def setup(n, stack):
+        data_api_client = stack.enter_context(mock.patch("app.main.views.frameworks.data_api_client"))
+        data_api_client.get_supplier_framework_info.return_value = {"frameworkInterest": {"onFramework": True}}
+        data_api_client.find_brief_responses.return_value = {"briefResponses": _opportunities(n)}
+        stack.enter_context(mock.patch("app.main.views.frameworks.get_framework", return_value=framework))
+        stack.enter_context(mock.patch("app.main.views.frameworks.render_template", return_value=""))
+
+        def dashboard():
+            with app.test_request_context(path) as request_context:
+                request_context.user = user
+                opportunities_dashboard(framework["slug"])
+
+        return dashboard
+
+    for n in DASHBOARD_SIZES:
+        yield "dashboard/{}".format(n), partial(setup, n)
+
+
+def _rendered_by(client, path):
+    """The template and context the view for ``path`` renders"""
+    with mock.patch("app.main.views.briefs.render_template", return_value="") as render_template:
+        response = client.get(path)
+        while response.status_code == 302:
+            response = client.get(response.location)
+
+    (template_name,), context = render_template.call_args
+    return template_name, context
+
+
+def _render_benchmarks(app, user):
+    from flask import render_template
+    from app import data_api_client
+
+    api = FakeDataAPI(suppliers=SUPPLIER_ID)
+    brief_response_path = "/suppliers/opportunities/{}/responses/{}".format(
+        api.responded_to_brief_id(SUPPLIER_ID), SUPPLIER_ID
+    )
+
+    def setup(path, stack):
+        if not app.config["DM_DATA_API_URL"]:
+            server, app.config["DM_DATA_API_URL"] = serve(api)
+            data_api_client.init_app(app)
+
+        client = app.test_client()
+        client.get("/micro-benchmarks/login")
+        template_name, context = _rendered_by(client, path)
+
+        def render():
+            with app.test_request_context(path) as request_context:
+                request_context.user = user
+                render_template(template_name, **context)
+
+        return render
+
+    yield "render/check_your_answers.html", partial(setup, brief_response_path + "/application")
+    # this redirects to the first question
+    yield "render/edit_brief_response_question.html", partial(setup, brief_response_path)
+
+
+def _create_app():
+    from dmutils.user import User
+    from flask_login import login_user
+
+    with mock.patch("dmutils.session.init_app"):
+        from app import create_app
+        app = create_app("test")
+
+    user = User.from_json(FakeDataAPI(suppliers=SUPPLIER_ID).on_user(None, SUPPLIER_ID))
+
+    def log_in():
+        login_user(user)
+        return "OK"
+
+    app.add_url_rule("/micro-benchmarks/login", "micro_benchmarks_login", log_in)
+    return app, user
+
+
+def _benchmarks():
+    """``(name, setup)`` for every benchmark.
+
+    ``setup(stack)`` returns the function to time. Anything it enters on the ``ExitStack`` ``stack`` (eg mocks) is left
+    once the benchmark's finished.
+    """
+    from app.main import content_loader
+
+    app, user = _create_app()
+    yield from _content_benchmarks(content_loader)
+    yield from _dashboard_benchmarks(app, user)
+    yield from _render_benchmarks(app, user)
+
+
+def _time(func, repeat):
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def _run(name, setup, baseline, args):
+    """Time the benchmark, or return None if it fails while saving baselines.
+
+    A benchmark that looks slower than its baseline is timed again, up to ``--retries`` times, keeping the best time,
+    so that something else slowing the machine down for a moment isn't taken for a regression.
+    """
+    try:
+        with ExitStack() as stack:
+            func = setup(stack)
+            result = _time(func, args.repeat)
+            for _ in range(args.retries):
+                if not baseline or result / baseline - 1 <= args.threshold:
+                    break
+                result = min(result, _time(func, args.repeat))
+            return result
+    except Exception:
+        if not args.save:
+            raise
+        print("\n{} failed, so won't have a baseline".format(name), file=sys.stderr)
+        traceback.print_exc()
+
+
+def _load_baselines(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _report(name, result, baseline, threshold):
+    """Print the benchmark's result, returning how much slower than its baseline it was"""
+    change = result / baseline - 1 if baseline else None
+    print("{:<72}{:>12.1f}{:>12}{:>10}{}".format(
+        name,
+        result * 1e6,
+        "{:.1f}".format(baseline * 1e6) if baseline else "-",
+        "{:+.0%}".format(change) if change is not None else "-",
+        "  SLOWER" if change is not None and change > threshold else "",
+    ))
+    return change
+
+
+def _exit_status(results, regressions, unchecked, args):
+    """Report benchmarks that were slower than their baseline or had none, and return the exit status"""
+    if unchecked and len(unchecked) == len(results):
+        print(
+            "\nNo baselines in {} for any of these benchmarks, so nothing was checked. Save some with --save first"
+            .format(args.baselines),
+            file=sys.stderr,
+        )
+        return 2
+    if unchecked:
+        print(
+            "\n{} benchmark(s) have no baseline and weren't checked: {}".format(len(unchecked), ", ".join(unchecked)),
+            file=sys.stderr,
+        )
+    if regressions:
+        print(
+            "\n{} benchmark(s) more than {:.0%} slower than their baseline".format(len(regressions), args.threshold)
+        )
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="keyword", default="", help="only run benchmarks with this in their name")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=0.25, help="how much slower is a regression, eg 0.25")
+    parser.add_argument("--retries", type=int, default=3, help="times to time again anything that looks slower")
+    parser.add_argument("--save", action="store_true", help="store the results as the new baselines")
+    parser.add_argument("--baselines", default=BASELINES_PATH, help="the baselines file, " + BASELINES_PATH)
+    parser.add_argument("--app-root", default=APP_ROOT, help="the checkout of the app to benchmark, this one")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.abspath(args.app_root))
+
+    baselines = _load_baselines(args.baselines)
+    results, regressions, unchecked = {}, [], []
+    print("{:<72}{:>12}{:>12}{:>10}".format("benchmark", "us", "baseline", "change"))
+    for name, setup in _benchmarks():
+        if args.keyword not in name:
+            continue
+
+        result = _run(name, setup, baselines.get(name), args)
+        if result is None:
+            continue
+        results[name] = result
+        change = _report(name, result, baselines.get(name), args.threshold)
+        if change is None:
+            unchecked.append(name)
+        elif change > args.threshold:
+            regressions.append(name)
+
+    if args.save:
+        baselines.update(results)
+        with open(args.baselines, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+    else:
+        sys.exit(_exit_status(results, regressions, unchecked, args))
+
+
+if __name__ == "__main__":
+    main()
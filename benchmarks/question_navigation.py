@@ -0,0 +1,82 @@
+"""
+Compare working out the previous and next questions in the brief response flow by walking the section (as
+edit_brief_response used to) against building a navigation index once and looking questions up in it.
+
+Run from the root of the repo (the content loader reads from ``app/content``)::
+
+    python benchmarks/question_navigation.py --repeat 1000
+
+Every question of the ``edit_brief_response`` section is visited for every DOS lot, once for a brief with nice to have
+requirements and once for a brief without, which is when questions get skipped.
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+FRAMEWORK_SLUG = "digital-outcomes-and-specialists-5"
+LOT_SLUGS = ("digital-outcomes", "digital-specialists", "user-research-participants", "user-research-studios")
+
+
+def _walk_section(section, brief):
+    # what edit_brief_response did before the navigation index
+    results = []
+    for question_id in [None] + [question.id for question in section.questions]:
+        if question_id in brief.keys() and not brief[question_id]:
+            continue
+
+        next_question_id = section.get_next_question_id(question_id)
+        if next_question_id in brief.keys() and not brief[next_question_id]:
+            next_question_id = section.get_next_question_id(next_question_id)
+
+        previous_question_id = section.get_previous_question_id(question_id)
+        if previous_question_id in brief.keys() and not brief[previous_question_id]:
+            previous_question_id = section.get_previous_question_id(previous_question_id)
+
+        results.append((previous_question_id, next_question_id))
+    return results
+
+
+def _use_index(section, brief):
+    from app.main.helpers.briefs import build_question_navigation
+
+    navigation = build_question_navigation(section, brief)
+    return [navigation[question_id] for question_id in [None] + [question.id for question in section.questions]
+            if question_id in navigation]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    from app.main import CONTENT_MANIFESTS, CONTENT_PATH
+    from app.main.content import LazyContentLoader
+
+    loader = LazyContentLoader(CONTENT_PATH, CONTENT_MANIFESTS)
+
+    print("{:<28}{:<16}{:>10}{:>14}{:>14}".format("lot", "nice to haves", "questions", "walk us", "index us"))
+    for lot_slug in LOT_SLUGS:
+        for nice_to_haves in (["Nice one", "Top one"], []):
+            brief = {
+                "essentialRequirements": ["Essential one", "Essential two"],
+                "niceToHaveRequirements": nice_to_haves,
+            }
+            content = loader.get_lot_manifest(FRAMEWORK_SLUG, "edit_brief_response", lot_slug).filter(
+                {"lot": lot_slug, "brief": brief, "max_day_rate": None}
+            )
+            section = content.get_section(content.get_next_editable_section_id())
+
+            assert _walk_section(section, brief) == _use_index(section, brief)
+
+            walk = timeit.timeit(lambda: _walk_section(section, brief), number=args.repeat) / args.repeat
+            index = timeit.timeit(lambda: _use_index(section, brief), number=args.repeat) / args.repeat
+            print("{:<28}{:<16}{:>10}{:>14.1f}{:>14.1f}".format(
+                lot_slug, "yes" if nice_to_haves else "no", len(section.questions), walk * 1e6, index * 1e6,
+            ))
+
+
+if __name__ == "__main__":
+    main()
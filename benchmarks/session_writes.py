@@ -0,0 +1,112 @@
+"""
+Count session store writes per request for a logged in user browsing the app while the load balancer checks
+``_status`` and Prometheus scrapes ``metrics``, writing every session on every request as the app used to, against
+``app.sessions.ThrottledSessionInterface``.
+
+Run from the root of the repo::
+
+    python benchmarks/session_writes.py --minutes 60 --page-interval 20
+
+The session store is an in-memory stand in for redis behind flask-session's ``RedisSessionInterface``, as the app uses
+in deployed environments. Time is simulated, so this runs in a second or two whatever ``--minutes`` is.
+"""
+import argparse
+import os
+import sys
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+STATUS_INTERVAL = 10
+METRICS_INTERVAL = 30
+
+# a user route that doesn't call the data API or render a template, so we're only measuring the session
+USER_PATH = "/suppliers/opportunities/1/ask-a-question/"
+
+
+class CountingRedis(object):
+    def __init__(self):
+        self.values = {}
+        self.writes = 0
+
+    def get(self, name):
+        return self.values.get(name)
+
+    def setex(self, name, time, value):
+        self.writes += 1
+        self.values[name] = value
+
+    def delete(self, name):
+        self.writes += 1
+        self.values.pop(name, None)
+
+
+def _every_request(app, redis):
+    # what the app did before ThrottledSessionInterface
+    from flask import session
+    from flask_session.sessions import RedisSessionInterface
+
+    app.session_interface = RedisSessionInterface(redis, "session:", use_signer=True)
+
+    @app.before_request
+    def refresh_session():
+        session.permanent = True
+        session.modified = True
+
+
+def _throttled(app, redis):
+    from flask_session.sessions import RedisSessionInterface
+    from app.sessions import ThrottledSessionInterface
+
+    app.session_interface = ThrottledSessionInterface(RedisSessionInterface(redis, "session:", use_signer=True))
+
+
+def _requests(seconds, page_interval):
+    for now in range(seconds):
+        if now % page_interval == 0:
+            yield now, USER_PATH
+        if now % STATUS_INTERVAL == 0:
+            yield now, "/suppliers/opportunities/_status?ignore-dependencies"
+        if now % METRICS_INTERVAL == 0:
+            yield now, "/suppliers/opportunities/metrics"
+
+
+def _count_writes(use_session_interface, seconds, page_interval):
+    from dmtestutils.login import login_for_tests
+    from app import create_app
+
+    with mock.patch("dmutils.session.init_app"):
+        app = create_app("test")
+    app.register_blueprint(login_for_tests)
+    redis = CountingRedis()
+    use_session_interface(app, redis)
+
+    # browsers and the load balancer each keep their own cookies
+    user, machine = app.test_client(), app.test_client()
+    with mock.patch("app.sessions.time.time", return_value=0):
+        user.get("/auto-supplier-login")
+    redis.writes = 0
+
+    requests = 0
+    for now, path in _requests(seconds, page_interval):
+        with mock.patch("app.sessions.time.time", return_value=now):
+            (user if path == USER_PATH else machine).get(path)
+        requests += 1
+
+    return requests, redis.writes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=int, default=60)
+    parser.add_argument("--page-interval", type=int, default=20, help="seconds between the user's page views")
+    args = parser.parse_args()
+
+    print("{:<16}{:>10}{:>10}{:>20}".format("", "requests", "writes", "writes per request"))
+    for name, use_session_interface in (("every request", _every_request), ("throttled", _throttled)):
+        requests, writes = _count_writes(use_session_interface, args.minutes * 60, args.page_interval)
+        print("{:<16}{:>10}{:>10}{:>20.3f}".format(name, requests, writes, writes / requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 # coding=utf-8
 
 import os
+import tempfile
 import jinja2
 from dmutils.status import get_version_label
 from dmutils.asset_fingerprint import AssetFingerprinter
@@ -18,6 +19,9 @@ class Config(object):
     SESSION_COOKIE_SAMESITE = "Lax"
 
     PERMANENT_SESSION_LIFETIME = 3600  # 1 hour
+    # Unchanged sessions are only written again, to push back their expiry, once this fraction of
+    # PERMANENT_SESSION_LIFETIME has passed since they were last written. See app/sessions.py.
+    DM_SESSION_REFRESH_FRACTION = 0.1
 
     DM_COOKIE_PROBE_EXPECT_PRESENT = True
 
@@ -29,8 +33,59 @@ class Config(object):
     DM_NOTIFY_API_KEY = None
     DM_REDIS_SERVICE_NAME = None
 
+    # In-process caches, see app/caching.py. A size or TTL of 0 turns a cache off.
+    DM_BRIEF_RESPONSE_CONTENT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+    DM_QUESTION_NAVIGATION_CACHE_MAX_BYTES = 4 * 1024 * 1024
+    # TTLs are in seconds. Entries older than *_REFRESH_AFTER are refreshed in the background.
+    DM_FRAMEWORK_CACHE_TTL = 600
+    DM_FRAMEWORK_CACHE_REFRESH_AFTER = 300
+    DM_BRIEF_CACHE_MAX_BYTES = 64 * 1024 * 1024
+    DM_BRIEF_CACHE_TTL = 30
+    DM_FINISHED_BRIEF_CACHE_TTL = 3600
+    # This app doesn't change anything eligibility depends on, so never invalidates the eligibility cache. The TTL is
+    # how long a change made elsewhere (eg to a supplier's services) can take to show.
+    DM_ELIGIBILITY_CACHE_MAX_BYTES = 4 * 1024 * 1024
+    DM_ELIGIBILITY_CACHE_TTL = 60
+    # Nor does it change suppliers' services, so the TTL is also how long a change to them can take to show
+    DM_SUPPLIER_SERVICES_CACHE_MAX_BYTES = 16 * 1024 * 1024
+    DM_SUPPLIER_SERVICES_CACHE_TTL = 60
+    # Users are only cached while active, and the cache is never invalidated, so a user locked or deactivated elsewhere
+    # can keep using the app until their entry expires: keep this short. Setting DM_USER_CACHE_USE_REDIS shares the
+    # cache between processes, without making that any longer.
+    DM_USER_CACHE_MAX_BYTES = 4 * 1024 * 1024
+    DM_USER_CACHE_TTL = 30
+    DM_USER_CACHE_USE_REDIS = False
+
+    # Run app.warmup.warm_up when application.py creates the app, before it serves any requests, and report the app
+    # as not ready on _status until it has. Both are on in deployed environments.
+    DM_WARM_UP_ON_START = False
+    DM_REQUIRE_WARM_UP = False
+
+    # Size of the (per-process) pool of threads views use to make independent API calls at the same time
+    DM_CONCURRENT_FETCH_THREADS = 16
+
+    # Most connections to the data API each process keeps open for reuse. This should cover every thread that might
+    # call the API at once - the web server's threads plus DM_CONCURRENT_FETCH_THREADS.
+    DM_DATA_API_POOL_SIZE = 32
+
+    # Profile requests that ask for it with an X-DM-Profile header or _profile query parameter, writing the stats to
+    # DM_PROFILING_OUTPUT_DIR. See app/profiling.py. This is ignored in production.
+    DM_PROFILING_ENABLED = False
+    DM_PROFILING_OUTPUT_DIR = os.path.join(tempfile.gettempdir(), "dm-profiles")
+
+    # Sample the stacks of threads handling requests every this many milliseconds (eg 100), served from _stacks to
+    # requests with DM_SAMPLING_PROFILER_AUTH_TOKEN. See app/sampling.py. 0 turns the sampler off.
+    DM_SAMPLING_PROFILER_INTERVAL_MS = 0
+    DM_SAMPLING_PROFILER_MAX_STACKS = 10000
+    DM_SAMPLING_PROFILER_AUTH_TOKEN = None
+
     DEBUG = False
 
+    # Compiled templates are kept in and loaded from this directory, which `flask compile-templates` fills at build
+    # time. See app/templating.py. None turns the cache off.
+    DM_TEMPLATE_BYTECODE_CACHE_DIR = os.path.join(os.path.abspath(os.path.dirname(__file__)), "app", "template-cache")
+    TEMPLATES_AUTO_RELOAD = False
+
     NOTIFY_TEMPLATES = {
         "clarification_question": "520e0623-119e-41ac-990b-b9cdb0e9c30d",
         "clarification_question_confirmation": "d74a8a05-eae6-49cb-bc08-63d95b92b4d3",
@@ -82,11 +137,23 @@ class Test(Config):
 
     DM_DATA_API_AUTH_TOKEN = 'myToken'
 
+    # tests share the caches between app instances, so keep them out of the way unless a test turns them on
+    DM_BRIEF_RESPONSE_CONTENT_CACHE_MAX_BYTES = 0
+    DM_QUESTION_NAVIGATION_CACHE_MAX_BYTES = 0
+    DM_FRAMEWORK_CACHE_TTL = 0
+    DM_BRIEF_CACHE_MAX_BYTES = 0
+    DM_ELIGIBILITY_CACHE_MAX_BYTES = 0
+    DM_SUPPLIER_SERVICES_CACHE_MAX_BYTES = 0
+    DM_USER_CACHE_MAX_BYTES = 0
+    DM_TEMPLATE_BYTECODE_CACHE_DIR = None
+
 
 class Development(Config):
     DEBUG = True
     DM_PLAIN_TEXT_LOGS = True
     SESSION_COOKIE_SECURE = False
+    DM_PROFILING_ENABLED = True
+    TEMPLATES_AUTO_RELOAD = True
 
     DM_DATA_API_URL = f"http://localhost:{os.getenv('DM_API_PORT', 5000)}"
     DM_DATA_API_AUTH_TOKEN = "myToken"
@@ -102,6 +169,9 @@ class Live(Config):
     DM_LOG_PATH = '/var/log/digitalmarketplace/application.log'
     DM_HTTP_PROTO = 'https'
 
+    DM_WARM_UP_ON_START = True
+    DM_REQUIRE_WARM_UP = True
+
     # use of invalid email addresses with live api keys annoys Notify
     DM_NOTIFY_REDIRECT_DOMAINS_TO_ADDRESS = {
         "example.com": "success@simulator.amazonses.com",
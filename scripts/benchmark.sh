@@ -0,0 +1,32 @@
+#!/bin/sh
+#
+# Run the micro-benchmarks against the commit this branch is based on, then against the working tree, on this
+# machine, failing if anything has got more than the threshold slower. Baselines depend on the machine they're saved
+# on, so they're saved afresh every time rather than kept in the repo.
+#
+# Usage: scripts/benchmark.sh [base branch, default origin/main] [arguments for benchmarks/micro.py]
+
+set -e
+
+PYTHON=${PYTHON:-python}
+BASE_BRANCH=${1:-origin/main}
+[ $# -gt 0 ] && shift
+
+base=$(git merge-base HEAD "$BASE_BRANCH")
+workdir=$(mktemp -d)
+trap 'git worktree remove --force "$workdir/base" 1>&2; rm -rf "$workdir"' EXIT
+
+git worktree add --detach "$workdir/base" "$base" 1>&2
+
+# content and frontend files aren't in git, so the base checkout uses this one's
+for path in app/content app/static app/templates/govuk app/templates/toolkit; do
+  if [ -e "$path" ] && [ ! -e "$workdir/base/$path" ]; then
+    ln -s "$(pwd)/$path" "$workdir/base/$path"
+  fi
+done
+
+echo "Saving baselines from $base" 1>&2
+"$PYTHON" benchmarks/micro.py --save --app-root "$workdir/base" --baselines "$workdir/baselines.json" "$@"
+
+echo "Comparing against them" 1>&2
+"$PYTHON" benchmarks/micro.py --baselines "$workdir/baselines.json" "$@"
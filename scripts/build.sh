@@ -3,9 +3,13 @@
 set -e
 
 npm run frontend-build:production 1>&2
+FLASK_APP=application:application flask build-content-bundle 1>&2
+FLASK_APP=application:application flask compile-templates 1>&2
 
 # Non-Git paths that should be included when deploying
 echo "app/static"
 echo "app/templates/toolkit"
 echo "app/templates/govuk"
 echo "app/content"
+echo "app/content-bundle.pickle"
+echo "app/template-cache"
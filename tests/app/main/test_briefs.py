@@ -411,9 +411,7 @@ class TestSubmitClarificationQuestions(BaseApplicationTest):
         ).single_result_response()
         self.data_api_client.get_brief.return_value['briefs']['frameworkName'] = 'Digital Outcomes and Specialists'
         self.data_api_client.is_supplier_eligible_for_brief.return_value = False
-        self.data_api_client.find_services.side_effect = lambda *args, **kwargs: (
-            {"services": [{"something": "nonempty"}]} if kwargs.get("lot") is None else {"services": []}
-        )
+        self.data_api_client.find_services.return_value = {"services": [{"lotSlug": "digital-outcomes"}]}
 
         res = self.client.post('/suppliers/opportunities/1/ask-a-question', data={
             'clarification_question': "important question",
@@ -460,7 +458,7 @@ class TestSubmitClarificationQuestions(BaseApplicationTest):
         ).single_result_response()
         self.data_api_client.get_brief.return_value['briefs']['frameworkName'] = 'Digital Outcomes and Specialists'
         self.data_api_client.is_supplier_eligible_for_brief.return_value = False
-        self.data_api_client.find_services.return_value = {"services": [{"something": "nonempty"}]}
+        self.data_api_client.find_services.return_value = {"services": [{"lotSlug": "digital-specialists"}]}
 
         res = self.client.post('/suppliers/opportunities/1/ask-a-question', data={
             'clarification_question': "important question",
@@ -566,10 +564,10 @@ class TestApplyToBrief(BaseApplicationTest):
 
     @mock.patch("app.main.views.briefs.content_loader")
     def test_will_redirect_from_generic_brief_response_url_to_first_question(self, content_loader):
-        content_loader.get_manifest.return_value \
+        content_loader.get_lot_manifest.return_value \
             .filter.return_value \
             .get_section.return_value \
-            .get_next_question_id.return_value = 'first'
+            .questions = [mock.Mock(id='first'), mock.Mock(id='second')]
 
         res = self.client.get('/suppliers/opportunities/1234/responses/5')
         assert res.status_code == 302
@@ -640,6 +638,9 @@ class TestApplyToBrief(BaseApplicationTest):
             res = self.client.open('/suppliers/opportunities/1234/responses/5/question-id', method=method)
             assert res.status_code == 404
 
+        assert self.data_api_client.get_framework.called is False
+        assert self.data_api_client.find_services.called is False
+
     @mock.patch("app.main.views.briefs.current_user")
     def test_404_if_brief_response_does_not_relate_to_current_user(self, current_user):
         for method in ('get', 'post'):
@@ -648,6 +649,9 @@ class TestApplyToBrief(BaseApplicationTest):
             res = self.client.open('/suppliers/opportunities/1234/responses/5/question-id', method=method)
             assert res.status_code == 404
 
+        assert self.data_api_client.get_framework.called is False
+        assert self.data_api_client.find_services.called is False
+
     @pytest.mark.parametrize('status', NON_LIVE_BRIEF_STATUSES)
     def test_404_for_not_live_brief(self, status):
         for method in ('get', 'post'):
@@ -680,10 +684,12 @@ class TestApplyToBrief(BaseApplicationTest):
             assert res.status_code == 403
             _render_not_eligible_for_brief_error_page.assert_called_with(self.brief['briefs'])
 
+        assert self.data_api_client.get_framework.called is False
+
     @mock.patch("app.main.views.briefs.content_loader")
     def test_should_404_for_non_existent_content_section(self, content_loader):
         for method in ('get', 'post'):
-            content_loader.get_manifest.return_value.filter.return_value.get_section.return_value = None
+            content_loader.get_lot_manifest.return_value.filter.return_value.get_section.return_value = None
 
             res = self.client.open('/suppliers/opportunities/1234/responses/5/question-id', method=method)
             assert res.status_code == 404
@@ -691,7 +697,7 @@ class TestApplyToBrief(BaseApplicationTest):
     @mock.patch("app.main.views.briefs.content_loader")
     def test_should_404_for_non_editable_content_section(self, content_loader):
         for method in ('get', 'post'):
-            content_loader.get_manifest.return_value.filter.return_value.get_section.return_value.editable = False
+            content_loader.get_lot_manifest.return_value.filter.return_value.get_section.return_value.editable = False
 
             res = self.client.open('/suppliers/opportunities/1234/responses/5/question-id', method=method)
             assert res.status_code == 404
@@ -699,7 +705,7 @@ class TestApplyToBrief(BaseApplicationTest):
     @mock.patch("app.main.views.briefs.content_loader")
     def test_should_404_for_non_existent_question(self, content_loader):
         for method in ('get', 'post'):
-            content_loader.get_manifest.return_value \
+            content_loader.get_lot_manifest.return_value \
                 .filter.return_value \
                 .get_section.return_value \
                 .get_question.return_value = None
@@ -795,7 +801,9 @@ class TestApplyToBrief(BaseApplicationTest):
     def test_day_rate_question_replays_buyers_budget_range_and_suppliers_max_day_rate(self):
         self.brief['briefs']['budgetRange'] = '1 million dollars'
         self.brief['briefs']['specialistRole'] = 'deliveryManager'
-        self.data_api_client.find_services.return_value = {"services": [{"deliveryManagerPriceMax": 600}]}
+        self.data_api_client.find_services.return_value = {"services": [
+            {"lotSlug": "digital-specialists", "deliveryManagerPriceMax": 600},
+        ]}
 
         res = self.client.get(
             '/suppliers/opportunities/1234/responses/5/dayRate'
@@ -836,7 +844,9 @@ class TestApplyToBrief(BaseApplicationTest):
 
     def test_day_rate_question_does_not_replay_buyers_budget_range_if_not_provided(self):
         self.brief['briefs']['specialistRole'] = 'deliveryManager'
-        self.data_api_client.find_services.return_value = {"services": [{"deliveryManagerPriceMax": 600}]}
+        self.data_api_client.find_services.return_value = {"services": [
+            {"lotSlug": "digital-specialists", "deliveryManagerPriceMax": 600},
+        ]}
 
         res = self.client.get(
             '/suppliers/opportunities/1234/responses/5/dayRate'
@@ -1756,7 +1766,7 @@ class TestCheckYourAnswers(BaseApplicationTest):
         assert res.status_code == 404
 
     @pytest.mark.parametrize('method', ['get', 'post'])
-    @mock.patch("app.main.views.briefs.current_user")
+    @mock.patch("app.main.helpers.briefs.current_user")
     def test_check_your_answers_page_404s_if_brief_response_does_not_relate_to_current_user(self, current_user, method):
         current_user.supplier_id = 789
 
@@ -1764,7 +1774,7 @@ class TestCheckYourAnswers(BaseApplicationTest):
         assert res.status_code == 404
 
     @pytest.mark.parametrize('method', ['get', 'post'])
-    @mock.patch("app.main.views.briefs.is_supplier_eligible_for_brief")
+    @mock.patch("app.main.helpers.briefs.is_supplier_eligible_for_brief")
     @mock.patch("app.main.views.briefs._render_not_eligible_for_brief_error_page", autospec=True)
     def test_check_your_answers_page_renders_ineligible_page_if_supplier_ineligible(
             self, _render_not_eligible_for_brief_error_page, is_supplier_eligible_for_brief, method
@@ -1804,7 +1814,7 @@ class TestStartBriefResponseApplication(BaseApplicationTest, BriefResponseTestHe
 
         assert res.status_code == 404
 
-    @mock.patch("app.main.views.briefs.is_supplier_eligible_for_brief")
+    @mock.patch("app.main.helpers.briefs.is_supplier_eligible_for_brief")
     @mock.patch("app.main.views.briefs._render_not_eligible_for_brief_error_page", autospec=True)
     def test_will_show_not_eligible_response_if_supplier_is_not_eligible_for_brief(
         self, _render_not_eligible_for_brief_error_page, is_supplier_eligible_for_brief
@@ -1951,7 +1961,7 @@ class TestPostStartBriefResponseApplication(BaseApplicationTest):
         self.data_api_client_patch.stop()
         super().teardown_method(method)
 
-    @mock.patch("app.main.views.briefs.is_supplier_eligible_for_brief")
+    @mock.patch("app.main.helpers.briefs.is_supplier_eligible_for_brief")
     @mock.patch("app.main.views.briefs._render_not_eligible_for_brief_error_page", autospec=True)
     def test_will_show_not_eligible_response_if_supplier_is_not_eligible_for_brief(
         self, _render_not_eligible_for_brief_error_page, is_supplier_eligible_for_brief
@@ -2125,7 +2135,7 @@ class TestResponseResultPage(BaseApplicationTest, BriefResponseTestHelpers):
         assert len(doc.xpath('//li[contains(normalize-space(text()), "a work history")]')) == 1
         assert len(doc.xpath('//li[contains(normalize-space(text()), "an interview")]')) == 1
 
-    @mock.patch("app.main.views.briefs.is_supplier_eligible_for_brief")
+    @mock.patch("app.main.helpers.briefs.is_supplier_eligible_for_brief")
     @mock.patch("app.main.views.briefs._render_not_eligible_for_brief_error_page", autospec=True)
     def test_will_show_not_eligible_response_if_supplier_is_not_eligible_for_brief(
         self, _render_not_eligible_for_brief_error_page, is_supplier_eligible_for_brief
@@ -2333,7 +2343,7 @@ class TestResponseResultPage(BaseApplicationTest, BriefResponseTestHelpers):
         assert res.status_code == 302
         assert res.location == 'http://localhost.localdomain/suppliers/opportunities/1234/responses/999/application'
 
-    @mock.patch("app.main.views.briefs.is_supplier_eligible_for_brief")
+    @mock.patch("app.main.helpers.briefs.is_supplier_eligible_for_brief")
     def test_view_result_legacy_flow_redirects_to_check_your_answer(self, is_supplier_eligible_for_brief):
         self.set_framework_and_eligibility_for_api_client()
         self.data_api_client.find_brief_responses.return_value = {
@@ -2398,27 +2408,14 @@ class TestRenderNotEligibleForBriefErrorPage(BaseApplicationTest):
 
     def test_not_on_lot(self, render_template, current_user):
         current_user.supplier_id = 100
-        self.data_api_client.find_services.side_effect = lambda *args, **kwargs: (
-            {"services": [{"something": "nonempty"}]} if kwargs.get("lot") is None else {"services": []}
-        )
+        self.data_api_client.find_services.return_value = {"services": [{"lotSlug": "digital-outcomes"}]}
 
         _render_not_eligible_for_brief_error_page(self.brief)
 
-        self.data_api_client.find_services.assert_has_calls(
-            [
-                mock.call(
-                    supplier_id=100,
-                    framework='digital-outcomes-and-specialists',
-                    status='published'
-                ),
-                mock.call(
-                    supplier_id=100,
-                    framework='digital-outcomes-and-specialists',
-                    status='published',
-                    lot='digital-specialists'
-                ),
-            ],
-            any_order=True
+        self.data_api_client.find_services.assert_called_once_with(
+            supplier_id=100,
+            framework='digital-outcomes-and-specialists',
+            status='published'
         )
         render_template.assert_called_with(
             "briefs/not_is_supplier_eligible_for_brief_error.html",
@@ -2431,25 +2428,14 @@ class TestRenderNotEligibleForBriefErrorPage(BaseApplicationTest):
 
     def test_not_on_role(self, render_template, current_user):
         current_user.supplier_id = 100
-        self.data_api_client.find_services.return_value = {"services": [{"service": "data"}]}
+        self.data_api_client.find_services.return_value = {"services": [{"lotSlug": "digital-specialists"}]}
 
         _render_not_eligible_for_brief_error_page(self.brief)
 
-        self.data_api_client.find_services.assert_has_calls(
-            [
-                mock.call(
-                    supplier_id=100,
-                    framework='digital-outcomes-and-specialists',
-                    status='published'
-                ),
-                mock.call(
-                    supplier_id=100,
-                    framework='digital-outcomes-and-specialists',
-                    status='published',
-                    lot='digital-specialists'
-                ),
-            ],
-            any_order=True
+        self.data_api_client.find_services.assert_called_once_with(
+            supplier_id=100,
+            framework='digital-outcomes-and-specialists',
+            status='published'
         )
         render_template.assert_called_with(
             "briefs/not_is_supplier_eligible_for_brief_error.html",
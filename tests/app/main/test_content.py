@@ -0,0 +1,311 @@
+import os
+
+import mock
+import pytest
+
+from flask import Flask, request
+from dmcontent.content_loader import ContentNotFoundError
+from dmcontent.questions import ContentQuestion
+
+from app.main.content import LazyContentLoader, build_content_bundle
+from app.main.helpers.briefs import (
+    brief_response_content_cache,
+    build_question_navigation,
+    get_brief_response_content,
+)
+
+
+MANIFEST_YAML = """
+- name: Your application
+  editable: true
+  questions:
+    - dayRate
+"""
+
+QUESTION_YAML = """
+question: What's your day rate?
+question_advice: |
+  Your day rate for **{{ lot }}**
+type: text
+"""
+
+
+DEPENDS_MANIFEST_YAML = """
+- name: Your application
+  editable: true
+  questions:
+    - dayRate
+    - outcomesOnly
+    - {}
+"""
+
+DEPENDS_QUESTION_YAML = """
+question: {}
+type: text
+depends:
+  - "on": {}
+    being:
+      - "{}"
+"""
+
+
+@pytest.fixture
+def content_path(tmpdir):
+    framework_path = tmpdir.mkdir("frameworks").mkdir("digital-outcomes-and-specialists-5")
+    framework_path.mkdir("manifests").join("edit_brief_response.yml").write(MANIFEST_YAML)
+    framework_path.mkdir("questions").mkdir("brief-responses").join("dayRate.yml").write(QUESTION_YAML)
+    return str(tmpdir)
+
+
+class TestLazyContentLoader:
+    manifests = (
+        ('digital-outcomes-and-specialists-5', 'brief-responses', 'edit_brief_response'),
+        ('digital-outcomes-and-specialists-4', 'brief-responses', 'edit_brief_response'),
+    )
+
+    def test_nothing_is_loaded_until_requested(self, content_path):
+        with mock.patch.object(LazyContentLoader, "load_manifest") as load_manifest:
+            LazyContentLoader(content_path, self.manifests)
+
+        assert load_manifest.called is False
+
+    def test_manifest_is_loaded_on_first_request(self, content_path):
+        loader = LazyContentLoader(content_path, self.manifests)
+
+        manifest = loader.get_manifest('digital-outcomes-and-specialists-5', 'edit_brief_response')
+
+        assert [question.id for question in manifest.sections[0].questions] == ['dayRate']
+
+    def test_manifest_is_only_loaded_once(self, content_path):
+        loader = LazyContentLoader(content_path, self.manifests)
+
+        with mock.patch.object(LazyContentLoader, "load_manifest", wraps=loader.load_manifest) as load_manifest:
+            loader.get_manifest('digital-outcomes-and-specialists-5', 'edit_brief_response')
+            loader.get_manifest('digital-outcomes-and-specialists-5', 'edit_brief_response')
+
+        assert load_manifest.call_args_list == [
+            mock.call('digital-outcomes-and-specialists-5', 'brief-responses', 'edit_brief_response'),
+        ]
+
+    @pytest.mark.parametrize("is_sampled, expect_timed", ((True, True), (False, False)))
+    def test_loaded_manifest_is_only_timed_for_sampled_requests(self, content_path, is_sampled, expect_timed):
+        loader = LazyContentLoader(content_path, self.manifests)
+        loader.get_manifest('digital-outcomes-and-specialists-5', 'edit_brief_response')
+
+        with Flask(__name__).test_request_context("/"):
+            request.is_sampled = is_sampled
+            with mock.patch("app.main.content.logged_duration") as logged_duration:
+                manifest = loader.get_manifest('digital-outcomes-and-specialists-5', 'edit_brief_response')
+
+        assert logged_duration.called is expect_timed
+        assert [question.id for question in manifest.sections[0].questions] == ['dayRate']
+
+    def test_unregistered_manifest_raises_content_not_found(self, content_path):
+        loader = LazyContentLoader(content_path, self.manifests)
+
+        with pytest.raises(ContentNotFoundError):
+            loader.get_manifest('digital-outcomes-and-specialists-5', 'display_brief_response')
+
+    def test_lot_manifest_is_filtered_by_lot(self, content_path):
+        loader = LazyContentLoader(content_path, self.manifests)
+
+        manifest = loader.get_lot_manifest(
+            'digital-outcomes-and-specialists-5', 'edit_brief_response', 'digital-specialists'
+        )
+
+        assert 'digital-specialists' in manifest.get_question('dayRate').question_advice
+
+    def test_lot_manifest_is_only_filtered_once_per_lot(self, content_path):
+        loader = LazyContentLoader(content_path, self.manifests)
+
+        first = loader.get_lot_manifest('digital-outcomes-and-specialists-5', 'edit_brief_response', 'digital-outcomes')
+        second = loader.get_lot_manifest(
+            'digital-outcomes-and-specialists-5', 'edit_brief_response', 'digital-outcomes'
+        )
+        other_lot = loader.get_lot_manifest(
+            'digital-outcomes-and-specialists-5', 'edit_brief_response', 'digital-specialists'
+        )
+
+        assert first is second
+        assert other_lot is not first
+
+    @pytest.mark.parametrize("last_question, depends_on, being, kept_unfiltered", (
+        ("specialistsOnly", "lot", "digital-specialists", False),
+        ("belowMaxDayRate", "max_day_rate", "900", True),
+    ))
+    def test_lot_manifest_gives_the_same_questions_as_filtering_with_the_full_context(
+        self, content_path, last_question, depends_on, being, kept_unfiltered
+    ):
+        framework_path = os.path.join(content_path, "frameworks", "digital-outcomes-and-specialists-5")
+        with open(os.path.join(framework_path, "manifests", "edit_brief_response.yml"), "w") as f:
+            f.write(DEPENDS_MANIFEST_YAML.format(last_question))
+        for question, on, value in (("outcomesOnly", "lot", "digital-outcomes"), (last_question, depends_on, being)):
+            with open(os.path.join(framework_path, "questions", "brief-responses", question + ".yml"), "w") as f:
+                f.write(DEPENDS_QUESTION_YAML.format(question, on, value))
+        loader = LazyContentLoader(content_path, self.manifests)
+        context = {'lot': 'digital-specialists', 'brief': {}, 'max_day_rate': '900'}
+
+        with mock.patch("app.main.content.logger") as logger:
+            lot_manifest = loader.get_lot_manifest(
+                'digital-outcomes-and-specialists-5', 'edit_brief_response', 'digital-specialists'
+            )
+
+        def question_ids(manifest):
+            return [question.id for section in manifest for question in section.questions]
+
+        assert question_ids(lot_manifest.filter(context)) == ['dayRate', last_question]
+        assert question_ids(lot_manifest.filter(context)) == question_ids(
+            loader.get_manifest('digital-outcomes-and-specialists-5', 'edit_brief_response').filter(context)
+        )
+        assert ('outcomesOnly' in question_ids(lot_manifest)) is kept_unfiltered
+        assert logger.warning.called is kept_unfiltered
+
+    def test_registered_manifest_missing_from_disk_raises_content_not_found(self, content_path):
+        loader = LazyContentLoader(content_path, self.manifests)
+
+        with pytest.raises(ContentNotFoundError):
+            loader.get_manifest('digital-outcomes-and-specialists-4', 'edit_brief_response')
+
+
+class TestContentBundle:
+    manifests = (
+        ('digital-outcomes-and-specialists-5', 'brief-responses', 'edit_brief_response'),
+    )
+
+    @pytest.fixture
+    def bundle_path(self, content_path, tmpdir):
+        bundle_path = str(tmpdir.join("content-bundle.pickle"))
+        build_content_bundle(content_path, self.manifests, bundle_path)
+        return bundle_path
+
+    def test_manifest_loaded_from_bundle_matches_yaml(self, content_path, bundle_path):
+        from_yaml = LazyContentLoader(content_path, self.manifests) \
+            .get_manifest('digital-outcomes-and-specialists-5', 'edit_brief_response') \
+            .filter({'lot': 'digital-specialists'})
+
+        with mock.patch.object(LazyContentLoader, "load_manifest") as load_manifest:
+            from_bundle = LazyContentLoader(content_path, self.manifests, bundle_path=bundle_path) \
+                .get_manifest('digital-outcomes-and-specialists-5', 'edit_brief_response') \
+                .filter({'lot': 'digital-specialists'})
+
+        assert load_manifest.called is False
+        question_from_yaml = from_yaml.get_question('dayRate')
+        question_from_bundle = from_bundle.get_question('dayRate')
+        assert question_from_bundle.question == question_from_yaml.question
+        assert question_from_bundle.question_advice == question_from_yaml.question_advice
+        assert 'digital-specialists' in question_from_bundle.question_advice
+
+    def test_stale_bundle_falls_back_to_yaml(self, content_path, bundle_path, tmpdir):
+        tmpdir.join("frameworks", "digital-outcomes-and-specialists-5", "questions", "brief-responses", "dayRate.yml") \
+            .write(QUESTION_YAML.replace("day rate?", "daily rate?"))
+        loader = LazyContentLoader(content_path, self.manifests, bundle_path=bundle_path)
+
+        manifest = loader.get_manifest('digital-outcomes-and-specialists-5', 'edit_brief_response')
+
+        assert manifest.get_question('dayRate').question == "What's your daily rate?"
+
+    def test_missing_bundle_falls_back_to_yaml(self, content_path, tmpdir):
+        loader = LazyContentLoader(content_path, self.manifests, bundle_path=str(tmpdir.join("missing.pickle")))
+
+        manifest = loader.get_manifest('digital-outcomes-and-specialists-5', 'edit_brief_response')
+
+        assert manifest.get_question('dayRate').question == "What's your day rate?"
+
+    def test_corrupt_bundle_falls_back_to_yaml(self, content_path, tmpdir):
+        bundle_path = tmpdir.join("content-bundle.pickle")
+        bundle_path.write_binary(b"not a pickle")
+        loader = LazyContentLoader(content_path, self.manifests, bundle_path=str(bundle_path))
+
+        manifest = loader.get_manifest('digital-outcomes-and-specialists-5', 'edit_brief_response')
+
+        assert manifest.get_question('dayRate').question == "What's your day rate?"
+
+
+class TestGetBriefResponseContent:
+    manifests = (
+        ('digital-outcomes-and-specialists-5', 'brief-responses', 'edit_brief_response'),
+    )
+    brief = {'id': 1234, 'updatedAt': '2020-01-01T12:00:00.000000Z', 'niceToHaveRequirements': []}
+
+    @pytest.fixture(autouse=True)
+    def cache_enabled(self):
+        brief_response_content_cache.configure({'DM_BRIEF_RESPONSE_CONTENT_CACHE_MAX_BYTES': 1024 * 1024})
+        yield
+        brief_response_content_cache.configure({})
+
+    def get_content(self, loader, brief):
+        return get_brief_response_content(
+            loader, 'digital-outcomes-and-specialists-5', 'edit_brief_response', 'digital-specialists', brief
+        )
+
+    def test_content_is_only_prepared_once_per_brief_version(self, content_path):
+        loader = LazyContentLoader(content_path, self.manifests)
+
+        with mock.patch.object(loader, "get_lot_manifest", wraps=loader.get_lot_manifest) as get_lot_manifest:
+            self.get_content(loader, self.brief)
+            self.get_content(loader, self.brief)
+            assert get_lot_manifest.call_count == 1
+
+            self.get_content(loader, dict(self.brief, updatedAt='2020-01-02T12:00:00.000000Z'))
+            assert get_lot_manifest.call_count == 2
+
+    def test_each_call_gets_its_own_sections(self, content_path):
+        loader = LazyContentLoader(content_path, self.manifests)
+
+        first = self.get_content(loader, self.brief)
+        first.sections.pop()
+        second = self.get_content(loader, self.brief)
+
+        assert [question.id for question in second.sections[0].questions] == ['dayRate']
+        assert len(second.sections) == 1
+
+
+class TestBuildQuestionNavigation:
+    section = mock.Mock(questions=[
+        mock.Mock(id='dayRate'), mock.Mock(id='niceToHaveRequirements'), mock.Mock(id='respondToEmailAddress'),
+    ])
+
+    def test_questions_link_to_their_neighbours(self):
+        navigation = build_question_navigation(self.section, {'niceToHaveRequirements': ['Nice one']})
+
+        assert navigation == {
+            None: (None, 'dayRate'),
+            'dayRate': (None, 'niceToHaveRequirements'),
+            'niceToHaveRequirements': ('dayRate', 'respondToEmailAddress'),
+            'respondToEmailAddress': ('niceToHaveRequirements', None),
+        }
+
+    def test_questions_left_empty_by_the_buyer_are_skipped(self):
+        navigation = build_question_navigation(self.section, {'niceToHaveRequirements': []})
+
+        assert navigation == {
+            None: (None, 'dayRate'),
+            'dayRate': (None, 'respondToEmailAddress'),
+            'respondToEmailAddress': ('dayRate', None),
+        }
+
+    def test_empty_section(self):
+        assert build_question_navigation(mock.Mock(questions=[]), {}) == {None: (None, None)}
+
+    def test_questions_inside_multiquestions_can_be_visited_on_their_own(self):
+        section = mock.Mock(questions=[
+            ContentQuestion({'id': 'dayRate', 'type': 'text', 'question': 'Day rate'}),
+            ContentQuestion({
+                'id': 'availability',
+                'type': 'multiquestion',
+                'question': 'Availability',
+                'questions': [
+                    {'id': 'availableFrom', 'type': 'text', 'question': 'From'},
+                    {'id': 'niceToHaveRequirements', 'type': 'text', 'question': 'Nice to haves'},
+                ],
+            }),
+        ])
+
+        navigation = build_question_navigation(section, {'niceToHaveRequirements': []})
+
+        assert navigation == {
+            None: (None, 'dayRate'),
+            'dayRate': (None, 'availability'),
+            'availability': ('dayRate', None),
+            'availableFrom': (None, None),
+        }
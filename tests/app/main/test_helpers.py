@@ -0,0 +1,343 @@
+import threading
+from datetime import datetime, timedelta
+
+import mock
+import pytest
+from flask import abort, g, request
+from freezegun import freeze_time
+from werkzeug.exceptions import NotFound
+
+from dmtestutils.api_model_stubs import BriefStub, FrameworkStub
+from dmutils.formats import DATETIME_FORMAT
+
+from app.main.helpers.briefs import (
+    brief_cache,
+    eligibility_cache,
+    get_brief,
+    is_supplier_eligible_for_brief,
+    load_brief_response_page_context,
+)
+from app.main.helpers.concurrency import fetch_concurrently
+from app.main.helpers.suppliers import (
+    SupplierServiceIndex,
+    get_supplier_service_index,
+    supplier_services_cache,
+)
+
+from ..helpers import BaseApplicationTest
+
+
+class TestGetBrief(BaseApplicationTest):
+    def setup_method(self, method):
+        super().setup_method(method)
+        self.app.config.update({
+            "DM_BRIEF_CACHE_MAX_BYTES": 1024 * 1024,
+            "DM_BRIEF_CACHE_TTL": 30,
+            "DM_FINISHED_BRIEF_CACHE_TTL": 3600,
+        })
+        brief_cache.configure(self.app.config)
+        self.data_api_client = mock.Mock()
+
+    def teardown_method(self, method):
+        brief_cache.configure({})
+        super().teardown_method(method)
+
+    def brief(self, status="live"):
+        brief = BriefStub(status=status).single_result_response()
+        brief["briefs"].update({
+            "clarificationQuestionsClosedAt": "2020-01-08T23:59:59.000000Z",
+            "applicationsClosedAt": "2020-01-15T23:59:59.000000Z",
+        })
+        return brief
+
+    def get_brief_at(self, when, **kwargs):
+        with freeze_time(when), mock.patch("app.caching.time.monotonic", return_value=when.timestamp()):
+            with self.app.test_request_context("/"):
+                return get_brief(self.data_api_client, 1234, **kwargs)
+
+    def test_brief_is_cached(self):
+        self.data_api_client.get_brief.return_value = self.brief()
+        now = datetime(2020, 1, 1, 12)
+
+        self.get_brief_at(now)
+        self.get_brief_at(now + timedelta(seconds=20))
+
+        assert self.data_api_client.get_brief.call_count == 1
+
+    @pytest.mark.parametrize("status, seconds_later, expected_calls", (
+        ("live", 31, 2),
+        ("closed", 31, 1),
+        ("awarded", 3599, 1),
+        ("awarded", 3601, 2),
+    ))
+    def test_brief_ttl_depends_on_status(self, status, seconds_later, expected_calls):
+        self.data_api_client.get_brief.return_value = self.brief(status)
+        now = datetime(2020, 1, 1, 12)
+
+        self.get_brief_at(now)
+        self.get_brief_at(now + timedelta(seconds=seconds_later))
+
+        assert self.data_api_client.get_brief.call_count == expected_calls
+
+    def test_live_brief_is_not_cached_past_when_it_closes(self):
+        now = datetime(2020, 1, 1, 12)
+        brief = self.brief()
+        brief["briefs"]["applicationsClosedAt"] = (now + timedelta(seconds=10)).strftime(DATETIME_FORMAT)
+        self.data_api_client.get_brief.return_value = brief
+
+        self.get_brief_at(now)
+        self.get_brief_at(now + timedelta(seconds=11))
+
+        assert self.data_api_client.get_brief.call_count == 2
+
+    def test_live_brief_is_still_cached_after_clarification_questions_have_closed(self):
+        # the brief's clarification questions closed a week ago, its applications close in a week
+        now = datetime(2020, 1, 8, 23, 59, 59) + timedelta(days=7)
+        brief = self.brief()
+        brief["briefs"]["applicationsClosedAt"] = (now + timedelta(days=7)).strftime(DATETIME_FORMAT)
+        self.data_api_client.get_brief.return_value = brief
+
+        self.get_brief_at(now)
+        self.get_brief_at(now + timedelta(seconds=20))
+
+        assert self.data_api_client.get_brief.call_count == 1
+
+    def test_cached_brief_still_404s_if_status_not_allowed(self):
+        self.data_api_client.get_brief.return_value = self.brief("closed")
+        now = datetime(2020, 1, 1, 12)
+
+        self.get_brief_at(now)
+        with pytest.raises(NotFound):
+            self.get_brief_at(now, allowed_statuses=["live"])
+
+        assert self.data_api_client.get_brief.call_count == 1
+
+
+class TestIsSupplierEligibleForBrief(BaseApplicationTest):
+    def setup_method(self, method):
+        super().setup_method(method)
+        self.app.config.update({"DM_ELIGIBILITY_CACHE_MAX_BYTES": 1024 * 1024, "DM_ELIGIBILITY_CACHE_TTL": 60})
+        eligibility_cache.configure(self.app.config)
+        self.data_api_client = mock.Mock()
+
+    def teardown_method(self, method):
+        eligibility_cache.configure({})
+        super().teardown_method(method)
+
+    def is_eligible(self, supplier_id, brief_id):
+        with self.app.app_context():
+            return is_supplier_eligible_for_brief(self.data_api_client, supplier_id, brief_id)
+
+    @pytest.mark.parametrize("eligible", (True, False))
+    def test_answer_is_cached_whatever_it_is(self, eligible):
+        self.data_api_client.is_supplier_eligible_for_brief.return_value = eligible
+
+        assert self.is_eligible(1, 1234) is eligible
+        assert self.is_eligible(1, 1234) is eligible
+        assert self.data_api_client.is_supplier_eligible_for_brief.call_args_list == [mock.call(1, 1234)]
+
+    def test_answer_expires(self):
+        self.data_api_client.is_supplier_eligible_for_brief.side_effect = [False, True]
+
+        with mock.patch("app.caching.time.monotonic", return_value=1000.0) as now:
+            assert self.is_eligible(1, 1234) is False
+            now.return_value += 60
+            assert self.is_eligible(1, 1234) is True
+
+
+class TestLoadBriefResponsePageContext(BaseApplicationTest):
+    def setup_method(self, method):
+        super().setup_method(method)
+        self.data_api_client = mock.Mock()
+        self.data_api_client.get_brief.return_value = BriefStub(
+            framework_slug="digital-outcomes-and-specialists-4", lot_slug="digital-specialists", status="live",
+        ).single_result_response()
+        self.data_api_client.get_framework.return_value = FrameworkStub(
+            slug="digital-outcomes-and-specialists-4",
+            status="live",
+            lots=[{"slug": "digital-specialists", "name": "Digital specialists"}],
+        ).single_result_response()
+        self.data_api_client.is_supplier_eligible_for_brief.return_value = True
+        self.current_user_patch = mock.patch("app.main.helpers.briefs.current_user", supplier_id=1234)
+        self.current_user_patch.start()
+
+    def teardown_method(self, method):
+        self.current_user_patch.stop()
+        super().teardown_method(method)
+
+    def load(self, **kwargs):
+        with self.app.test_request_context("/"):
+            return load_brief_response_page_context(self.data_api_client, 1234, ["live"], **kwargs)
+
+    def test_everything_is_loaded(self):
+        self.data_api_client.find_brief_responses.return_value = {"briefResponses": [{"id": 5}]}
+
+        page = self.load(brief_response_status="draft", with_framework=True)
+
+        assert page.brief["id"] == 1234
+        assert page.brief_responses == [{"id": 5}]
+        assert page.is_eligible is True
+        assert page.framework["slug"] == "digital-outcomes-and-specialists-4"
+        assert page.lot["slug"] == "digital-specialists"
+        self.data_api_client.find_brief_responses.assert_called_once_with(
+            brief_id=1234, supplier_id=1234, status="draft"
+        )
+        self.data_api_client.is_supplier_eligible_for_brief.assert_called_once_with(1234, 1234)
+
+    def test_brief_response_by_id(self):
+        self.data_api_client.get_brief_response.return_value = {"briefResponses": {"briefId": 1234, "supplierId": 1234}}
+
+        assert self.load(brief_response_id=5).brief_responses == [{"briefId": 1234, "supplierId": 1234}]
+        self.data_api_client.get_brief_response.assert_called_once_with(5)
+
+    @pytest.mark.parametrize("brief_id, supplier_id", ((234, 1234), (1234, 789)))
+    def test_brief_response_by_id_must_be_the_suppliers_response_to_the_brief(self, brief_id, supplier_id):
+        self.data_api_client.get_brief_response.return_value = {
+            "briefResponses": {"briefId": brief_id, "supplierId": supplier_id}
+        }
+
+        with pytest.raises(NotFound):
+            self.load(brief_response_id=5, with_framework=True)
+
+        assert self.data_api_client.is_supplier_eligible_for_brief.called is False
+        assert self.data_api_client.get_framework.called is False
+
+    def test_eligibility_is_not_checked_for_briefs_not_in_allowed_statuses(self):
+        self.data_api_client.get_brief.return_value["briefs"]["status"] = "closed"
+
+        with pytest.raises(NotFound):
+            self.load()
+
+        assert self.data_api_client.is_supplier_eligible_for_brief.called is False
+
+    def test_framework_is_only_fetched_when_asked_for(self):
+        self.data_api_client.find_brief_responses.return_value = {"briefResponses": []}
+
+        page = self.load()
+
+        assert page.is_eligible is True
+        assert self.data_api_client.get_framework.called is False
+
+    def test_framework_404s_when_it_is_used(self):
+        self.data_api_client.get_framework.return_value["frameworks"]["status"] = "open"
+
+        page = self.load(with_framework=True)
+
+        assert page.is_eligible is True
+        with pytest.raises(NotFound):
+            page.framework
+
+
+class TestSupplierServiceIndex:
+    index = SupplierServiceIndex([
+        {"lotSlug": "digital-outcomes"},
+        {"lotSlug": "digital-specialists", "developerPriceMax": "600", "designerPriceMax": None},
+    ])
+
+    def test_empty_index_is_not_on_framework(self):
+        assert SupplierServiceIndex([]).on_framework is False
+        assert self.index.on_framework is True
+
+    def test_on_lot(self):
+        assert self.index.on_lot("digital-specialists") is True
+        assert self.index.on_lot("user-research-studios") is False
+
+    @pytest.mark.parametrize("lot_slug, role, expected", (
+        ("digital-specialists", "developer", "600"),
+        ("digital-specialists", "designer", None),
+        ("digital-specialists", "agileCoach", None),
+        ("user-research-studios", "developer", None),
+    ))
+    def test_max_day_rate(self, lot_slug, role, expected):
+        assert self.index.max_day_rate(lot_slug, role) == expected
+
+
+class TestGetSupplierServiceIndex(BaseApplicationTest):
+    def setup_method(self, method):
+        super().setup_method(method)
+        self.app.config.update({"DM_SUPPLIER_SERVICES_CACHE_MAX_BYTES": 1024 * 1024})
+        supplier_services_cache.configure(self.app.config)
+        self.data_api_client = mock.Mock()
+        self.data_api_client.find_services.return_value = {"services": [{"lotSlug": "digital-specialists"}]}
+
+    def teardown_method(self, method):
+        supplier_services_cache.configure({})
+        super().teardown_method(method)
+
+    def get_index(self, supplier_id):
+        with self.app.app_context():
+            return get_supplier_service_index(self.data_api_client, supplier_id, "digital-outcomes-and-specialists")
+
+    def test_services_are_fetched_once_and_cached(self):
+        assert self.get_index(1).on_lot("digital-specialists")
+        assert self.get_index(1).on_lot("digital-specialists")
+
+        self.data_api_client.find_services.assert_called_once_with(
+            supplier_id=1, framework="digital-outcomes-and-specialists", status="published"
+        )
+
+    def test_services_expire(self):
+        with mock.patch("app.caching.time.monotonic", return_value=1000.0) as now:
+            self.get_index(1)
+            now.return_value += self.app.config["DM_SUPPLIER_SERVICES_CACHE_TTL"]
+            self.get_index(1)
+
+        assert self.data_api_client.find_services.call_count == 2
+
+
+class TestFetchConcurrently(BaseApplicationTest):
+    def test_fetches_run_in_other_threads_with_the_request(self):
+        with self.app.test_request_context("/?foo=bar"):
+            futures = fetch_concurrently(
+                lambda: (threading.current_thread().name, request.args["foo"]),
+                lambda: request.args["foo"] + "baz",
+            )
+
+            thread_name, foo = futures[0].result()
+            assert thread_name != threading.current_thread().name
+            assert foo == "bar"
+            assert futures[1].result() == "barbaz"
+
+    def test_fetches_happen_at_the_same_time(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        with self.app.test_request_context("/"):
+            futures = fetch_concurrently(barrier.wait, barrier.wait, barrier.wait)
+
+            assert sorted(future.result() for future in futures) == [0, 1, 2]
+
+    def test_exceptions_are_raised_when_results_are_resolved(self):
+        def not_found():
+            abort(404)
+
+        with self.app.test_request_context("/"):
+            not_found_future, ok_future = fetch_concurrently(not_found, lambda: "ok")
+
+            assert ok_future.result() == "ok"
+            with pytest.raises(NotFound):
+                not_found_future.result()
+
+    def test_each_fetch_has_its_own_g(self):
+        with self.app.test_request_context("/"):
+            g.set_in_request = True
+            futures = fetch_concurrently(lambda: g.setdefault("set_in_fetch", threading.get_ident()), lambda: list(g))
+
+            assert futures[0].result() != threading.get_ident()
+            assert futures[1].result() == []
+            assert "set_in_fetch" not in g
+
+    def test_teardown_is_not_run_for_each_fetch(self):
+        teardown = mock.Mock()
+        self.app.teardown_request(teardown)
+
+        with self.app.test_request_context("/"):
+            future, = fetch_concurrently(lambda: "ok")
+            future.result()
+            assert teardown.called is False
+
+    def test_fetches_outside_a_request_are_made_straight_away(self):
+        fetch = mock.Mock(return_value="ok")
+
+        future, = fetch_concurrently(fetch)
+
+        assert future.done() and future.result() == "ok"
@@ -0,0 +1,147 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+import mock
+import pytest
+import requests_mock
+from prometheus_client import REGISTRY
+
+from app.api_client import MemoizingDataAPIClient, _RequestMemo
+from app.main.helpers.concurrency import fetch_concurrently
+
+from .helpers import BaseApplicationTest
+
+
+class TestMemoizingDataAPIClient(BaseApplicationTest):
+    def setup_method(self, method):
+        super().setup_method(method)
+        self.api_client = MemoizingDataAPIClient("http://baseurl", "auth-token")
+        self.api_client.init_app = mock.Mock()
+
+    @pytest.fixture(autouse=True)
+    def rmock(self):
+        with requests_mock.mock() as rmock:
+            rmock.get("http://baseurl/briefs/1234", json={"briefs": {"id": 1234, "status": "live"}})
+            rmock.get("http://baseurl/briefs/5678", json={"briefs": {"id": 5678, "status": "live"}})
+            rmock.post("http://baseurl/brief-responses/5/submit", json={"briefResponses": {}})
+            self.rmock = rmock
+            yield rmock
+
+    def test_repeated_reads_in_a_request_only_call_the_api_once(self):
+        with self.app.test_request_context("/"):
+            first = self.api_client.get_brief(1234)
+            second = self.api_client.get_brief(1234)
+            self.api_client.get_brief(5678)
+
+        assert first == second == {"briefs": {"id": 1234, "status": "live"}}
+        assert self.rmock.call_count == 2
+
+    def test_callers_cannot_change_each_others_responses(self):
+        with self.app.test_request_context("/"):
+            self.api_client.get_brief(1234)["briefs"]["status"] = "closed"
+
+            assert self.api_client.get_brief(1234)["briefs"]["status"] == "live"
+
+    def test_threads_working_on_a_request_share_its_memo(self):
+        class SlowToMakeRequestMemo(_RequestMemo):
+            def __init__(self):
+                time.sleep(0.05)
+                super().__init__()
+
+        with mock.patch("app.api_client._RequestMemo", SlowToMakeRequestMemo):
+            with self.app.test_request_context("/") as request_context:
+                for future in fetch_concurrently(*[lambda: self.api_client.get_brief(1234)] * 4):
+                    future.result()
+
+                memo = request_context.request._data_api_memo
+                assert memo.real_calls + memo.deduplicated_calls == 4
+
+    def test_reads_are_not_shared_between_requests(self):
+        for _ in range(2):
+            with self.app.test_request_context("/"):
+                self.api_client.get_brief(1234)
+
+        assert self.rmock.call_count == 2
+
+    def test_reads_outside_a_request_are_not_memoized(self):
+        self.api_client.get_brief(1234)
+        self.api_client.get_brief(1234)
+
+        assert self.rmock.call_count == 2
+
+    def test_writes_forget_earlier_reads(self):
+        with self.app.test_request_context("/"):
+            self.api_client.get_brief(1234)
+            self.api_client.submit_brief_response(5, "user@example.com")
+            self.api_client.get_brief(1234)
+
+        assert [request.method for request in self.rmock.request_history] == ["GET", "POST", "GET"]
+
+    def test_call_counts_are_logged_at_the_end_of_the_request(self):
+        with mock.patch.object(self.app.logger, "info") as log_info:
+            with self.app.test_request_context("/"):
+                self.api_client.get_brief(1234)
+                self.api_client.get_brief(1234)
+                self.api_client.get_brief(1234)
+                MemoizingDataAPIClient._log_call_counts(None)
+
+        assert log_info.call_args[1]["extra"] == {"data_api_real_calls": 1, "data_api_deduplicated_calls": 2}
+
+
+class _BriefHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep connections alive
+
+    def do_GET(self):
+        body = json.dumps({"briefs": {"id": 1234}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class TestMemoizingDataAPIClientConnections(BaseApplicationTest):
+    @pytest.fixture(autouse=True)
+    def api(self):
+        server = _ThreadingHTTPServer(("127.0.0.1", 0), _BriefHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.api_client = MemoizingDataAPIClient("http://127.0.0.1:{}".format(server.server_address[1]), "token")
+        yield server
+        server.shutdown()
+        server.server_close()
+
+    def test_connections_are_reused_between_calls(self):
+        new_connections = REGISTRY.get_sample_value("dm_data_api_new_connections_total") or 0
+
+        for _ in range(3):
+            assert self.api_client.get_brief(1234) == {"briefs": {"id": 1234}}
+
+        assert REGISTRY.get_sample_value("dm_data_api_new_connections_total") - new_connections == 1
+        assert REGISTRY.get_sample_value("dm_data_api_connections_in_use") == 0
+
+    def test_each_thread_has_its_own_session_sharing_the_connection_pool(self):
+        sessions = [self.api_client._requests_retry_session()]
+        thread = threading.Thread(target=lambda: sessions.append(self.api_client._requests_retry_session()))
+        thread.start()
+        thread.join()
+
+        assert self.api_client._requests_retry_session() is sessions[0]
+        assert sessions[1] is not sessions[0]
+        assert sessions[1].get_adapter("http://") is sessions[0].get_adapter("http://")
+
+    def test_pool_size_is_configured_by_init_app(self):
+        self.app.config["DM_DATA_API_POOL_SIZE"] = 3
+        self.api_client.init_app(self.app)
+
+        assert self.api_client._requests_retry_session().get_adapter("http://")._pool_maxsize == 3
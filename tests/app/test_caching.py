@@ -0,0 +1,175 @@
+import mock
+import pytest
+
+from app import caching
+from app.caching import LRUCache, TTLCache, approximate_size, caches_status
+
+
+class TestApproximateSize:
+    def test_containers_are_bigger_than_their_contents(self):
+        value = "x" * 1000
+
+        assert approximate_size([value]) > approximate_size(value) >= 1000
+
+    def test_objects_referred_to_twice_are_only_counted_once(self):
+        value = "x" * 1000
+
+        assert approximate_size([value, value]) < 2 * approximate_size(value)
+
+    def test_attributes_of_objects_are_counted(self):
+        class Thing:
+            def __init__(self, value):
+                self.value = value
+
+        assert approximate_size(Thing("x" * 1000)) > 1000
+
+
+class TestLRUCache:
+    @pytest.fixture
+    def cache(self):
+        cache = LRUCache("test", "DM_TEST_CACHE_MAX_BYTES", sizeof=len)
+        cache.configure({"DM_TEST_CACHE_MAX_BYTES": 10})
+        yield cache
+        caching.caches.remove(cache)
+
+    def test_get_returns_stored_value(self, cache):
+        cache.set("a", "aaa")
+
+        assert cache.get("a") == "aaa"
+        assert cache.get("b", "default") == "default"
+
+    def test_least_recently_used_values_are_evicted_when_full(self, cache):
+        cache.set("a", "aaaa")
+        cache.set("b", "bbbb")
+        cache.get("a")
+        cache.set("c", "cccc")
+
+        assert cache.get("a") == "aaaa"
+        assert cache.get("b") is None
+        assert cache.get("c") == "cccc"
+
+    def test_values_bigger_than_the_cache_are_not_stored(self, cache):
+        cache.set("a", "aaaa")
+        cache.set("b", "b" * 11)
+
+        assert cache.get("a") == "aaaa"
+        assert cache.get("b") is None
+
+    def test_replacing_a_value_frees_its_space(self, cache):
+        for _ in range(5):
+            cache.set("a", "aaaa")
+        cache.set("b", "bbbb")
+
+        assert len(cache) == 2
+
+    def test_zero_size_disables_cache(self, cache):
+        cache.configure({"DM_TEST_CACHE_MAX_BYTES": 0})
+        cache.set("a", "aaa")
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_values_expire_after_their_ttl(self, cache):
+        with mock.patch("app.caching.time.monotonic", return_value=1000.0) as now:
+            cache.set("a", "aaa", ttl=10)
+            now.return_value += 9
+            assert cache.get("a") == "aaa"
+            now.return_value += 1
+            assert cache.get("a") is None
+
+        assert len(cache) == 0
+
+    def test_values_get_the_configured_ttl_by_default(self):
+        cache = LRUCache("test", "DM_TEST_CACHE_MAX_BYTES", sizeof=len, ttl_config_key="DM_TEST_CACHE_TTL")
+        cache.configure({"DM_TEST_CACHE_MAX_BYTES": 10, "DM_TEST_CACHE_TTL": 10})
+
+        with mock.patch("app.caching.time.monotonic", return_value=1000.0) as now:
+            cache.set("a", "aaa")
+            cache.set("b", "bbb", ttl=20)
+            now.return_value += 10
+            assert cache.get("a") is None
+            assert cache.get("b") == "bbb"
+
+        caching.caches.remove(cache)
+
+    def test_configure_clears_cache(self, cache):
+        cache.set("a", "aaa")
+        cache.configure({"DM_TEST_CACHE_MAX_BYTES": 10})
+
+        assert cache.get("a") is None
+
+
+class TestTTLCache:
+    @pytest.fixture
+    def cache(self):
+        cache = TTLCache("test", "DM_TEST_CACHE_TTL", "DM_TEST_CACHE_REFRESH_AFTER")
+        cache.configure({"DM_TEST_CACHE_TTL": 60, "DM_TEST_CACHE_REFRESH_AFTER": 30})
+        yield cache
+        caching.caches.remove(cache)
+
+    @pytest.fixture
+    def now(self):
+        with mock.patch("app.caching.time.monotonic", return_value=1000.0) as monotonic:
+            yield monotonic
+
+    @pytest.fixture
+    def background_threads(self):
+        # run "background" refreshes straight away so we can check what they did
+        with mock.patch("app.caching.threading.Thread") as thread:
+            thread.side_effect = lambda target, args, daemon: mock.Mock(start=lambda: target(*args))
+            yield thread
+
+    def test_values_are_fetched_once_until_they_expire(self, cache, now):
+        fetch = mock.Mock(side_effect=["first", "second"])
+
+        assert cache.get("a", fetch) == "first"
+        now.return_value += 10
+        assert cache.get("a", fetch) == "first"
+        now.return_value += 60
+        assert cache.get("a", fetch) == "second"
+        assert fetch.call_count == 2
+
+    def test_old_values_are_refreshed_in_the_background(self, cache, now, background_threads):
+        fetch = mock.Mock(side_effect=["first", "second"])
+        cache.get("a", fetch)
+
+        now.return_value += 45
+        assert cache.get("a", fetch) == "first"
+        assert cache.get("a", fetch) == "second"
+        assert background_threads.call_count == 1
+
+    def test_failed_background_refresh_keeps_old_value(self, cache, now, background_threads):
+        fetch = mock.Mock(side_effect=["first", Exception("API down")])
+        cache.get("a", fetch)
+
+        now.return_value += 45
+        cache.get("a", fetch)
+
+        assert cache.get("a", fetch) == "first"
+
+    def test_invalidate(self, cache, now):
+        fetch = mock.Mock(side_effect=["a1", "b1", "a2", "b2", "a3"])
+        cache.get("a", fetch)
+        cache.get("b", fetch)
+
+        cache.invalidate("a")
+        assert cache.get("a", fetch) == "a2"
+        assert cache.get("b", fetch) == "b1"
+
+        cache.invalidate()
+        assert cache.get("b", fetch) == "b2"
+
+    def test_zero_ttl_disables_cache(self, cache):
+        cache.configure({"DM_TEST_CACHE_TTL": 0})
+        fetch = mock.Mock(side_effect=["first", "second"])
+
+        assert cache.get("a", fetch) == "first"
+        assert cache.get("a", fetch) == "second"
+
+    def test_status_reports_age_of_oldest_entry(self, cache, now):
+        cache.get("a", lambda: "a")
+        now.return_value += 20
+        cache.get("b", lambda: "b")
+        now.return_value += 5
+
+        assert caches_status()["caches"]["test"] == {"entries": 2, "oldestEntryAge": 25.0}
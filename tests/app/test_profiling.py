@@ -0,0 +1,73 @@
+import os
+import pstats
+
+import mock
+import pytest
+
+from app import create_app
+
+from .helpers import BaseApplicationTest
+
+
+STATUS_PATH = "/suppliers/opportunities/_status?ignore-dependencies"
+
+
+class TestProfiling(BaseApplicationTest):
+    def create_app(self, tmp_path, **environ):
+        environ = dict({"DM_PROFILING_ENABLED": "true", "DM_PROFILING_OUTPUT_DIR": str(tmp_path)}, **environ)
+        with mock.patch.dict(os.environ, environ):
+            return create_app("test")
+
+    @pytest.mark.parametrize("path, headers", (
+        (STATUS_PATH, {"X-DM-Profile": "1"}),
+        (STATUS_PATH + "&_profile", {}),
+    ))
+    def test_request_asking_to_be_profiled_is_profiled(self, tmp_path, path, headers):
+        app = self.create_app(tmp_path)
+        response = app.test_client().get(path, headers=dict(headers, **{"DM-Request-ID": "abc123"}))
+
+        assert response.status_code == 200
+        stats = pstats.Stats(str(tmp_path / "abc123.prof"))
+        assert any(function_name == "status" for _, _, function_name in stats.stats)
+
+    @pytest.mark.parametrize("request_id", ("/tmp/pwned", "../pwned", "..", "abc.123", "a" * 65))
+    def test_request_id_that_is_not_a_plain_name_is_not_used_for_the_stats_file(self, tmp_path, request_id):
+        output_dir = tmp_path / "profiles"
+        app = self.create_app(output_dir)
+
+        with mock.patch("app.profiling.uuid4") as uuid4:
+            uuid4.return_value.hex = "random"
+            app.test_client().get(STATUS_PATH + "&_profile", headers={"DM-Request-ID": request_id})
+
+        assert list(tmp_path.iterdir()) == [output_dir]
+        assert [path.name for path in output_dir.iterdir()] == ["random.prof"]
+
+    def test_other_requests_are_not_profiled(self, tmp_path):
+        app = self.create_app(tmp_path)
+        app.test_client().get(STATUS_PATH)
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_request_that_raises_is_profiled(self, tmp_path):
+        app = self.create_app(tmp_path)
+        # tear the request down even though the test config's in debug mode
+        app.config["PRESERVE_CONTEXT_ON_EXCEPTION"] = False
+
+        @app.route("/profiled-error")
+        def error():
+            raise ValueError
+
+        with pytest.raises(ValueError):
+            app.test_client().get("/profiled-error?_profile", headers={"DM-Request-ID": "abc123"})
+
+        assert (tmp_path / "abc123.prof").exists()
+
+    @pytest.mark.parametrize("environ", (
+        {"DM_PROFILING_ENABLED": "false"},
+        {"DM_ENVIRONMENT": "production"},
+    ))
+    def test_profiling_can_be_turned_off_and_is_never_on_in_production(self, tmp_path, environ):
+        app = self.create_app(tmp_path, **environ)
+        app.test_client().get(STATUS_PATH, headers={"X-DM-Profile": "1"})
+
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,107 @@
+import os
+import threading
+
+import mock
+import pytest
+
+from app import create_app
+from app.sampling import OTHER_STACKS, StackSampler
+
+from .helpers import BaseApplicationTest
+
+
+STACKS_PATH = "/suppliers/opportunities/_stacks"
+
+
+def wait_in_view(started, finish):
+    started.set()
+    finish.wait()
+
+
+class TestStackSampler(object):
+    def setup_method(self, method):
+        self.sampler = StackSampler(interval=0.1, max_stacks=2)
+
+    def sample_thread(self, endpoint):
+        started, finish = threading.Event(), threading.Event()
+
+        def handle_request():
+            self.sampler.request_started(endpoint)
+            wait_in_view(started, finish)
+            self.sampler.request_finished()
+
+        thread = threading.Thread(target=handle_request)
+        thread.start()
+        started.wait()
+        try:
+            self.sampler.sample()
+        finally:
+            finish.set()
+            thread.join()
+
+    def test_samples_are_counted_against_the_endpoint_of_the_request(self):
+        self.sample_thread("main.edit_brief_response")
+        self.sample_thread("main.edit_brief_response")
+
+        (line,) = self.sampler.collapsed().splitlines()
+        stack, count = line.rsplit(" ", 1)
+        assert stack.startswith("main.edit_brief_response;threading:")
+        assert ";tests.app.test_sampling:handle_request;tests.app.test_sampling:wait_in_view;threading:wait" in stack
+        assert count == "2"
+
+    def test_threads_not_handling_a_request_are_not_sampled(self):
+        self.sampler.sample()
+        assert self.sampler.collapsed() == ""
+
+    def test_stacks_past_the_maximum_are_counted_together(self):
+        for endpoint in ("main.a", "main.b", "main.c", "main.c"):
+            self.sample_thread(endpoint)
+
+        assert [line.split(";")[:2] for line in self.sampler.collapsed().splitlines()][-1] == [
+            "main.c", "{} 2".format(OTHER_STACKS),
+        ]
+
+    def test_collapsed_can_be_limited_to_an_endpoint(self):
+        self.sample_thread("main.a")
+        self.sample_thread("main.b")
+
+        assert [line.split(";")[0] for line in self.sampler.collapsed("main.b").splitlines()] == ["main.b"]
+
+
+class TestStacksEndpoint(BaseApplicationTest):
+    def setup_method(self, method):
+        super().setup_method(method)
+        environ = {"DM_SAMPLING_PROFILER_INTERVAL_MS": "100", "DM_SAMPLING_PROFILER_AUTH_TOKEN": "s3cret"}
+        with mock.patch.dict(os.environ, environ):
+            self.app = create_app("test")
+        self.client = self.app.test_client()
+        self.sampler = self.app.extensions["stack_sampler"]
+
+    def test_requests_are_noted_while_they_are_handled(self):
+        @self.app.route("/sampled")
+        def sampled():
+            return str(self.sampler._requests)
+
+        response = self.client.get("/sampled")
+
+        assert "'sampled'" in response.get_data(as_text=True)
+        assert self.sampler._requests == {}
+
+    def test_stacks_are_served_as_collapsed_stacks(self):
+        # as the first request would, so that doesn't clear what we count
+        self.sampler.ensure_started()
+        self.sampler._count("main.edit_brief_response", "app:view;app:render")
+
+        response = self.client.get(STACKS_PATH, headers={"Authorization": "Bearer s3cret"})
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/plain"
+        assert response.get_data(as_text=True) == "main.edit_brief_response;app:view;app:render 1\n"
+
+    @pytest.mark.parametrize("headers", ({}, {"Authorization": "Bearer wrong"}, {"Authorization": "s3cret"}))
+    def test_stacks_need_the_auth_token(self, headers):
+        assert self.client.get(STACKS_PATH, headers=headers).status_code == 401
+
+    def test_stacks_are_not_found_when_the_sampler_is_off(self):
+        client = create_app("test").test_client()
+        assert client.get(STACKS_PATH, headers={"Authorization": "Bearer s3cret"}).status_code == 404
@@ -0,0 +1,97 @@
+import mock
+import pytest
+from flask import request
+from flask.sessions import SecureCookieSession
+from flask_login import current_user
+from flask_login.utils import encode_cookie
+
+from app import data_api_client
+from app.sessions import REFRESHED_AT_KEY, ThrottledSessionInterface
+
+from .helpers import BaseApplicationTest
+
+
+SESSIONLESS_PATHS = (
+    "/suppliers/opportunities/_status?ignore-dependencies",
+    "/suppliers/opportunities/metrics",
+    "/suppliers/opportunities/1234",
+)
+
+
+class TestThrottledSessionInterface(BaseApplicationTest):
+    def setup_method(self, method):
+        super().setup_method(method)
+        # the test config's lifetime is an hour, so a session is refreshed after 6 minutes
+        self.app.config["DM_SESSION_REFRESH_FRACTION"] = 0.1
+        self.wrapped_interface = mock.Mock()
+        self.session_interface = ThrottledSessionInterface(self.wrapped_interface)
+
+    def save(self, session, path="/suppliers/opportunities/1/ask-a-question", now=10000):
+        with self.app.test_request_context(path), mock.patch("app.sessions.time.time", return_value=now):
+            self.session_interface.save_session(self.app, session, mock.sentinel.response)
+
+        return self.wrapped_interface.save_session.called
+
+    def test_app_uses_throttled_session_interface(self):
+        assert isinstance(self.app.session_interface, ThrottledSessionInterface)
+
+    def test_modified_session_is_saved(self):
+        session = SecureCookieSession({"user_id": "123", REFRESHED_AT_KEY: 10000})
+        session["_flashes"] = [("message", "Hello")]
+
+        assert self.save(session) is True
+        self.wrapped_interface.save_session.assert_called_once_with(self.app, session, mock.sentinel.response)
+        assert session.permanent is True
+
+    @pytest.mark.parametrize("refreshed_at, saved", (
+        (10000 - 359, False),
+        (10000 - 360, True),
+        (None, True),
+    ))
+    def test_unmodified_session_is_only_saved_when_due_a_refresh(self, refreshed_at, saved):
+        session = SecureCookieSession({"user_id": "123"})
+        if refreshed_at is not None:
+            session[REFRESHED_AT_KEY] = refreshed_at
+        session.modified = False
+
+        assert self.save(session) is saved
+        if saved:
+            assert session[REFRESHED_AT_KEY] == 10000
+
+    def test_empty_session_is_not_saved(self):
+        assert self.save(SecureCookieSession({"_permanent": True})) is False
+
+    @pytest.mark.parametrize("path", SESSIONLESS_PATHS)
+    def test_sessionless_routes_get_a_null_session(self, path):
+        with self.app.test_request_context(path):
+            session = self.session_interface.open_session(self.app, request)
+
+        assert session is self.wrapped_interface.make_null_session.return_value
+        assert self.wrapped_interface.open_session.called is False
+
+    @pytest.mark.parametrize("path", SESSIONLESS_PATHS)
+    def test_sessionless_routes_do_not_load_the_user(self, path):
+        self.login()
+        with self.app.app_context():
+            self.client.set_cookie("localhost.localdomain", "remember_token", encode_cookie("123"))
+
+        with self.client, mock.patch("app.main.views.briefs.get_brief") as get_brief:
+            get_brief.return_value = {"framework": {"family": "digital-outcomes-and-specialists"}}
+            self.client.get(path)
+            assert current_user.is_anonymous
+
+        assert data_api_client.get_user.called is False
+
+    def test_logged_in_user_only_gets_the_session_cookie_again_when_it_needs_refreshing(self):
+        # a user route that doesn't render anything
+        path = "/suppliers/opportunities/1/ask-a-question/"
+
+        with mock.patch("app.sessions.time.time", return_value=10000):
+            self.login()
+
+            response = self.client.get(path)
+            assert self.get_cookie_by_name(response, "dm_session") is None
+
+        with mock.patch("app.sessions.time.time", return_value=10360):
+            response = self.client.get(path)
+            assert self.get_cookie_by_name(response, "dm_session") is not None
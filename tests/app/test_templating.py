@@ -0,0 +1,95 @@
+import os
+
+import jinja2
+import mock
+
+from app import create_app
+from app.templating import BytecodeCache, compile_templates
+
+from .helpers import BaseApplicationTest
+
+
+TEMPLATES = {"page.html": "<p>{{ name }}</p>", "broken.html": "{% if %}"}
+
+
+def make_environment(cache_dir):
+    return jinja2.Environment(loader=jinja2.DictLoader(TEMPLATES), bytecode_cache=BytecodeCache(str(cache_dir)))
+
+
+class TestBytecodeCache(object):
+    def test_compiled_templates_are_loaded_from_the_cache(self, tmp_path):
+        make_environment(tmp_path).get_template("page.html")
+
+        environment = make_environment(tmp_path)
+        with mock.patch.object(environment, "compile", wraps=environment.compile) as compile:
+            assert environment.get_template("page.html").render(name="Bob") == "<p>Bob</p>"
+
+        assert compile.called is False
+
+    def test_cache_is_used_when_the_templates_have_moved(self, tmp_path):
+        cache_dir = tmp_path / "cache"
+        for templates_dir in (tmp_path / "build", tmp_path / "deploy"):
+            templates_dir.mkdir()
+            (templates_dir / "page.html").write_text(TEMPLATES["page.html"])
+
+        def environment(templates_dir):
+            return jinja2.Environment(
+                loader=jinja2.FileSystemLoader(str(templates_dir)), bytecode_cache=BytecodeCache(str(cache_dir))
+            )
+
+        environment(tmp_path / "build").get_template("page.html")
+
+        deployed = environment(tmp_path / "deploy")
+        with mock.patch.object(deployed, "compile", wraps=deployed.compile) as compile:
+            assert deployed.get_template("page.html").render(name="Bob") == "<p>Bob</p>"
+
+        assert compile.called is False
+
+    def test_changed_templates_are_compiled_again(self, tmp_path):
+        make_environment(tmp_path).get_template("page.html")
+
+        environment = jinja2.Environment(
+            loader=jinja2.DictLoader({"page.html": "<b>{{ name }}</b>"}), bytecode_cache=BytecodeCache(str(tmp_path))
+        )
+
+        assert environment.get_template("page.html").render(name="Bob") == "<b>Bob</b>"
+
+    def test_cache_files_can_be_read_by_anyone_and_nothing_else_is_left(self, tmp_path):
+        make_environment(tmp_path).get_template("page.html")
+
+        (cache_file,) = tmp_path.iterdir()
+        assert cache_file.name.startswith("__jinja2_")
+        assert cache_file.stat().st_mode & 0o777 == 0o644
+
+    def test_templates_are_still_used_when_the_cache_cannot_be_written(self, tmp_path):
+        not_a_directory = tmp_path / "file"
+        not_a_directory.write_text("")
+
+        with mock.patch("app.templating.logger") as logger:
+            template = make_environment(not_a_directory).get_template("page.html")
+
+        assert template.render(name="Bob") == "<p>Bob</p>"
+        assert logger.warning.called
+
+
+class TestTemplating(BaseApplicationTest):
+    def test_templates_are_not_reloaded_outside_development(self):
+        assert self.app.jinja_env.auto_reload is False
+        assert self.app.jinja_env.bytecode_cache is None
+
+    def test_app_uses_the_bytecode_cache_when_configured(self, tmp_path):
+        with mock.patch.dict(os.environ, {"DM_TEMPLATE_BYTECODE_CACHE_DIR": str(tmp_path)}):
+            app = create_app("test")
+
+        assert isinstance(app.jinja_env.bytecode_cache, BytecodeCache)
+        assert app.jinja_env.bytecode_cache.directory == str(tmp_path)
+
+    def test_compile_templates_fills_the_cache(self, tmp_path):
+        self.app.jinja_loader = jinja2.DictLoader(TEMPLATES)
+        self.app.jinja_env.bytecode_cache = BytecodeCache(str(tmp_path))
+
+        compiled, failed = compile_templates(self.app)
+
+        assert "page.html" in compiled
+        assert failed == ["broken.html"]
+        assert len(list(tmp_path.iterdir())) == len(compiled)
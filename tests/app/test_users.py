@@ -0,0 +1,87 @@
+import json
+
+import mock
+import pytest
+
+from app.users import load_user, user_cache
+
+from .helpers import BaseApplicationTest
+
+
+class TestLoadUser(BaseApplicationTest):
+    def setup_method(self, method):
+        super().setup_method(method)
+        self.app.config.update({"DM_USER_CACHE_MAX_BYTES": 1024 * 1024, "DM_USER_CACHE_TTL": 30})
+        user_cache.configure(self.app.config)
+        self.data_api_client = mock.Mock()
+        self.data_api_client.get_user.return_value = self.user(123, "email@email.com", 1234, "Supplier Name", "Name")
+
+    def teardown_method(self, method):
+        user_cache.configure({})
+        super().teardown_method(method)
+
+    def load(self, user_id="123"):
+        with self.app.app_context():
+            return load_user(self.data_api_client, user_id)
+
+    def test_users_are_cached(self):
+        assert self.load().email_address == "email@email.com"
+        assert self.load().email_address == "email@email.com"
+
+        self.data_api_client.get_user.assert_called_once_with(user_id=123)
+
+    @pytest.mark.parametrize("field, value", (("locked", True), ("active", False)))
+    def test_inactive_users_are_not_loaded_or_cached(self, field, value):
+        self.data_api_client.get_user.return_value["users"][field] = value
+
+        assert self.load() is None
+        assert self.load() is None
+        assert self.data_api_client.get_user.call_count == 2
+
+    def test_users_expire(self):
+        with mock.patch("app.caching.time.monotonic", return_value=1000.0) as now:
+            self.load()
+            now.return_value += 30
+            self.load()
+
+        assert self.data_api_client.get_user.call_count == 2
+
+    def test_users_are_shared_through_redis_if_enabled(self):
+        redis = mock.Mock()
+        redis.get.return_value = None
+        self.app.config.update({"DM_USER_CACHE_USE_REDIS": True, "SESSION_REDIS": redis})
+
+        self.load()
+
+        redis.setex.assert_called_once_with(
+            "brief-responses-frontend:user:123", 30, json.dumps(self.data_api_client.get_user.return_value)
+        )
+
+        user_cache.clear()
+        redis.get.return_value = json.dumps(self.data_api_client.get_user.return_value)
+        redis.ttl.return_value = 10
+
+        assert self.load().email_address == "email@email.com"
+        assert self.data_api_client.get_user.call_count == 1
+
+    def test_users_from_redis_are_only_kept_for_as_long_as_they_have_left_there(self):
+        redis = mock.Mock()
+        redis.get.return_value = json.dumps(self.data_api_client.get_user.return_value)
+        redis.ttl.return_value = 10
+        self.app.config.update({"DM_USER_CACHE_USE_REDIS": True, "SESSION_REDIS": redis})
+
+        with mock.patch("app.caching.time.monotonic", return_value=1000.0) as now:
+            self.load()
+            now.return_value += 10
+            redis.get.return_value = None
+            self.load()
+
+        assert redis.get.call_count == 2
+        assert self.data_api_client.get_user.call_count == 1
+
+    def test_redis_errors_fall_back_to_the_api(self):
+        redis = mock.Mock()
+        redis.get.side_effect = redis.setex.side_effect = ConnectionError
+        self.app.config.update({"DM_USER_CACHE_USE_REDIS": True, "SESSION_REDIS": redis})
+
+        assert self.load().email_address == "email@email.com"
@@ -0,0 +1,57 @@
+import json
+
+import mock
+
+from dmcontent.content_loader import ContentNotFoundError
+
+from app.main import CONTENT_MANIFESTS
+from app.warmup import warm_up
+
+from .helpers import BaseApplicationTest
+
+
+class TestWarmUp(BaseApplicationTest):
+    @mock.patch("app.main.content_loader")
+    def test_loads_every_manifest(self, content_loader):
+        warm_up(self.app)
+
+        assert content_loader.get_manifest.call_args_list == [
+            mock.call(framework_slug, manifest) for framework_slug, question_set, manifest in CONTENT_MANIFESTS
+        ]
+
+    @mock.patch("app.main.content_loader")
+    def test_missing_manifests_do_not_stop_warm_up(self, content_loader):
+        content_loader.get_manifest.side_effect = ContentNotFoundError
+
+        warm_up(self.app)
+
+        assert "dm_warm_up" in self.app.extensions
+
+    @mock.patch("app.main.content_loader")
+    def test_compiles_templates(self, content_loader):
+        with mock.patch.object(self.app.jinja_env, "get_template") as get_template:
+            warm_up(self.app)
+
+        assert mock.call("briefs/check_your_answers.html") in get_template.call_args_list
+        assert mock.call("_base_page.html") in get_template.call_args_list
+
+
+class TestWarmUpStatus(BaseApplicationTest):
+    def setup_method(self, method):
+        super().setup_method(method)
+        self.app.config["DM_REQUIRE_WARM_UP"] = True
+
+    def test_status_fails_until_warmed_up(self):
+        status_response = self.client.get('/suppliers/opportunities/_status?ignore-dependencies')
+
+        assert status_response.status_code == 500
+        assert "Warm-up has not finished" in json.loads(status_response.get_data())["message"]
+
+    @mock.patch("app.main.content_loader")
+    def test_status_ok_once_warmed_up(self, content_loader):
+        warm_up(self.app)
+
+        status_response = self.client.get('/suppliers/opportunities/_status?ignore-dependencies')
+
+        assert status_response.status_code == 200
+        assert "duration" in json.loads(status_response.get_data())["warm_up"]